@@ -0,0 +1,159 @@
+"""
+Benchmark of every public MyOKX method (PUBLIC_*, FUNDING_*, SUBACCOUNT_*) against the in-process OKX stand-in.
+Reports requests per second and p50/p99 latency per method, concurrency level and asynchrony mode. Runs offline.
+
+Usage:
+    python -m benchmarks.methods [--concurrency 1 10 100 1000] [--modes async sync] [--latency 0.005]
+                                 [--error-rate 0.0] [--rate-limit 50] [--methods PUBLIC_get_price ...]
+                                 [--save results.json] [--baseline results.json --tolerance 0.2]
+"""
+from typing import Optional, Callable, Dict, List
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+from my_okx import MyOKX, ClientHub
+
+from .mock_okx import MockOKX
+
+
+CASES: Dict[str, Callable] = {
+    'PUBLIC_get_price': lambda my_okx: my_okx.PUBLIC_get_price(ticker='ETH'),
+    'PUBLIC_get_price_limit': lambda my_okx: my_okx.PUBLIC_get_price_limit(ticker='ETH'),
+    'PUBLIC_get_prices': lambda my_okx: my_okx.PUBLIC_get_prices(),
+    'FUNDING_is_connected': lambda my_okx: my_okx.FUNDING_is_connected(),
+    'FUNDING_get_balance': lambda my_okx: my_okx.FUNDING_get_balance(ticker='ETH'),
+    'FUNDING_get_chain_info': lambda my_okx: my_okx.FUNDING_get_chain_info(ticker='ETH', chain='ETH-Base'),
+    'FUNDING_get_chain_record': lambda my_okx: my_okx.FUNDING_get_chain_record(ticker='ETH', chain='ETH-Base'),
+    'FUNDING_get_native_chain_record': lambda my_okx: my_okx.FUNDING_get_native_chain_record(network='Base'),
+    'FUNDING_refresh_chains_info': lambda my_okx: my_okx.FUNDING_refresh_chains_info(),
+    'FUNDING_get_chains_info': lambda my_okx: my_okx.FUNDING_get_chains_info(ticker='ETH'),
+    'FUNDING_convert_usd_to_native': lambda my_okx: my_okx.FUNDING_convert_usd_to_native(amount=100.0, ticker='ETH', chain='ETH-Base'),
+    'FUNDING_post_withdrawal': lambda my_okx: my_okx.FUNDING_post_withdrawal(
+        ticker='ETH', chain='ETH-Base', address='0xB293cFf00bA3f110C839fBDB59186BD944B144D5', amount=0.01, fee=0.00001,
+    ),
+    'FUNDING_get_withdrawal': lambda my_okx: my_okx.FUNDING_get_withdrawal(withdrawal_id='1'),
+    'FUNDING_get_withdrawals': lambda my_okx: my_okx.FUNDING_get_withdrawals(limit=100),
+    'FUNDING_get_deposits': lambda my_okx: my_okx.FUNDING_get_deposits(limit=100),
+    'FUNDING_check_withdrawal': lambda my_okx: my_okx.FUNDING_check_withdrawal(withdrawal_id='1'),
+    'SUBACCOUNT_get_subaccounts': lambda my_okx: my_okx.SUBACCOUNT_get_subaccounts(),
+    'SUBACCOUNT_get_subaccounts_page': lambda my_okx: my_okx.SUBACCOUNT_get_subaccounts_page(limit=100),
+    'SUBACCOUNT_get_balance': lambda my_okx: my_okx.SUBACCOUNT_get_balance(subaccount_name='subaccount-00000', ticker='ETH'),
+    'SUBACCOUNT_get_balances': lambda my_okx: my_okx.SUBACCOUNT_get_balances(subaccount_name='subaccount-00000', tickers=['ETH', 'USDT']),
+    'SUBACCOUNT_get_transfers': lambda my_okx: my_okx.SUBACCOUNT_get_transfers(limit=100),
+    'SUBACCOUNT_transfer_to_main': lambda my_okx: my_okx.SUBACCOUNT_transfer_to_main(subaccount_name='subaccount-00000', ticker='ETH', amount=1.0),
+}
+
+
+def get_public_methods() -> List[str]:
+    return [name for name in dir(MyOKX) if name.startswith(('PUBLIC_', 'FUNDING_', 'SUBACCOUNT_'))]
+
+
+async def run_case(mock: MockOKX, method: str, asynchrony: bool, concurrency: int, requests: int) -> dict:
+    """Runs `requests` calls of a method with `concurrency` concurrent workers."""
+    hub = ClientHub(
+        max_connections=None,
+        max_keepalive_connections=None,
+        transport=mock.transport(),
+        async_transport=mock.async_transport(),
+    )
+    # Coalescing is disabled, so every call measures the full request path
+    my_okx = MyOKX(api_key='API-KEY', secret_key='SECRET-KEY', passphrase='PASSPHRASE', asynchrony=asynchrony, hub=hub, coalesce=False)
+    await my_okx.FUNDING_post_withdrawal(ticker='ETH', chain='ETH-Base', address='0x0', amount=0.01, fee=0.00001)
+    case = CASES[method]
+    latencies: List[float] = []
+    errors = 0
+    calls = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in calls:
+            started = time.perf_counter()
+            status, _ = await case(my_okx)
+            latencies.append(time.perf_counter() - started)
+            if status != 0:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    await hub.aclose()
+    latencies.sort()
+    return {
+        'method': method,
+        'mode': 'async' if asynchrony else 'sync',
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Finds cases whose throughput dropped by more than `tolerance` relative to the baseline."""
+    previous = {(result['method'], result['mode'], result['concurrency']): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result['method'], result['mode'], result['concurrency']))
+        if old is not None and result['rps'] < old['rps'] * (1 - tolerance):
+            regressions.append(
+                f'{result["method"]} [{result["mode"]}, c={result["concurrency"]}]: {old["rps"]:.0f} -> {result["rps"]:.0f} req/s'
+            )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    methods = args.methods or list(CASES)
+    missing = [name for name in get_public_methods() if name not in CASES]
+    if missing:
+        print(f'Warning: methods without benchmark cases: {", ".join(missing)}', file=sys.stderr)
+    results: List[dict] = []
+    print(f'{"method":<34} {"mode":<6} {"conc":>5} {"req/s":>10} {"p50, ms":>9} {"p99, ms":>9} {"errors":>7}')
+    for method in methods:
+        for mode in args.modes:
+            for concurrency in args.concurrency:
+                requests = args.requests or max(200, concurrency * 2)
+                mock = MockOKX(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, rate_limit=args.rate_limit)
+                result = await run_case(mock, method, mode == 'async', concurrency, requests)
+                results.append(result)
+                print(
+                    f'{method:<34} {result["mode"]:<6} {concurrency:>5} {result["rps"]:>10.0f} '
+                    f'{result["p50"]:>9.2f} {result["p99"]:>9.2f} {result["errors"]:>7}'
+                )
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', nargs='*', choices=list(CASES), help='Methods to benchmark (all by default).')
+    parser.add_argument('--modes', nargs='*', choices=['async', 'sync'], default=['async', 'sync'])
+    parser.add_argument('--concurrency', nargs='*', type=int, default=[1, 10, 100, 1000])
+    parser.add_argument('--requests', type=int, default=None, help='Requests per case (default: max(200, 2 * concurrency)).')
+    parser.add_argument('--latency', type=float, default=0.0, help='Injected server latency (in seconds).')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Injected random latency (in seconds).')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with HTTP 500.')
+    parser.add_argument('--rate-limit', type=float, default=None, help='Requests per second allowed per endpoint.')
+    parser.add_argument('--save', help='Saves the results to a json file.')
+    parser.add_argument('--baseline', help='Compares the results with a saved json file (exits with 1 on regressions).')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed throughput drop relative to the baseline.')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main(parse_args())))
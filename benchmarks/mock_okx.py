@@ -0,0 +1,210 @@
+"""
+In-process stand-in of the OKX REST API (httpx.MockTransport) for benchmarks.
+It serves every endpoint used by MyOKX and can inject latency, server errors and rate limits.
+"""
+from typing import Optional, Dict, List
+from urllib.parse import parse_qsl
+
+import json
+import time
+import random
+import asyncio
+import threading
+
+import httpx
+
+
+class MockOKX:
+    def __init__(
+            self,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            rate_limit: Optional[float] = None,
+            subaccounts: int = 250,
+            history: int = 1000,
+            seed: int = 0,
+    ):
+        """
+        :param latency: Base response latency (in seconds).
+        :param jitter: Maximum random latency (in seconds) added to the base latency.
+        :param error_rate: Share of requests answered with HTTP 500.
+        :param rate_limit: Requests per second allowed per endpoint (others are answered with HTTP 429 and code 50011).
+        :param subaccounts: Number of subaccounts of the main account.
+        :param history: Number of rows of the deposit and subaccount transfer histories.
+        :param seed: Seed of the random generator (latency jitter and errors).
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows: Dict[str, List[float]] = {}
+        self._withdrawals: Dict[str, dict] = {}
+        self._transfer_id = 0
+        self.currencies = [
+            self._currency('ETH', 'ETH-ERC20', min_wd='0.01', min_fee='0.0007', tick='6'),
+            self._currency('ETH', 'ETH-Base', min_wd='0.001', min_fee='0.00001', tick='8'),
+            self._currency('ETH', 'ETH-Arbitrum One', min_wd='0.001', min_fee='0.0001', tick='8'),
+            self._currency('BNB', 'BNB-BSC', min_wd='0.001', min_fee='0.00005', tick='8'),
+            self._currency('USDT', 'USDT-TRC20', min_wd='0.1', min_fee='1', tick='6'),
+        ]
+        self.prices = {'BTC': 60000.0, 'ETH': 3500.0, 'BNB': 600.0, 'SOL': 150.0, 'USDC': 1.0}
+        self.subaccounts = [f'subaccount-{i:05d}' for i in range(subaccounts)]
+        self.deposits = [
+            {
+                'depId': str(i), 'ccy': ('ETH', 'USDT')[i % 2], 'chain': ('ETH-Base', 'USDT-TRC20')[i % 2], 'amt': '1.5',
+                'from': '', 'to': '0xB293cFf00bA3f110C839fBDB59186BD944B144D5', 'txId': f'0x{i:064x}', 'state': '2',
+                'ts': str(1700000000000 - i * 1000),
+            }
+            for i in range(history)
+        ]
+        self.subaccount_bills = [
+            {
+                'billId': str(i), 'ccy': ('ETH', 'USDT')[i % 2], 'amt': '1.0', 'type': str(i % 2), 'subAcct': self.subaccounts[i % subaccounts],
+                'ts': str(1700000000000 - i * 1000),
+            }
+            for i in range(history if subaccounts else 0)
+        ]
+
+    def transport(self, ) -> httpx.MockTransport:
+        """Transport for synchronous clients (latency blocks the calling thread)."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            delay = self._get_delay()
+            if delay:
+                time.sleep(delay)
+            return self.handle(request)
+        return httpx.MockTransport(handler)
+
+    def async_transport(self, ) -> httpx.MockTransport:
+        """Transport for asynchronous clients (latency is awaited)."""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            delay = self._get_delay()
+            if delay:
+                await asyncio.sleep(delay)
+            return self.handle(request)
+        return httpx.MockTransport(handler)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        params = dict(parse_qsl(request.url.query.decode()))
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return httpx.Response(500, json={'code': '50000', 'msg': 'Internal server error', 'data': []})
+            if self.rate_limit is not None and not self._allow(path):
+                return httpx.Response(429, json={'code': '50011', 'msg': 'Too Many Requests', 'data': []})
+            route = self.routes.get((request.method, path))
+            if route is None:
+                return httpx.Response(404, json={'code': '404', 'msg': 'Not Found', 'data': []})
+            body = json.loads(request.content) if request.content else {}
+            return httpx.Response(200, json={'code': '0', 'msg': '', 'data': route(self, params, body)})
+
+    def _price_limit(self, params: dict, body: dict) -> List[dict]:
+        price = self.prices[params['instId'].split('-')[0]]
+        return [{'instId': params['instId'], 'buyLmt': str(price * 1.05), 'sellLmt': str(price * 0.95), 'ts': self._ts()}]
+
+    def _time(self, params: dict, body: dict) -> List[dict]:
+        return [{'ts': self._ts()}]
+
+    def _tickers(self, params: dict, body: dict) -> List[dict]:
+        return [
+            {'instId': f'{ticker}-USDT', 'last': str(price), 'bidPx': str(price * 0.9999), 'askPx': str(price * 1.0001), 'ts': self._ts()}
+            for ticker, price in self.prices.items()
+        ]
+
+    def _balances(self, params: dict, body: dict) -> List[dict]:
+        tickers = params['ccy'].split(',') if 'ccy' in params else ['ETH', 'USDT']
+        return [{'ccy': ticker, 'bal': '10.5', 'availBal': '10.5', 'frozenBal': '0'} for ticker in tickers]
+
+    def _currencies(self, params: dict, body: dict) -> List[dict]:
+        if 'ccy' in params:
+            return [currency for currency in self.currencies if currency['ccy'] == params['ccy']]
+        return self.currencies
+
+    def _withdrawal(self, params: dict, body: dict) -> List[dict]:
+        wd_id = str(len(self._withdrawals) + 1)
+        self._withdrawals[wd_id] = {
+            'wdId': wd_id, 'clientId': body.get('clientId', ''), 'ccy': body['ccy'], 'chain': body['chain'],
+            'amt': str(body['amt']), 'fee': str(body['fee']), 'to': body['toAddr'], 'txId': '', 'state': '2', 'ts': str(1700000000000 + int(wd_id)),
+        }
+        return [{'wdId': wd_id, 'ccy': body['ccy'], 'chain': body['chain'], 'amt': str(body['amt']), 'clientId': body.get('clientId', '')}]
+
+    def _withdrawal_history(self, params: dict, body: dict) -> List[dict]:
+        rows = sorted(self._withdrawals.values(), key=lambda row: -int(row['ts']))
+        for field, key in (('wdId', 'wdId'), ('clientId', 'clientId'), ('ccy', 'ccy')):
+            if field in params:
+                rows = [row for row in rows if row[key] == params[field]]
+        if 'after' in params:
+            rows = [row for row in rows if int(row['ts']) < int(params['after'])]
+        if 'before' in params:
+            rows = [row for row in rows if int(row['ts']) > int(params['before'])]
+        return rows[:int(params.get('limit', 100))]
+
+    def _deposit_history(self, params: dict, body: dict) -> List[dict]:
+        return self._filter_history(self.deposits, params, fields=('ccy', ))
+
+    def _subaccount_bills(self, params: dict, body: dict) -> List[dict]:
+        return self._filter_history(self.subaccount_bills, params, fields=('ccy', 'subAcct'))
+
+    @staticmethod
+    def _filter_history(rows: List[dict], params: dict, fields: tuple) -> List[dict]:
+        for field in fields:
+            if field in params:
+                rows = [row for row in rows if row[field] == params[field]]
+        if 'after' in params:
+            rows = [row for row in rows if int(row['ts']) < int(params['after'])]
+        if 'before' in params:
+            rows = [row for row in rows if int(row['ts']) > int(params['before'])]
+        return rows[:int(params.get('limit', 100))]
+
+    def _subaccounts(self, params: dict, body: dict) -> List[dict]:
+        rows = [{'subAcct': name, 'enable': True, 'ts': str(10 ** 12 - i)} for i, name in enumerate(self.subaccounts)]
+        if 'after' in params:
+            rows = [row for row in rows if int(row['ts']) < int(params['after'])]
+        return rows[:int(params.get('limit', 100))]
+
+    def _transfer(self, params: dict, body: dict) -> List[dict]:
+        self._transfer_id += 1
+        return [{'transId': str(self._transfer_id), 'ccy': body['ccy'], 'amt': str(body['amt']), 'from': '6', 'to': '6', 'clientId': ''}]
+
+    routes = {
+        ('GET', '/api/v5/public/price-limit'): _price_limit,
+        ('GET', '/api/v5/public/time'): _time,
+        ('GET', '/api/v5/market/tickers'): _tickers,
+        ('GET', '/api/v5/asset/balances'): _balances,
+        ('GET', '/api/v5/asset/currencies'): _currencies,
+        ('POST', '/api/v5/asset/withdrawal'): _withdrawal,
+        ('GET', '/api/v5/asset/withdrawal-history'): _withdrawal_history,
+        ('GET', '/api/v5/asset/deposit-history'): _deposit_history,
+        ('GET', '/api/v5/asset/subaccount/bills'): _subaccount_bills,
+        ('GET', '/api/v5/users/subaccount/list'): _subaccounts,
+        ('GET', '/api/v5/asset/subaccount/balances'): _balances,
+        ('POST', '/api/v5/asset/transfer'): _transfer,
+    }
+
+    def _allow(self, path: str) -> bool:
+        now = time.monotonic()
+        window = [moment for moment in self._windows.get(path, []) if now - moment < 1.0]
+        allowed = len(window) < self.rate_limit
+        if allowed:
+            window.append(now)
+        self._windows[path] = window
+        return allowed
+
+    def _get_delay(self, ) -> float:
+        return self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+
+    @staticmethod
+    def _currency(ccy: str, chain: str, min_wd: str, min_fee: str, tick: str) -> dict:
+        return {
+            'ccy': ccy, 'chain': chain, 'name': ccy, 'canDep': True, 'canWd': True, 'canInternal': True, 'mainNet': False,
+            'needTag': False, 'minDep': '0.0001', 'minWd': min_wd, 'maxWd': '1000000', 'minFee': min_fee,
+            'maxFee': str(float(min_fee) * 10), 'wdTickSz': tick,
+        }
+
+    @staticmethod
+    def _ts() -> str:
+        return str(int(time.time() * 1000))
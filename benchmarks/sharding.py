@@ -0,0 +1,80 @@
+"""
+Benchmark of ShardedRunner scaling: a balance job over many API keys against the in-process OKX stand-in,
+run with 1, 2, 4... worker processes. Reports jobs and requests per second. Runs offline.
+
+Usage:
+    python -m benchmarks.sharding [--processes 1 2 4] [--accounts 2000] [--requests 10] [--concurrency 50]
+"""
+from typing import Optional, List, Tuple, Any
+
+import sys
+import time
+import asyncio
+import argparse
+
+from my_okx import MyOKX, ClientHub, ShardedRunner
+
+from .mock_okx import MockOKX
+
+
+def setup() -> dict:
+    """Runs in every worker: the stand-in transport cannot be pickled, so every worker creates its own."""
+    mock = MockOKX(subaccounts=0)
+    return {
+        'hub': ClientHub(max_connections=None, max_keepalive_connections=None, async_transport=mock.async_transport()),
+        'rate_limiter': None,
+    }
+
+
+async def job(my_okx: MyOKX, account: dict) -> Tuple[int, Any]:
+    """Fetches the balances `requests` times (signing and decoding dominate the CPU time)."""
+    for _ in range(account['requests']):
+        status, result = await my_okx.FUNDING_get_balance()
+        if status != 0:
+            return status, result
+    return 0, account['requests']
+
+
+async def run(processes: int, accounts: int, requests: int, concurrency: int) -> dict:
+    runner = ShardedRunner(
+        accounts=[
+            {'api_key': f'key-{i:06d}', 'secret_key': f'secret-{i:06d}', 'passphrase': 'passphrase', 'requests': requests}
+            for i in range(accounts)
+        ],
+        job=job,
+        processes=processes,
+        concurrency=concurrency,
+        setup=setup,
+    )
+    started = time.perf_counter()
+    errors = 0
+    async for _, status, _ in runner:
+        errors += status != 0
+    elapsed = time.perf_counter() - started
+    return {
+        'processes': processes,
+        'jobs_per_second': accounts / elapsed,
+        'requests_per_second': runner.get_requests() / elapsed,
+        'errors': errors,
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    print(f'{"processes":>9} {"jobs/s":>10} {"req/s":>10} {"errors":>7}')
+    for processes in args.processes:
+        result = await run(processes, args.accounts, args.requests, args.concurrency)
+        print(f'{processes:>9} {result["jobs_per_second"]:>10.0f} {result["requests_per_second"]:>10.0f} {result["errors"]:>7}')
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', nargs='*', type=int, default=[1, 2, 4])
+    parser.add_argument('--accounts', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=10, help='Requests per account.')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent jobs per worker.')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1 +1,17 @@
 from .myokx import MyOKX
+from .hub import ClientHub
+from .ratelimit import RateLimiter, TokenBucket
+from .prices import PriceSnapshot
+from .pricebook import PriceBook
+from .tracker import WithdrawalTracker
+from .sweep import SubaccountSweeper, SweepResult
+from .models import ChainInfo, ChainsInfo, Balance, Balances, Withdrawal, Transfer
+from .cache import ChainsInfoCache
+from .metrics import Metrics, RequestEvent
+from .resilience import RetryPolicy, HedgePolicy, CircuitBreaker, CircuitOpenError
+from .withdrawals import WithdrawalIntent, WithdrawalJournal, BulkWithdrawer
+from .proxypool import ProxyPool
+from .pagination import Paginator, PaginationError
+from .runner import ShardedRunner
+from .store import MetadataStore
+from .valuation import Valuation, PortfolioValuer
@@ -0,0 +1,75 @@
+from typing import Optional, Dict, List, Tuple
+
+import time
+
+from .models import ChainInfo, ChainsInfo
+
+
+class ChainsInfoCache:
+    def __init__(self, ttl: Optional[float] = 300.0, keep_rows: bool = True):
+        """
+        In-memory cache of currency chains metadata with O(1) lookups by (ccy, chain).
+        The cache is filled by one bulk request of all currencies and expires after `ttl` seconds.
+        The raw OKX rows can be kept next to the compact records, so the json format is returned unchanged (with all fields).
+
+        :param ttl: Time to live (in seconds) of the loaded metadata (None means the cache never expires).
+        :param keep_rows: Keeps the raw OKX rows (roughly doubles the memory of the cache; only needed to return raw json).
+        """
+        self._ttl = ttl
+        self._keep_rows = keep_rows
+        self._chains_info = ChainsInfo()
+        self._rows: Dict[Tuple[str, str], dict] = {}
+        self._updated: Optional[float] = None
+
+    def load(self, data: List[dict]) -> None:
+        """Replaces the cached metadata with a list of chains (the `data` field of /api/v5/asset/currencies)."""
+        self.set(ChainsInfo.from_json(data), data=data)
+
+    def set(self, chains_info: ChainsInfo, age: float = 0.0, data: Optional[List[dict]] = None) -> None:
+        """
+        Replaces the cached metadata with a collection of chains.
+
+        :param chains_info: Collection of chains.
+        :param age: Time (in seconds) since the metadata was fetched.
+        :param data: Raw OKX rows of the chains (without them, `get_row` converts the records back to the OKX format).
+        """
+        self._chains_info = chains_info
+        self._rows = {(str(row['ccy']), str(row['chain'])): row for row in data or []} if self._keep_rows else {}
+        self._updated = time.monotonic() - age
+
+    def get(self, ccy: str, chain: str) -> Optional[ChainInfo]:
+        return self._chains_info.get(ccy, chain)
+
+    def get_row(self, ccy: str, chain: str) -> Optional[dict]:
+        """Gets the raw OKX row of a chain (a copy, the cached row is never exposed)."""
+        row = self._rows.get((ccy, chain))
+        if row is not None:
+            return dict(row)
+        record = self._chains_info.get(ccy, chain)
+        return None if record is None else record.to_dict()
+
+    def get_chains(self, ccy: str) -> List[ChainInfo]:
+        return self._chains_info.get_chains(ccy)
+
+    def touch(self, age: float = 0.0) -> None:
+        """Renews the cached metadata without replacing it (`age` is the time in seconds since it was confirmed unchanged)."""
+        self._updated = time.monotonic() - age
+
+    def invalidate(self, ) -> None:
+        self._updated = None
+
+    @property
+    def is_fresh(self, ) -> bool:
+        if self._updated is None:
+            return False
+        return (self._ttl is None) or (time.monotonic() - self._updated < self._ttl)
+
+    @property
+    def age(self, ) -> Optional[float]:
+        if self._updated is None:
+            return None
+        return time.monotonic() - self._updated
+
+    @property
+    def size(self, ) -> int:
+        return len(self._chains_info)
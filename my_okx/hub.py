@@ -0,0 +1,91 @@
+from typing import Optional, Union, Dict, Tuple
+from httpx import Client, AsyncClient, Limits, BaseTransport, AsyncBaseTransport
+
+import httpx
+import threading
+
+
+class ClientHub:
+    def __init__(
+            self,
+            max_connections: Optional[int] = 100,
+            max_keepalive_connections: Optional[int] = 20,
+            keepalive_expiry: Optional[float] = 5.0,
+            http2: bool = False,
+            timeout: Optional[float] = 5.0,
+            transport: Optional[BaseTransport] = None,
+            async_transport: Optional[AsyncBaseTransport] = None,
+    ):
+        """
+        ClientHub is a pool of httpx clients that can be shared by many MyOKX instances.
+        Signing and headers stay per API key, while sockets (and TLS sessions) are reused across keys.
+        Every proxy gets its own sub-pool (a separate client), because a connection is bound to its egress route.
+
+        :param max_connections: Maximum number of connections per sub-pool (None means no limit).
+        :param max_keepalive_connections: Maximum number of idle keep-alive connections per sub-pool.
+        :param keepalive_expiry: Time (in seconds) an idle keep-alive connection is kept open.
+        :param http2: Enables HTTP/2 multiplexing (requires the `h2` package: pip install httpx[http2]).
+        :param timeout: Request timeout (in seconds).
+        :param transport: Custom transport of synchronous clients (e.g., httpx.MockTransport for tests and benchmarks;
+        proxies are not applied on top of a custom transport).
+        :param async_transport: Custom transport of asynchronous clients.
+        """
+        self._limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2
+        self._timeout = timeout
+        self._transport = transport
+        self._async_transport = async_transport
+        self._clients: Dict[Tuple[Optional[str], bool], Union[Client, AsyncClient]] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, proxy: Optional[str] = None, asynchrony: bool = False) -> Union[Client, AsyncClient]:
+        """Gets (or creates) the shared client of the sub-pool for a specific proxy URL."""
+        key = (proxy, bool(asynchrony))
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._create_client(proxy=proxy, asynchrony=asynchrony)
+                    self._clients[key] = client
+        return client
+
+    def close(self, ) -> None:
+        """Closes all synchronous sub-pools."""
+        with self._lock:
+            for key, client in list(self._clients.items()):
+                if isinstance(client, Client):
+                    client.close()
+                    del self._clients[key]
+
+    async def aclose(self, ) -> None:
+        """Closes all sub-pools (both asynchronous and synchronous)."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            if isinstance(client, AsyncClient):
+                await client.aclose()
+            else:
+                client.close()
+
+    def _create_client(self, proxy: Optional[str], asynchrony: bool) -> Union[Client, AsyncClient]:
+        if asynchrony:
+            httpx_client = httpx.AsyncClient(
+                proxy=(None if self._async_transport else proxy), limits=self._limits, http2=self._http2, timeout=self._timeout,
+                transport=self._async_transport,
+            )
+        else:
+            httpx_client = httpx.Client(
+                proxy=(None if self._transport else proxy), limits=self._limits, http2=self._http2, timeout=self._timeout,
+                transport=self._transport,
+            )
+        return httpx_client
+
+    @property
+    def size(self, ) -> int:
+        return len(self._clients)
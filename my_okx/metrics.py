@@ -0,0 +1,202 @@
+from logging import Logger
+from typing import Optional, Callable, Iterable, Dict, List, Tuple
+
+import bisect
+import logging
+import threading
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        """Latency histogram with a count per bucket upper bound (the last bucket is +Inf)."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a quantile as the upper bound of the bucket containing it."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        total = 0
+        for i, count in enumerate(self.counts):
+            total += count
+            if total >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def to_dict(self, ) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([*map(str, self.buckets), '+Inf'], self.counts)),
+        }
+
+
+class RequestEvent:
+    __slots__ = (
+        'endpoint', 'method', 'api_key', 'status_code', 'code', 'error',
+        'queue_time', 'sign_time', 'network_time', 'decode_time', 'total_time',
+    )
+
+    def __init__(self, endpoint: str, method: str, api_key: str):
+        """Timings (in seconds) and outcome of one request."""
+        self.endpoint = endpoint
+        self.method = method
+        self.api_key = api_key
+        self.status_code: Optional[int] = None
+        self.code: Optional[str] = None
+        self.error: Optional[str] = None
+        self.queue_time = 0.0
+        self.sign_time = 0.0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.total_time = 0.0
+
+    def __repr__(self, ) -> str:
+        return (
+            f'RequestEvent(endpoint={self.endpoint!r}, status_code={self.status_code}, code={self.code!r}, error={self.error!r}, '
+            f'queue={self.queue_time:.6f}, sign={self.sign_time:.6f}, network={self.network_time:.6f}, decode={self.decode_time:.6f})'
+        )
+
+
+class _Series:
+    __slots__ = ('requests', 'in_flight', 'status_codes', 'codes', 'errors', 'histograms')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.requests = 0
+        self.in_flight = 0
+        self.status_codes: Dict[int, int] = {}
+        self.codes: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.histograms = {phase: Histogram(buckets) for phase in Metrics.phases}
+
+
+class Metrics:
+    phases = ('queue', 'sign', 'network', 'decode', 'total')
+    buckets = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+            self,
+            buckets: Optional[Iterable[float]] = None,
+            hooks: Optional[List[Callable[[RequestEvent], None]]] = None,
+            key_length: int = 8,
+            logger: Optional[Logger] = None,
+    ):
+        """
+        Metrics collects request counts, latency histograms (queueing, signing, network and decoding time),
+        HTTP status and OKX error code counts and in-flight gauges per endpoint and API key.
+        One Metrics object can be shared by many MyOKX instances.
+
+        :param buckets: Upper bounds (in seconds) of the latency histogram buckets.
+        :param hooks: Callbacks called with a RequestEvent after every request.
+        :param key_length: Number of leading API key characters used as the key label (the key itself is never exported).
+        :param logger: Logger of hook errors (hooks never change the result of a request: their exceptions are logged and counted).
+        """
+        self.buckets = tuple(sorted(buckets)) if buckets else self.buckets
+        self._hooks = list(hooks or [])
+        self._key_length = key_length
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._logger = logger or logging.getLogger(__name__)
+        self.hook_errors = 0
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        self._hooks.remove(hook)
+
+    def start(self, endpoint: str, api_key: str) -> None:
+        """Marks a request as in flight."""
+        series = self._get_series(endpoint, api_key)
+        with self._lock:
+            series.in_flight += 1
+
+    def observe(self, event: RequestEvent) -> None:
+        """Records a finished request (and calls the hooks)."""
+        series = self._get_series(event.endpoint, event.api_key)
+        with self._lock:
+            series.in_flight -= 1
+            series.requests += 1
+            if event.status_code is not None:
+                series.status_codes[event.status_code] = series.status_codes.get(event.status_code, 0) + 1
+            if event.code is not None and event.code != '0':
+                series.codes[event.code] = series.codes.get(event.code, 0) + 1
+            if event.error is not None:
+                series.errors[event.error] = series.errors.get(event.error, 0) + 1
+            histograms = series.histograms
+            histograms['queue'].observe(event.queue_time)
+            histograms['sign'].observe(event.sign_time)
+            histograms['network'].observe(event.network_time)
+            histograms['decode'].observe(event.decode_time)
+            histograms['total'].observe(event.total_time)
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                self.hook_errors += 1
+                self._logger.exception(f'Metrics | Hook {hook!r} failed on {event!r}')
+
+    def snapshot(self, ) -> Dict[str, Dict[str, dict]]:
+        """Exports the metrics as a dict: {endpoint: {key_label: {...}}}."""
+        result: Dict[str, Dict[str, dict]] = {}
+        with self._lock:
+            for (endpoint, key_label), series in self._series.items():
+                result.setdefault(endpoint, {})[key_label] = {
+                    'requests': series.requests,
+                    'in_flight': series.in_flight,
+                    'status_codes': dict(series.status_codes),
+                    'codes': dict(series.codes),
+                    'errors': dict(series.errors),
+                    'latency': {phase: histogram.to_dict() for phase, histogram in series.histograms.items()},
+                }
+        return result
+
+    def to_prometheus(self, prefix: str = 'myokx') -> str:
+        """Exports the metrics in the Prometheus text format."""
+        lines = [
+            f'# TYPE {prefix}_requests_total counter',
+            f'# TYPE {prefix}_in_flight gauge',
+            f'# TYPE {prefix}_responses_total counter',
+            f'# TYPE {prefix}_okx_errors_total counter',
+            f'# TYPE {prefix}_errors_total counter',
+            f'# TYPE {prefix}_latency_seconds histogram',
+        ]
+        with self._lock:
+            for (endpoint, key_label), series in self._series.items():
+                labels = f'endpoint="{endpoint}",key="{key_label}"'
+                lines.append(f'{prefix}_requests_total{{{labels}}} {series.requests}')
+                lines.append(f'{prefix}_in_flight{{{labels}}} {series.in_flight}')
+                for status_code, count in series.status_codes.items():
+                    lines.append(f'{prefix}_responses_total{{{labels},status="{status_code}"}} {count}')
+                for code, count in series.codes.items():
+                    lines.append(f'{prefix}_okx_errors_total{{{labels},code="{code}"}} {count}')
+                for error, count in series.errors.items():
+                    lines.append(f'{prefix}_errors_total{{{labels},error="{error}"}} {count}')
+                for phase, histogram in series.histograms.items():
+                    cumulative = 0
+                    for bound, count in zip([*map(str, histogram.buckets), '+Inf'], histogram.counts):
+                        cumulative += count
+                        lines.append(f'{prefix}_latency_seconds_bucket{{{labels},phase="{phase}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{prefix}_latency_seconds_sum{{{labels},phase="{phase}"}} {histogram.sum}')
+                    lines.append(f'{prefix}_latency_seconds_count{{{labels},phase="{phase}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def _get_series(self, endpoint: str, api_key: str) -> _Series:
+        key = (endpoint, api_key[:self._key_length])
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, _Series(self.buckets))
+        return series
@@ -0,0 +1,275 @@
+from typing import Optional, Dict, List, Tuple, Iterator
+from decimal import Decimal
+
+
+def _to_float(value) -> Optional[float]:
+    return float(value) if value not in (None, '') else None
+
+
+def _to_str(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return format(Decimal(repr(value)).normalize(), 'f')
+    return str(value)
+
+
+class ChainInfo:
+    __slots__ = (
+        'ccy', 'chain', 'can_dep', 'can_wd', 'can_internal', 'main_net', 'need_tag',
+        'min_dep', 'min_wd', 'max_wd', 'min_fee', 'max_fee', 'wd_tick_sz',
+    )
+
+    # Attribute: OKX field
+    fields = {
+        'ccy': 'ccy',
+        'chain': 'chain',
+        'can_dep': 'canDep',
+        'can_wd': 'canWd',
+        'can_internal': 'canInternal',
+        'main_net': 'mainNet',
+        'need_tag': 'needTag',
+        'min_dep': 'minDep',
+        'min_wd': 'minWd',
+        'max_wd': 'maxWd',
+        'min_fee': 'minFee',
+        'max_fee': 'maxFee',
+        'wd_tick_sz': 'wdTickSz',
+    }
+
+    def __init__(
+            self,
+            ccy: str,
+            chain: str,
+            can_dep: bool,
+            can_wd: bool,
+            can_internal: bool,
+            main_net: bool,
+            need_tag: bool,
+            min_dep: Optional[float],
+            min_wd: Optional[float],
+            max_wd: Optional[float],
+            min_fee: Optional[float],
+            max_fee: Optional[float],
+            wd_tick_sz: int,
+    ):
+        """Compact record of a currency chain (numbers are parsed once, when the record is created)."""
+        self.ccy = ccy
+        self.chain = chain
+        self.can_dep = can_dep
+        self.can_wd = can_wd
+        self.can_internal = can_internal
+        self.main_net = main_net
+        self.need_tag = need_tag
+        self.min_dep = min_dep
+        self.min_wd = min_wd
+        self.max_wd = max_wd
+        self.min_fee = min_fee
+        self.max_fee = max_fee
+        self.wd_tick_sz = wd_tick_sz
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'ChainInfo':
+        return cls(
+            ccy=str(data['ccy']),
+            chain=str(data['chain']),
+            can_dep=bool(data.get('canDep')),
+            can_wd=bool(data.get('canWd')),
+            can_internal=bool(data.get('canInternal')),
+            main_net=bool(data.get('mainNet')),
+            need_tag=bool(data.get('needTag')),
+            min_dep=_to_float(data.get('minDep')),
+            min_wd=_to_float(data.get('minWd')),
+            max_wd=_to_float(data.get('maxWd')),
+            min_fee=_to_float(data.get('minFee')),
+            max_fee=_to_float(data.get('maxFee')),
+            wd_tick_sz=int(data.get('wdTickSz') or 0),
+        )
+
+    def to_dict(self, ) -> dict:
+        """Converts the record back to the OKX json format (all values are strings or booleans, as OKX returns them)."""
+        result = {}
+        for attr, field in self.fields.items():
+            value = getattr(self, attr)
+            result[field] = value if isinstance(value, bool) else _to_str(value)
+        return result
+
+    def __repr__(self, ) -> str:
+        return f'ChainInfo(ccy={self.ccy!r}, chain={self.chain!r}, min_wd={self.min_wd}, min_fee={self.min_fee}, wd_tick_sz={self.wd_tick_sz})'
+
+
+class ChainsInfo:
+    __slots__ = ('_records', '_chains')
+
+    def __init__(self, records: Optional[List[ChainInfo]] = None):
+        """Collection of currency chains indexed by (ccy, chain) and by ccy."""
+        self._records: Dict[Tuple[str, str], ChainInfo] = {}
+        self._chains: Dict[str, List[ChainInfo]] = {}
+        for record in records or []:
+            self._records[(record.ccy, record.chain)] = record
+            self._chains.setdefault(record.ccy, []).append(record)
+
+    @classmethod
+    def from_json(cls, data: List[dict]) -> 'ChainsInfo':
+        return cls([ChainInfo.from_json(network) for network in data])
+
+    def get(self, ccy: str, chain: str) -> Optional[ChainInfo]:
+        return self._records.get((ccy, chain))
+
+    def get_chains(self, ccy: str) -> List[ChainInfo]:
+        return self._chains.get(ccy, [])
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._records
+
+    def __iter__(self, ) -> Iterator[ChainInfo]:
+        return iter(self._records.values())
+
+    def __len__(self, ) -> int:
+        return len(self._records)
+
+    def __repr__(self, ) -> str:
+        return f'ChainsInfo(size={len(self._records)})'
+
+
+class Balance:
+    __slots__ = ('ccy', 'bal', 'avail_bal', 'frozen_bal')
+
+    def __init__(self, ccy: str, bal: float, avail_bal: float, frozen_bal: float):
+        """Balance of a coin (numbers are parsed once, when the record is created)."""
+        self.ccy = ccy
+        self.bal = bal
+        self.avail_bal = avail_bal
+        self.frozen_bal = frozen_bal
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'Balance':
+        return cls(
+            ccy=str(data['ccy']),
+            bal=_to_float(data.get('bal')) or 0.0,
+            avail_bal=_to_float(data.get('availBal')) or 0.0,
+            frozen_bal=_to_float(data.get('frozenBal')) or 0.0,
+        )
+
+    def __repr__(self, ) -> str:
+        return f'Balance(ccy={self.ccy!r}, bal={self.bal}, avail_bal={self.avail_bal}, frozen_bal={self.frozen_bal})'
+
+
+class Balances:
+    __slots__ = ('_balances', )
+
+    def __init__(self, balances: Optional[List[Balance]] = None):
+        """Collection of coin balances indexed by ccy."""
+        self._balances: Dict[str, Balance] = {balance.ccy: balance for balance in balances or []}
+
+    @classmethod
+    def from_json(cls, data: List[dict]) -> 'Balances':
+        return cls([Balance.from_json(balance_dict) for balance_dict in data])
+
+    def get(self, ccy: str) -> Optional[Balance]:
+        return self._balances.get(ccy)
+
+    def get_available(self, ccy: str) -> float:
+        """Gets the available balance of a coin (0.0 if the coin has no balance)."""
+        balance = self._balances.get(ccy)
+        return 0.0 if balance is None else balance.avail_bal
+
+    def __getitem__(self, ccy: str) -> Balance:
+        return self._balances[ccy]
+
+    def __contains__(self, ccy: str) -> bool:
+        return ccy in self._balances
+
+    def __iter__(self, ) -> Iterator[Balance]:
+        return iter(self._balances.values())
+
+    def __len__(self, ) -> int:
+        return len(self._balances)
+
+    def __repr__(self, ) -> str:
+        return f'Balances({list(self._balances.values())})'
+
+
+class Withdrawal:
+    __slots__ = ('wd_id', 'client_id', 'ccy', 'chain', 'amt', 'fee', 'to_addr', 'tx_id', 'state', 'ts')
+
+    success_states = ('2', )
+    failure_states = ('-3', '-2', '-1')
+
+    def __init__(
+            self,
+            wd_id: str,
+            client_id: str,
+            ccy: str,
+            chain: str,
+            amt: Optional[float],
+            fee: Optional[float],
+            to_addr: str,
+            tx_id: str,
+            state: str,
+            ts: int,
+    ):
+        """Withdrawal record (numbers are parsed once, when the record is created)."""
+        self.wd_id = wd_id
+        self.client_id = client_id
+        self.ccy = ccy
+        self.chain = chain
+        self.amt = amt
+        self.fee = fee
+        self.to_addr = to_addr
+        self.tx_id = tx_id
+        self.state = state
+        self.ts = ts
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'Withdrawal':
+        return cls(
+            wd_id=str(data['wdId']),
+            client_id=str(data.get('clientId') or ''),
+            ccy=str(data.get('ccy') or ''),
+            chain=str(data.get('chain') or ''),
+            amt=_to_float(data.get('amt')),
+            fee=_to_float(data.get('fee')),
+            to_addr=str(data.get('to') or data.get('toAddr') or ''),
+            tx_id=str(data.get('txId') or ''),
+            state=str(data['state']),
+            ts=int(data.get('ts') or 0),
+        )
+
+    @property
+    def is_completed(self, ) -> bool:
+        return self.state in self.success_states
+
+    @property
+    def is_failed(self, ) -> bool:
+        return self.state in self.failure_states
+
+    def __repr__(self, ) -> str:
+        return f'Withdrawal(wd_id={self.wd_id!r}, ccy={self.ccy!r}, chain={self.chain!r}, amt={self.amt}, state={self.state!r})'
+
+
+class Transfer:
+    __slots__ = ('trans_id', 'client_id', 'ccy', 'amt', 'from_account', 'to_account')
+
+    def __init__(self, trans_id: str, client_id: str, ccy: str, amt: Optional[float], from_account: str, to_account: str):
+        """Funds transfer record (numbers are parsed once, when the record is created)."""
+        self.trans_id = trans_id
+        self.client_id = client_id
+        self.ccy = ccy
+        self.amt = amt
+        self.from_account = from_account
+        self.to_account = to_account
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'Transfer':
+        return cls(
+            trans_id=str(data['transId']),
+            client_id=str(data.get('clientId') or ''),
+            ccy=str(data.get('ccy') or ''),
+            amt=_to_float(data.get('amt')),
+            from_account=str(data.get('from') or ''),
+            to_account=str(data.get('to') or ''),
+        )
+
+    def __repr__(self, ) -> str:
+        return f'Transfer(trans_id={self.trans_id!r}, ccy={self.ccy!r}, amt={self.amt})'
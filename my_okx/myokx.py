@@ -1,15 +1,30 @@
 from logging import Logger
-from typing import Optional, Union, Tuple
-from httpx import Client, AsyncClient, Response
+from typing import Optional, Union, Tuple, List, Dict, Callable, ContextManager, Any
+from httpx import Client, AsyncClient
+from concurrent.futures import Executor
 
+import copy
 import hmac
 import json
+import time
 import httpx
 import base64
-import inspect
-import datetime
+import logging
+import asyncio
+import hashlib
+import functools
 
-from .utils import afh
+from .hub import ClientHub
+from .cache import ChainsInfoCache
+from .models import ChainInfo, ChainsInfo, Balances, Withdrawal, Transfer
+from .prices import PriceSnapshot
+from .pricebook import PriceBook
+from .proxypool import ProxyPool
+from .store import MetadataStore
+from .ratelimit import RateLimiter
+from .metrics import Metrics, RequestEvent
+from .resilience import RetryPolicy, HedgePolicy, CircuitBreaker, CircuitOpenError
+from .utils import afh, json_loads
 
 
 class MyOKX:
@@ -35,6 +50,23 @@ class MyOKX:
             proxy: Optional[str] = None,
             logger: Optional[Logger] = None,
             asynchrony: Optional[bool] = False,
+            hub: Optional[ClientHub] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            chains_info_ttl: Optional[float] = 300.0,
+            price_max_age: Optional[float] = None,
+            price_book: Optional[PriceBook] = None,
+            json_decoder: Optional[Callable[[bytes], Any]] = None,
+            executor: Optional[Executor] = None,
+            models: bool = False,
+            metrics: Optional[Metrics] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            hedge_policy: Optional[HedgePolicy] = None,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            coalesce: bool = True,
+            coalesce_ttl: float = 0.0,
+            proxy_pool: Optional[ProxyPool] = None,
+            sticky_proxy: bool = False,
+            metadata_store: Optional[MetadataStore] = None,
     ):
         """
         MyOkxFunding is a convenient library for interacting with the OKX Funding API.
@@ -49,7 +81,27 @@ class MyOKX:
         :param passphrase: Passphrase (created by the user during API key generation on OKX).
         :param proxy: HTTP/HTTPS proxy (e.g., user12345:abcdef@12.345.67.890:1234).
         :param logger: Logger object (used to log received responses).
-        :param asynchrony: Enables asynchronous operations.
+        :param asynchrony: Enables asynchronous operations (otherwise the synchronous httpx client runs in a thread pool).
+        :param hub: Shared pool of httpx clients (lets many instances reuse the same connections).
+        :param rate_limiter: Request scheduler respecting the OKX per-endpoint rate limits (can be shared by many instances).
+        :param chains_info_ttl: Time to live (in seconds) of the cached currency chains metadata (None means no expiration;
+        replaced by `MetadataStore.ttl` if a metadata store is given).
+        :param price_max_age: Maximum age (in seconds) of the last price snapshot to serve `PUBLIC_get_price` from (None disables it).
+        :param price_book: Live price book (WebSocket tickers subscription) to serve prices from while it is live.
+        :param json_decoder: Function decoding response bodies (defaults to orjson.loads if installed, otherwise json.loads).
+        :param executor: Bounded thread pool running requests of the synchronous client (defaults to the event loop executor).
+        :param models: Returns compact typed results (Balances, ChainsInfo, ChainInfo, Withdrawal, Transfer) instead of raw json.
+        :param metrics: Collector of per-endpoint request metrics (can be shared by many instances).
+        :param retry_policy: Retries of idempotent (GET) requests on transient errors (POST requests are never retried).
+        :param hedge_policy: Hedged duplicates of slow idempotent (GET) requests.
+        :param circuit_breaker: Per-endpoint circuit breaker failing requests fast while OKX is degraded (can be shared by many instances).
+        :param coalesce: Concurrent identical GET requests share one in-flight request (every caller gets its own copy of the parsed result).
+        :param coalesce_ttl: Time (in seconds) a successful coalesced GET result is reused after it completes (0 disables the micro-cache).
+        :param proxy_pool: Pool of egress proxies requests are spread over (replaces `proxy`; can be shared by many instances).
+        :param sticky_proxy: Sends all requests of the API key through one proxy of the pool while it is healthy.
+        :param metadata_store: Persistent cache of chains metadata and subaccount lists shared by the processes of a host
+        (warms the chains cache on the first lookup; stale entries are served while they are refreshed in the background;
+        store calls run in a thread pool, so they never block the event loop).
         """
         self._api_key = api_key
         self._secret_key = secret_key
@@ -57,12 +109,65 @@ class MyOKX:
         self._proxy = proxy
         self._logger = logger
         self._asynchrony = asynchrony
-        self._httpx_client = self._get_httpx_client()
+        self._hub = hub
+        self._hmac = hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+        self._headers = {
+            'OK-ACCESS-KEY': api_key,
+            'OK-ACCESS-PASSPHRASE': passphrase,
+            'Content-Type': 'application/json',
+        }
+        self._time_second = None
+        self._time_prefix = ''
+        self._rate_limiter = rate_limiter
+        # Raw rows are only kept for the json results (models return the compact records)
+        self._chains_info_cache = ChainsInfoCache(
+            ttl=(chains_info_ttl if metadata_store is None else metadata_store.ttl),
+            keep_rows=not models,
+        )
+        self._chains_info_lock = asyncio.Lock()
+        self._price_max_age = price_max_age
+        self._price_snapshot: Optional[PriceSnapshot] = None
+        self._price_book = price_book
+        self._json_decoder = json_decoder or json_loads
+        self._executor = executor
+        self._models = models
+        self._metrics = metrics
+        self._retry_policy = retry_policy or RetryPolicy(retries=0)
+        self._hedge_policy = hedge_policy
+        self._circuit_breaker = circuit_breaker
+        self._coalesce = coalesce
+        self._coalesce_ttl = coalesce_ttl
+        # Key: [in-flight request, number of callers waiting for it]
+        self._inflight: Dict[str, list] = {}
+        self._coalesced: Dict[str, Tuple[float, Tuple[int, Any]]] = {}
+        self._proxy_pool = proxy_pool
+        self._sticky_proxy = sticky_proxy
+        self._metadata_store = metadata_store
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        # The chains cache is warmed from the metadata store on the first lookup (or by `warm_up`), never in the constructor
+        self._chains_info_etag: Optional[str] = None
+        # The client is created on the first request (or by `warm_up`)
+        self._httpx_client: Optional[Union[Client, AsyncClient]] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
 
-    async def PUBLIC_get_price(self, ticker: str) -> Tuple[int, Union[float, Exception]]:
-        """Gets the price (in USDT) of a specific coin by its ticker (e.g., BTC, ETH)."""
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+    async def PUBLIC_get_price(self, ticker: str, max_age: Optional[float] = None) -> Tuple[int, Union[float, Exception]]:
+        """
+        Gets the price (in USDT) of a specific coin by its ticker (e.g., BTC, ETH).
+        The price is read from the live price book (if any), then from the last price snapshot if it is not older
+        than `max_age` seconds (defaults to the `price_max_age` of the instance), otherwise it is requested from the price limits.
+        """
+        log_process = 'PUBLIC_get_price'
         try:
+            if self._price_book is not None:
+                price = self._price_book.get_price(ticker)
+                if price is not None:
+                    return 0, round(price, 2)
+            max_age = self._price_max_age if (max_age is None) else max_age
+            snapshot = self._price_snapshot
+            if (max_age is not None) and (snapshot is not None) and (snapshot.age <= max_age):
+                price = snapshot.get_price(ticker)
+                if price is not None:
+                    return 0, round(price, 2)
             status, result = await self.PUBLIC_get_price_limit(ticker=ticker)
             if status == 0:
                 data = result['data'][0]
@@ -74,25 +179,51 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
+    async def PUBLIC_get_prices(self, ) -> Tuple[int, Union[PriceSnapshot, Exception]]:
+        """
+        Gets the prices (in USDT) of all spot coins in one request and saves them as the last price snapshot.
+        Endpoint: https://www.okx.cab/docs-v5/en/#order-book-trading-market-data-get-tickers
+        """
+        log_process = 'PUBLIC_get_prices'
+        try:
+            endpoint = f'/api/v5/market/tickers'
+            method = f'GET'
+            body = f'?instType=SPOT'
+            status_code, json = await self._httpx_request(
+                endpoint=endpoint,
+                method=method,
+                body=body,
+            )
+            if status_code == 200:
+                snapshot = PriceSnapshot.from_json(json['data'], quote='USDT')
+                self._price_snapshot = snapshot
+                return 0, snapshot
+            else:
+                if 'msg' in json:
+                    return -1, Exception(f'{log_process} | {json["msg"]}')
+                else:
+                    return -1, Exception(f'{log_process} | {json}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
     async def PUBLIC_get_price_limit(self, ticker: str) -> Tuple[int, Union[dict, Exception]]:
         """
         Gets the buy and sell limits (in USDT) for a specific coin by its ticker (e.g., BTC, ETH).
         Endpoint: https://www.okx.cab/docs-v5/en/#public-data-rest-api-get-limit-price
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'PUBLIC_get_price_limit'
         try:
             endpoint = f'/api/v5/public/price-limit'
             method = f'GET'
             body = f'?instId={ticker}-USDT'
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            if response.status_code == 200:
-                return 0, dict(response.json())
+            if status_code == 200:
+                return 0, dict(json)
             else:
-                json = response.json()
                 if 'msg' in json:
                     return -1, Exception(f'{log_process} | {json["msg"]}')
                 else:
@@ -105,20 +236,19 @@ class MyOKX:
         Checks the connection to the funding account.
         Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-get-balance
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_is_connected'
         try:
             endpoint = f'/api/v5/asset/balances'
             method = f'GET'
             body = f''
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            if response.status_code == 200:
+            if status_code == 200:
                 return 0, True
             else:
-                json = response.json()
                 if 'msg' in json:
                     return -1, Exception(f'{log_process} | {json["msg"]}')
                 else:
@@ -126,25 +256,26 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def FUNDING_get_balance(self, ticker: Optional[str] = None) -> Tuple[int, Union[dict, Exception]]:
+    async def FUNDING_get_balance(self, ticker: Optional[str] = None) -> Tuple[int, Union[dict, Balances, Exception]]:
         """
-        Gets the balance of the funding account for a specific coin and for all coins.
+        Gets the balance of the funding account for a specific coin and for all coins (Balances indexed by ccy if models are enabled).
         Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-get-balance
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_get_balance'
         try:
             endpoint = f'/api/v5/asset/balances'
             method = f'GET'
             body = f'' if (ticker is None) else f'?ccy={ticker}'
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            if response.status_code == 200:
-                return 0, dict(response.json())
+            if status_code == 200:
+                if self._models:
+                    return 0, Balances.from_json(json['data'])
+                return 0, dict(json)
             else:
-                json = response.json()
                 if 'msg' in json:
                     return -1, Exception(f'{log_process} | {json["msg"]}')
                 else:
@@ -152,15 +283,31 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def FUNDING_get_chain_info(self, ticker: str, chain: str) -> Tuple[int, Union[dict, Exception]]:
-        """Gets information about a specific currency chain (e.g., withdraw_min_value, withdraw_min_fee, withdraw_tick_size)."""
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+    async def FUNDING_get_chain_info(self, ticker: str, chain: str) -> Tuple[int, Union[dict, ChainInfo, Exception]]:
+        """
+        Gets information about a specific currency chain (e.g., withdraw_min_value, withdraw_min_fee, withdraw_tick_size).
+        The information is read from the in-memory chains cache (refreshed by one bulk request when expired)
+        and returned as the raw OKX row if models are disabled.
+        """
+        log_process = 'FUNDING_get_chain_info'
         try:
-            status, result = await self.FUNDING_get_chains_info(ticker=ticker)
+            status, result = await self.FUNDING_get_chain_record(ticker=ticker, chain=chain)
             if status == 0:
-                for network in result['data']:
-                    if str(network['chain']) == chain:
-                        return 0, network
+                return 0, (result if self._models else self._chains_info_cache.get_row(ccy=ticker, chain=chain))
+            else:
+                return -1, Exception(f'{log_process} | {result}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def FUNDING_get_chain_record(self, ticker: str, chain: str) -> Tuple[int, Union[ChainInfo, Exception]]:
+        """Gets the compact record of a specific currency chain from the in-memory chains cache."""
+        log_process = 'FUNDING_get_chain_record'
+        try:
+            status, result = await self.FUNDING_refresh_chains_info(force=False)
+            if status == 0:
+                record = self._chains_info_cache.get(ccy=ticker, chain=chain)
+                if record is not None:
+                    return 0, record
                 else:
                     return -1, Exception(f'{log_process} | No such a chain!')
             else:
@@ -168,25 +315,83 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def FUNDING_get_chains_info(self, ticker: Optional[str] = None) -> Tuple[int, Union[dict, Exception]]:
+    async def FUNDING_get_native_chain_record(self, network: str) -> Tuple[int, Union[ChainInfo, Exception]]:
+        """Gets the compact record of a native coin chain by its network name from `withdraw_native_chains` (e.g., Base, BSC)."""
+        log_process = 'FUNDING_get_native_chain_record'
+        try:
+            chain = self.withdraw_native_chains.get(network)
+            if chain is not None:
+                ticker = chain.split('-', 1)[0]
+                status, result = await self.FUNDING_get_chain_record(ticker=ticker, chain=chain)
+                if status == 0:
+                    return 0, result
+                else:
+                    return -1, Exception(f'{log_process} | {result}')
+            else:
+                return -1, Exception(f'{log_process} | No such a network!')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def FUNDING_refresh_chains_info(self, force: bool = True) -> Tuple[int, Union[bool, Exception]]:
+        """
+        Refreshes the in-memory chains cache with one bulk request of all currencies
+        (when `force` is False, the request is made only if the cache is expired).
+        """
+        log_process = 'FUNDING_refresh_chains_info'
+        try:
+            if not force and self._chains_info_cache.is_fresh:
+                return 0, True
+            if not force and self._metadata_store is not None:
+                if await self._warm_stored_chains_info():
+                    return 0, True
+                age = self._chains_info_cache.age
+                if self._chains_info_cache.size and (age is not None) and (age < self._metadata_store.max_stale):
+                    self._refresh_in_background('currencies', self.FUNDING_refresh_chains_info)
+                    return 0, True
+            async with self._chains_info_lock:
+                if not force and self._chains_info_cache.is_fresh:
+                    return 0, True
+                if self._metadata_store is not None:
+                    status, result = await self._refresh_stored('currencies', self.FUNDING_get_chains_info)
+                    if status == 0 and not self._chains_info_cache.is_fresh:
+                        # Another process has refreshed the metadata
+                        await self._warm_stored_chains_info()
+                else:
+                    status, result = await self.FUNDING_get_chains_info()
+                if status == 0:
+                    return 0, True
+                else:
+                    return -1, Exception(f'{log_process} | {result}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def FUNDING_get_chains_info(self, ticker: Optional[str] = None) -> Tuple[int, Union[dict, ChainsInfo, Exception]]:
         """
         Gets information about all currency chains (e.g., withdraw_min_value, withdraw_min_fee, withdraw_tick_size).
+        A request without a ticker also refills the in-memory chains cache (ChainsInfo indexed by ccy and chain if models are enabled).
         Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-get-currencies
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_get_chains_info'
         try:
             endpoint = f'/api/v5/asset/currencies'
             method = f'GET'
             body = f'' if (ticker is None) else f'?ccy={ticker}'
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            if response.status_code == 200:
-                return 0, dict(response.json())
+            if status_code == 200:
+                chains_info = None
+                if ticker is None:
+                    chains_info = ChainsInfo.from_json(json['data'])
+                    self._chains_info_cache.set(chains_info, data=json['data'])
+                    if self._metadata_store is not None:
+                        await afh(self._metadata_store.set, False, 'currencies', json['data'])
+                if self._models:
+                    return 0, chains_info or ChainsInfo.from_json(json['data'])
+                return 0, dict(json)
             else:
-                json = response.json()
                 if 'msg' in json:
                     return -1, Exception(f'{log_process} | {json["msg"]}')
                 else:
@@ -199,15 +404,14 @@ class MyOKX:
         Converts USD amount to the native chain coin amount, rounded to the chain's tick_size value
         (e.g., 100 USD converts to 0.02857143 ETH for an ETH price of 3500 USD).
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_convert_usd_to_native'
         try:
             status, result = await self.PUBLIC_get_price(ticker=ticker)
             if status == 0:
                 price: float = result
-                status, result = await self.FUNDING_get_chain_info(ticker=ticker, chain=chain)
+                status, result = await self.FUNDING_get_chain_record(ticker=ticker, chain=chain)
                 if status == 0:
-                    precision = int(result['wdTickSz'])
-                    return 0, round(amount / price, precision)
+                    return 0, round(amount / price, result.wd_tick_sz)
                 else:
                     return -1, Exception(f'{log_process} | {result}')
             else:
@@ -215,12 +419,21 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def FUNDING_post_withdrawal(self, ticker: str, chain: str, address: str, amount: float, fee: float) -> Tuple[int, Union[str, Exception]]:
+    async def FUNDING_post_withdrawal(
+            self,
+            ticker: str,
+            chain: str,
+            address: str,
+            amount: float,
+            fee: float,
+            client_id: Optional[str] = None,
+    ) -> Tuple[int, Union[str, Exception]]:
         """
         Posts a withdrawal on the chain for a specific ticker and chain (withdrawals must be available for created API keys).
+        The optional client_id (up to 32 alphanumerics) identifies the withdrawal in the withdrawal history.
         Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-withdrawal
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_post_withdrawal'
         try:
             endpoint = '/api/v5/asset/withdrawal'
             method = 'POST'
@@ -232,13 +445,14 @@ class MyOKX:
                 'fee': fee,
                 'chain': chain,
             }
-            response = await self._httpx_request(
+            if client_id is not None:
+                body['clientId'] = client_id
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            json = response.json()
-            if response.status_code == 200:
+            if status_code == 200:
                 data = json['data']
                 if data:
                     wd_id = ''
@@ -258,27 +472,26 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def FUNDING_get_withdrawal(self, withdrawal_id: str) -> Tuple[int, Union[dict, Exception]]:
+    async def FUNDING_get_withdrawal(self, withdrawal_id: str) -> Tuple[int, Union[dict, Withdrawal, Exception]]:
         """
         Gets information about a withdrawal (e.g., status, transaction_hash).
         Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-get-withdrawal-history
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_get_withdrawal'
         try:
             endpoint = '/api/v5/asset/withdrawal-history'
             method = 'GET'
             body = f'?wdId={withdrawal_id}'
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            json = response.json()
-            if response.status_code == 200:
+            if status_code == 200:
                 data = json['data']
                 if data:
                     if data[0]['wdId'] == withdrawal_id:
-                        return 0, data[0]
+                        return 0, (Withdrawal.from_json(data[0]) if self._models else data[0])
                     else:
                         return -1, Exception(f'{log_process} | Wrong withdrawal[{withdrawal_id}] json!')
                 else:
@@ -291,16 +504,84 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
+    async def FUNDING_get_withdrawals(
+            self,
+            ticker: Optional[str] = None,
+            after: Optional[str] = None,
+            before: Optional[str] = None,
+            limit: int = 100,
+            client_id: Optional[str] = None,
+    ) -> Tuple[int, Union[list, Exception]]:
+        """
+        Gets one page of the withdrawal history, newest first (`after`/`before` are millisecond timestamps, `limit` is up to 100).
+        The page contains Withdrawal records if models are enabled.
+        Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-get-withdrawal-history
+        """
+        log_process = 'FUNDING_get_withdrawals'
+        try:
+            endpoint = '/api/v5/asset/withdrawal-history'
+            method = 'GET'
+            params = {'ccy': ticker, 'clientId': client_id, 'after': after, 'before': before, 'limit': limit}
+            body = '?' + '&'.join(f'{key}={value}' for key, value in params.items() if value is not None)
+            status_code, json = await self._httpx_request(
+                endpoint=endpoint,
+                method=method,
+                body=body,
+            )
+            if status_code == 200:
+                if self._models:
+                    return 0, [Withdrawal.from_json(data) for data in json['data']]
+                return 0, list(json['data'])
+            else:
+                if 'msg' in json:
+                    return -1, Exception(f'{log_process} | {json["msg"]}')
+                else:
+                    return -1, Exception(f'{log_process} | {json}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def FUNDING_get_deposits(
+            self,
+            ticker: Optional[str] = None,
+            after: Optional[str] = None,
+            before: Optional[str] = None,
+            limit: int = 100,
+    ) -> Tuple[int, Union[list, Exception]]:
+        """
+        Gets one page of the deposit history, newest first (`after`/`before` are millisecond timestamps, `limit` is up to 100).
+        Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-get-deposit-history
+        """
+        log_process = 'FUNDING_get_deposits'
+        try:
+            endpoint = '/api/v5/asset/deposit-history'
+            method = 'GET'
+            params = {'ccy': ticker, 'after': after, 'before': before, 'limit': limit}
+            body = '?' + '&'.join(f'{key}={value}' for key, value in params.items() if value is not None)
+            status_code, json = await self._httpx_request(
+                endpoint=endpoint,
+                method=method,
+                body=body,
+            )
+            if status_code == 200:
+                return 0, list(json['data'])
+            else:
+                if 'msg' in json:
+                    return -1, Exception(f'{log_process} | {json["msg"]}')
+                else:
+                    return -1, Exception(f'{log_process} | {json}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
     async def FUNDING_check_withdrawal(self, withdrawal_id: str) -> Tuple[int, Union[bool, Exception]]:
         """
         Checks if the withdrawal is completed by its withdrawal_id
         (the withdrawal_id is returned after posting the withdrawal on the chain).
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'FUNDING_check_withdrawal'
         try:
             status, result = await self.FUNDING_get_withdrawal(withdrawal_id=withdrawal_id)
             if status == 0:
-                state = result['state']
+                state = result.state if self._models else result['state']
                 if state not in ['-3', '-2', '-1']:
                     if state == '2':
                         return 0, True
@@ -315,28 +596,79 @@ class MyOKX:
 
     async def SUBACCOUNT_get_subaccounts(self, ) -> Tuple[int, Union[list, Exception]]:
         """
-        Gets the names of all subaccounts created under the main OKX account.
+        Gets the names of all subaccounts created under the main OKX account (walks through all pages of the list).
         Endpoint: https://www.okx.cab/docs-v5/en/#sub-account-rest-api-get-sub-account-list
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SUBACCOUNT_get_subaccounts'
+        try:
+            if self._metadata_store is not None:
+                key = MetadataStore.get_account_key('subaccounts', self._api_key)
+                entry = await afh(self._metadata_store.get, False, key)
+                if entry is not None:
+                    subaccounts_list, age = entry
+                    if age >= self._metadata_store.ttl:
+                        if age >= self._metadata_store.max_stale:
+                            return await self._refresh_stored(key, self._fetch_subaccounts)
+                        self._refresh_in_background(key, functools.partial(self._refresh_stored, key, self._fetch_subaccounts))
+                    return 0, subaccounts_list
+                return await self._refresh_stored(key, self._fetch_subaccounts)
+            return await self._fetch_subaccounts()
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def _fetch_subaccounts(self, ) -> Tuple[int, Union[list, Exception]]:
+        log_process = 'SUBACCOUNT_get_subaccounts'
         try:
             endpoint = '/api/v5/users/subaccount/list'
             method = 'GET'
-            body = ''
-            response = await self._httpx_request(
+            limit = 100
+            subaccounts_list = []
+            after = None
+            while True:
+                body = f'?limit={limit}' if (after is None) else f'?limit={limit}&after={after}'
+                status_code, json = await self._httpx_request(
+                    endpoint=endpoint,
+                    method=method,
+                    body=body,
+                )
+                if status_code == 200:
+                    for subaccount_dict in json['data']:
+                        subaccounts_list.append(subaccount_dict['subAcct'])
+                    if len(json['data']) < limit:
+                        break
+                    after = json['data'][-1]['ts']
+                else:
+                    if 'msg' in json:
+                        return -1, Exception(f'{log_process} | {json["msg"]}')
+                    else:
+                        return -1, Exception(f'{log_process} | {json}')
+            if subaccounts_list:
+                if self._metadata_store is not None:
+                    await afh(self._metadata_store.set, False, MetadataStore.get_account_key('subaccounts', self._api_key), subaccounts_list)
+                return 0, subaccounts_list
+            else:
+                return -1, Exception(f'{log_process} | Empty subaccounts list!')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def SUBACCOUNT_get_subaccounts_page(self, after: Optional[str] = None, limit: int = 100) -> Tuple[int, Union[list, Exception]]:
+        """
+        Gets one page of the subaccount list, newest first (`after` is a millisecond timestamp, `limit` is up to 100).
+        Endpoint: https://www.okx.cab/docs-v5/en/#sub-account-rest-api-get-sub-account-list
+        """
+        log_process = 'SUBACCOUNT_get_subaccounts_page'
+        try:
+            endpoint = '/api/v5/users/subaccount/list'
+            method = 'GET'
+            params = {'after': after, 'limit': limit}
+            body = '?' + '&'.join(f'{key}={value}' for key, value in params.items() if value is not None)
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            json = response.json()
-            if response.status_code == 200:
-                subaccounts_list = []
-                for subaccount_dict in json['data']:
-                    subaccounts_list.append(subaccount_dict['subAcct'])
-                if subaccounts_list:
-                    return 0, subaccounts_list
-                else:
-                    return -1, Exception(f'{log_process} | Empty subaccounts list!')
+            if status_code == 200:
+                return 0, list(json['data'])
             else:
                 if 'msg' in json:
                     return -1, Exception(f'{log_process} | {json["msg"]}')
@@ -350,18 +682,17 @@ class MyOKX:
         Gets the balance for a specific coin in a specific subaccount.
         Endpoint: https://www.okx.cab/docs-v5/en/#sub-account-rest-api-get-sub-account-funding-balance
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SUBACCOUNT_get_balance'
         try:
             endpoint = '/api/v5/asset/subaccount/balances'
             method = 'GET'
             body = f'?subAcct={subaccount_name}&ccy={ticker}'
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            json = response.json()
-            if response.status_code == 200:
+            if status_code == 200:
                 return 0, float(json['data'][0]['availBal'])
             else:
                 if 'msg' in json:
@@ -371,12 +702,51 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
-    async def SUBACCOUNT_transfer_to_main(self, subaccount_name: str, ticker: str, amount: float) -> Tuple[int, Union[str, Exception]]:
+    async def SUBACCOUNT_get_balances(
+            self,
+            subaccount_name: str,
+            tickers: Optional[List[str]] = None,
+            field: str = 'availBal',
+    ) -> Tuple[int, Union[Dict[str, float], Exception]]:
+        """
+        Gets the balances ({ticker: amount}) for many coins (or all non-zero coins) in a specific subaccount,
+        requesting up to 20 coins at once. The `field` is the OKX balance field: availBal (available) or bal (total, including frozen).
+        Endpoint: https://www.okx.cab/docs-v5/en/#sub-account-rest-api-get-sub-account-funding-balance
+        """
+        log_process = 'SUBACCOUNT_get_balances'
+        try:
+            endpoint = '/api/v5/asset/subaccount/balances'
+            method = 'GET'
+            if tickers:
+                bodies = [f'?subAcct={subaccount_name}&ccy={",".join(tickers[i:i + 20])}' for i in range(0, len(tickers), 20)]
+            else:
+                bodies = [f'?subAcct={subaccount_name}']
+            balances = {}
+            for body in bodies:
+                status_code, json = await self._httpx_request(
+                    endpoint=endpoint,
+                    method=method,
+                    body=body,
+                )
+                if status_code == 200:
+                    for balance_dict in json['data']:
+                        balances[str(balance_dict['ccy'])] = float(balance_dict[field])
+                else:
+                    if 'msg' in json:
+                        return -1, Exception(f'{log_process} | {json["msg"]}')
+                    else:
+                        return -1, Exception(f'{log_process} | {json}')
+            return 0, balances
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def SUBACCOUNT_transfer_to_main(self, subaccount_name: str, ticker: str, amount: float) -> Tuple[int, Union[str, Transfer, Exception]]:
         """
-        Transfers coins from a subaccount to the main account for a specific coin from a specific subaccount.
+        Transfers coins from a subaccount to the main account for a specific coin from a specific subaccount
+        (returns the transfer_id, or a Transfer record if models are enabled).
         Endpoint: https://www.okx.cab/docs-v5/en/#funding-account-rest-api-funds-transfer
         """
-        log_process = f'{inspect.currentframe().f_code.co_name}'
+        log_process = 'SUBACCOUNT_transfer_to_main'
         try:
             endpoint = '/api/v5/asset/transfer'
             method = 'POST'
@@ -388,15 +758,16 @@ class MyOKX:
                 'to': 6,
                 'subAcct': subaccount_name,
             }
-            response = await self._httpx_request(
+            status_code, json = await self._httpx_request(
                 endpoint=endpoint,
                 method=method,
                 body=body,
             )
-            json = response.json()
-            if response.status_code == 200:
+            if status_code == 200:
                 data = json['data']
                 if data:
+                    if self._models:
+                        return 0, Transfer.from_json(data[-1])
                     trans_id = ''
                     for part in data:
                         trans_id = str(part['transId'])
@@ -414,51 +785,407 @@ class MyOKX:
         except Exception as e:
             return -1, Exception(f'{log_process} | {e}')
 
+    async def SUBACCOUNT_get_transfers(
+            self,
+            subaccount_name: Optional[str] = None,
+            ticker: Optional[str] = None,
+            after: Optional[str] = None,
+            before: Optional[str] = None,
+            limit: int = 100,
+    ) -> Tuple[int, Union[list, Exception]]:
+        """
+        Gets one page of the transfer history between the main account and subaccounts, newest first
+        (`after`/`before` are millisecond timestamps, `limit` is up to 100).
+        Endpoint: https://www.okx.cab/docs-v5/en/#sub-account-rest-api-history-of-sub-account-transfer
+        """
+        log_process = 'SUBACCOUNT_get_transfers'
+        try:
+            endpoint = '/api/v5/asset/subaccount/bills'
+            method = 'GET'
+            params = {'ccy': ticker, 'subAcct': subaccount_name, 'after': after, 'before': before, 'limit': limit}
+            body = '?' + '&'.join(f'{key}={value}' for key, value in params.items() if value is not None)
+            status_code, json = await self._httpx_request(
+                endpoint=endpoint,
+                method=method,
+                body=body,
+            )
+            if status_code == 200:
+                return 0, list(json['data'])
+            else:
+                if 'msg' in json:
+                    return -1, Exception(f'{log_process} | {json["msg"]}')
+                else:
+                    return -1, Exception(f'{log_process} | {json}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    def invalidate_chains_info(self, ) -> None:
+        """Marks the in-memory chains cache as expired (the next chain lookup makes a bulk request)."""
+        self._chains_info_cache.invalidate()
+
+    def prioritized(self, priority: int) -> ContextManager[None]:
+        """
+        Sets the rate limiter priority of the requests made in the block (lower value is served first), e.g.:
+        `with my_okx.prioritized(RateLimiter.PRIORITY_HIGH): await my_okx.FUNDING_post_withdrawal(...)`.
+        A priority only reorders requests waiting for the same bucket (see RateLimiter), and a GET request joining
+        an identical in-flight one (`coalesce`) keeps the priority of the first.
+
+        :param priority: Priority of the requests (RateLimiter.PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW).
+        """
+        return RateLimiter.prioritized(priority)
+
+    async def warm_up(
+            self,
+            connections: int = 1,
+            prefetch: bool = False,
+            keepalive: Optional[float] = None,
+    ) -> Tuple[int, Union[int, Exception]]:
+        """
+        Pre-opens keep-alive connections (DNS, TCP, TLS and proxy CONNECT) with concurrent requests of the public time endpoint,
+        so the first real requests (e.g., withdrawals) do not pay a cold handshake. Returns the number of warmed connections
+        (requests answered with a 2xx status). The requests go through the rate limiter (the endpoint allows 10 requests
+        per 2 seconds per IP, so more connections are opened over time), the proxy pool health tracking and metrics.
+
+        :param connections: Number of connections to open (per proxy of the proxy pool).
+        :param prefetch: Also refreshes the chains cache (currency metadata) if it is expired.
+        :param keepalive: Repeats the warm-up every `keepalive` seconds until `aclose` (set it below the keep-alive expiry of the pool).
+        """
+        log_process = 'warm_up'
+        try:
+            proxies = self._proxy_pool.proxies if (self._proxy_pool is not None) else [None]
+            requests = [
+                self._measured_request(method='GET', endpoint='/api/v5/public/time', body='', proxy=proxy)
+                for proxy in proxies for _ in range(connections)
+            ]
+            if prefetch:
+                requests.append(self.FUNDING_refresh_chains_info(force=False))
+            results = await asyncio.gather(*requests, return_exceptions=True)
+            if prefetch:
+                status, result = results.pop()
+                if status != 0:
+                    return -1, Exception(f'{log_process} | {result}')
+            warmed = sum(1 for result in results if not isinstance(result, BaseException) and 200 <= result[0] < 300)
+            if keepalive is not None and (self._keepalive_task is None or self._keepalive_task.done()):
+                self._keepalive_task = asyncio.ensure_future(self._keep_warm(connections=connections, interval=keepalive))
+            if warmed:
+                return 0, warmed
+            else:
+                return -1, Exception(f'{log_process} | {results[0] if results else "No connections!"}')
+        except Exception as e:
+            return -1, Exception(f'{log_process} | {e}')
+
+    async def aclose(self, ) -> None:
+        """
+        Stops the background tasks and closes the httpx client of the instance
+        (clients of a shared ClientHub or ProxyPool are closed by their owner).
+        """
+        tasks = [task for task in (self._keepalive_task, *self._refreshes.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._keepalive_task = None
+        self._refreshes.clear()
+        httpx_client, self._httpx_client = self._httpx_client, None
+        if httpx_client is not None and self._hub is None:
+            if isinstance(httpx_client, AsyncClient):
+                await httpx_client.aclose()
+            else:
+                httpx_client.close()
+
+    async def __aenter__(self, ) -> 'MyOKX':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def _keep_warm(self, connections: int, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.warm_up(connections=connections)
+
+    async def _warm_stored_chains_info(self, ) -> bool:
+        """
+        Warms the chains cache from the metadata store (returns whether the cache is fresh).
+        Only the ETag and the refresh time are checked: the stored metadata is read and parsed only if it has changed.
+        """
+        meta = await afh(self._metadata_store.get_meta, False, 'currencies')
+        if meta is not None:
+            etag, age = meta
+            if etag != self._chains_info_etag:
+                self._warm_chains_info(await afh(self._read_chains_info, False))
+            elif self._is_newer(age):
+                # Refreshed by another process without changes
+                self._chains_info_cache.touch(age=age)
+        return self._chains_info_cache.is_fresh
+
+    def _warm_chains_info(self, stored: Optional[Tuple[ChainsInfo, List[dict], float, str]]) -> bool:
+        """Loads the chains cache with the stored metadata if it is newer (returns whether the cache is fresh)."""
+        if stored is not None:
+            chains_info, data, age, etag = stored
+            if self._is_newer(age):
+                self._chains_info_cache.set(chains_info, age=age, data=data)
+                self._chains_info_etag = etag
+        return self._chains_info_cache.is_fresh
+
+    def _read_chains_info(self, ) -> Optional[Tuple[ChainsInfo, List[dict], float, str]]:
+        # The ETag is read first: a concurrent update can only make it older than the value (causing one more read later)
+        etag = self._metadata_store.get_etag('currencies')
+        entry = self._metadata_store.get('currencies')
+        if entry is None:
+            return None
+        data, age = entry
+        return ChainsInfo.from_json(data), data, age, etag
+
+    def _is_newer(self, age: Optional[float]) -> bool:
+        cache_age = self._chains_info_cache.age
+        return (age is not None) and (age < self._metadata_store.max_stale) and (cache_age is None or age < cache_age)
+
+    async def _refresh_stored(self, key: str, fetch: Callable[[], Any]) -> Tuple[int, Any]:
+        """
+        Refreshes a metadata store entry once per host: the process holding the lease calls `fetch` (which stores the result),
+        while others wait for the stored value and return (0, value). If the lease holder gives up without storing a value
+        (e.g., its request failed), the lease is released and the next waiter takes it over.
+        """
+        token = await afh(self._metadata_store.acquire_lease, False, key)
+        if token is None:
+            started = time.monotonic()
+            while token is None:
+                if time.monotonic() - started >= self._metadata_store.lease_timeout:
+                    # The lease holder is gone or too slow
+                    return await fetch()
+                await asyncio.sleep(self._metadata_store.poll_interval)
+                # Only the refresh time is polled, the value is read once it is written
+                meta = await afh(self._metadata_store.get_meta, False, key)
+                if meta is not None and meta[1] <= time.monotonic() - started:
+                    entry = await afh(self._metadata_store.get, False, key)
+                    if entry is not None:
+                        return 0, entry[0]
+                token = await afh(self._metadata_store.acquire_lease, False, key)
+        try:
+            return await fetch()
+        finally:
+            await afh(self._metadata_store.release_lease, False, key, token)
+
+    def _refresh_in_background(self, key: str, refresh: Callable[[], Any]) -> None:
+        task = self._refreshes.get(key)
+        if task is None or task.done():
+            self._refreshes[key] = asyncio.ensure_future(refresh())
+
     def _get_httpx_client(self, ) -> Union[Client, AsyncClient]:
-        if self._asynchrony:
-            httpx_client = httpx.AsyncClient(proxy=self.proxy)
-        else:
-            httpx_client = httpx.Client(proxy=self.proxy)
+        httpx_client = self._httpx_client
+        if httpx_client is None:
+            if self._hub is not None:
+                httpx_client = self._hub.get_client(proxy=self.proxy, asynchrony=self._asynchrony)
+            elif self._asynchrony:
+                httpx_client = httpx.AsyncClient(proxy=self.proxy)
+            else:
+                httpx_client = httpx.Client(proxy=self.proxy)
+            self._httpx_client = httpx_client
         return httpx_client
 
-    async def _httpx_request(self, method: str, endpoint: str, body: Union[str, dict]) -> Response:
-        timestamp = self.time
-        signature = self._get_signature(timestamp, method, endpoint, body)
-        headers = {
-            'OK-ACCESS-KEY': self._api_key,
-            'OK-ACCESS-PASSPHRASE': self._passphrase,
-            'OK-ACCESS-TIMESTAMP': timestamp,
-            'OK-ACCESS-SIGN': signature,
-        }
-        if isinstance(body, str):
-            response = await afh(
-                self._httpx_client.request, self._asynchrony,
-                method=method, url=(self.host + endpoint + body), headers=headers,
-            )
+    async def _httpx_request(self, method: str, endpoint: str, body: Union[str, dict]) -> Tuple[int, Any]:
+        if not self._coalesce or method != 'GET':
+            return await self._resilient_request(method=method, endpoint=endpoint, body=body)
+        key = endpoint + body
+        if self._coalesce_ttl:
+            cached = self._coalesced.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return copy.deepcopy(cached[1])
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            future = asyncio.ensure_future(self._resilient_request(method=method, endpoint=endpoint, body=body))
+            future.add_done_callback(functools.partial(self._on_coalesced_done, key))
+            inflight = self._inflight[key] = [future, 0]
+        inflight[1] += 1
+        result = await asyncio.shield(inflight[0])
+        if inflight[1] > 1:
+            # Every caller of a shared request gets its own copy, so mutating a result never affects the others
+            result = copy.deepcopy(result)
+        return result
+
+    def _on_coalesced_done(self, key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if self._coalesce_ttl and result[0] == 200:
+            now = time.monotonic()
+            if len(self._coalesced) >= 1024:
+                self._coalesced = {k: v for k, v in self._coalesced.items() if v[0] > now}
+            self._coalesced[key] = (now + self._coalesce_ttl, copy.deepcopy(result))
+
+    async def _resilient_request(self, method: str, endpoint: str, body: Union[str, dict]) -> Tuple[int, Any]:
+        idempotent = method == 'GET'
+        hedged = idempotent and (self._hedge_policy is not None) and (endpoint in self._hedge_policy.endpoints)
+        attempt = 0
+        while True:
+            probe = False
+            if self._circuit_breaker is not None:
+                if not self._circuit_breaker.allow(endpoint):
+                    raise CircuitOpenError(f'Circuit of {endpoint} is open!')
+                probe = self._circuit_breaker.is_probing(endpoint)
+            try:
+                if hedged:
+                    status_code, json = await self._hedged_request(method=method, endpoint=endpoint, body=body)
+                else:
+                    status_code, json = await self._measured_request(method=method, endpoint=endpoint, body=body)
+                transient = self._retry_policy.is_transient(status_code, json)
+            except httpx.TransportError:
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.record_failure(endpoint)
+                if idempotent and attempt < self._retry_policy.retries:
+                    await asyncio.sleep(self._retry_policy.get_delay(attempt))
+                    attempt += 1
+                    continue
+                raise
+            except asyncio.CancelledError:
+                # An abandoned half-open probe (e.g., hit by a caller timeout) must not keep the circuit waiting for it
+                if probe:
+                    self._circuit_breaker.release(endpoint)
+                raise
+            except Exception:
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.record_failure(endpoint)
+                raise
+            if self._circuit_breaker is not None:
+                if transient:
+                    self._circuit_breaker.record_failure(endpoint)
+                else:
+                    self._circuit_breaker.record_success(endpoint)
+            if transient and idempotent and attempt < self._retry_policy.retries:
+                await asyncio.sleep(self._retry_policy.get_delay(attempt))
+                attempt += 1
+                continue
+            return status_code, json
+
+    async def _hedged_request(self, method: str, endpoint: str, body: Union[str, dict]) -> Tuple[int, Any]:
+        tasks = {asyncio.ensure_future(self._measured_request(method=method, endpoint=endpoint, body=body))}
+        done, _ = await asyncio.wait(tasks, timeout=self._hedge_policy.delay)
+        if not done:
+            tasks.add(asyncio.ensure_future(self._measured_request(method=method, endpoint=endpoint, body=body)))
+        error = None
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _measured_request(self, method: str, endpoint: str, body: Union[str, dict], proxy: Optional[str] = None) -> Tuple[int, Any]:
+        if self._metrics is None:
+            return await self._send_request(method=method, endpoint=endpoint, body=body, event=None, proxy=proxy)
+        event = RequestEvent(endpoint=endpoint, method=method, api_key=self._api_key)
+        self._metrics.start(endpoint=endpoint, api_key=self._api_key)
+        try:
+            status_code, json = await self._send_request(method=method, endpoint=endpoint, body=body, event=event, proxy=proxy)
+            event.status_code = status_code
+            if isinstance(json, dict) and 'code' in json:
+                event.code = str(json['code'])
+            return status_code, json
+        except Exception as e:
+            event.error = type(e).__name__
+            raise
+        finally:
+            self._metrics.observe(event)
+
+    async def _send_request(
+            self,
+            method: str,
+            endpoint: str,
+            body: Union[str, dict],
+            event: Optional[RequestEvent],
+            proxy: Optional[str] = None,
+    ) -> Tuple[int, Any]:
+        """Sends a request (through `proxy` of the proxy pool if it is given, otherwise through the selected one)."""
+        started = time.perf_counter()
+        if self._proxy_pool is not None:
+            proxy = self._proxy_pool.select(api_key=(self._api_key if self._sticky_proxy else None), proxy=proxy)
+            httpx_client = self._proxy_pool.get_client(proxy=proxy, asynchrony=self._asynchrony)
         else:
+            proxy = self._proxy
+            httpx_client = self._get_httpx_client()
+        try:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(endpoint=endpoint, api_key=self._api_key, ip=proxy)
+            queued = time.perf_counter()
+            url, headers, content = self._build_request(method=method, endpoint=endpoint, body=body)
+            signed = time.perf_counter()
             response = await afh(
-                self._httpx_client.request, self._asynchrony,
-                method=method, url=(self.host + endpoint), headers=headers, json=body,
+                httpx_client.request, self._asynchrony,
+                method=method, url=url, headers=headers, content=content, executor=self._executor,
             )
-        self._log_debug(response.json())
-        return response
+        except httpx.TransportError:
+            if self._proxy_pool is not None:
+                self._proxy_pool.record(proxy=proxy, latency=None, ok=False)
+            raise
+        except BaseException:
+            if self._proxy_pool is not None:
+                self._proxy_pool.release(proxy=proxy)
+            raise
+        received = time.perf_counter()
+        if self._proxy_pool is not None:
+            self._proxy_pool.record(proxy=proxy, latency=received - signed, ok=response.status_code < 500)
+        try:
+            json = self._json_decoder(response.content)
+        except ValueError:
+            if response.status_code == 200:
+                raise
+            json = {'code': str(response.status_code), 'msg': response.text}
+        decoded = time.perf_counter()
+        if event is not None:
+            event.queue_time = queued - started
+            event.sign_time = signed - queued
+            event.network_time = received - signed
+            event.decode_time = decoded - received
+            event.total_time = decoded - started
+        self._log_debug(json)
+        return response.status_code, json
 
-    def _get_signature(self, timestamp: str, method: str, endpoint: str, body: Union[str, dict]) -> bytes:
-        message = timestamp + method.upper() + endpoint + (json.dumps(body, separators=(',', ':')) if isinstance(body, dict) else body)
-        mac = hmac.new(bytes(self._secret_key, encoding='utf-8'), bytes(message, encoding='utf-8'), digestmod='sha256')
+    def _build_request(self, method: str, endpoint: str, body: Union[str, dict]) -> Tuple[str, dict, Optional[bytes]]:
+        """Builds the url, signed headers and content of a request (a json body is serialized once: the same bytes are signed and sent)."""
+        timestamp = self.time
+        if isinstance(body, str):
+            url = self.host + endpoint + body
+            payload = body
+            content = None
+        else:
+            url = self.host + endpoint
+            payload = json.dumps(body, separators=(',', ':'))
+            content = payload.encode('utf-8')
+        headers = self._headers.copy()
+        headers['OK-ACCESS-TIMESTAMP'] = timestamp
+        headers['OK-ACCESS-SIGN'] = self._get_signature(timestamp, method, endpoint, payload)
+        return url, headers, content
+
+    def _get_signature(self, timestamp: str, method: str, endpoint: str, payload: str) -> bytes:
+        mac = self._hmac.copy()
+        mac.update((timestamp + method.upper() + endpoint + payload).encode('utf-8'))
         signature = base64.b64encode(mac.digest())
         return signature
 
-    def _log_debug(self, message: str) -> None:
-        if self._logger is not None:
-            self._logger.debug(f'{self.name} | {message}')
+    def _log_debug(self, message: Any) -> None:
+        # The message (e.g., a whole parsed response) is formatted only if DEBUG records are emitted
+        if self._logger is not None and self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('%s | %s', self.name, message)
 
     @property
     def time(self, ) -> str:
-        now = datetime.datetime.utcnow()
-        time = now.isoformat('T', 'milliseconds')
-        return time + 'Z'
+        milliseconds = int(time.time() * 1000)
+        second = milliseconds // 1000
+        if second != self._time_second:
+            self._time_second = second
+            self._time_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        return f'{self._time_prefix}.{milliseconds % 1000:03d}Z'
 
     @property
     def proxy(self, ) -> Optional[str]:
         return f'http://{self._proxy}' if self._proxy else None
+
+    @property
+    def rate_limiter(self, ) -> Optional[RateLimiter]:
+        return self._rate_limiter
@@ -0,0 +1,148 @@
+from typing import Optional, Union, Callable, Awaitable, Iterable, Tuple, AsyncIterator
+
+import csv
+import json
+import asyncio
+
+from .myokx import MyOKX
+
+
+class PaginationError(Exception):
+    pass
+
+
+class Paginator:
+    def __init__(
+            self,
+            fetch_page: Callable[..., Awaitable[Tuple[int, Union[list, Exception]]]],
+            limit: int = 100,
+            after: Optional[str] = None,
+            before: Optional[str] = None,
+            prefetch: bool = True,
+            max_pages: Optional[int] = None,
+            **params,
+    ):
+        """
+        Paginator walks a history (or list) endpoint from the newest row to the oldest one with the OKX `after` cursor
+        (the timestamp of the last row of the previous page) and streams rows one by one (`async for row in paginator`),
+        so months of history are never held in memory. The next page is requested while the current one is consumed.
+        A failed page request stops the iteration with a PaginationError.
+
+        :param fetch_page: Method requesting one page (e.g., my_okx.FUNDING_get_withdrawals) called with `after`, `limit` and `params`.
+        :param limit: Page size (up to 100).
+        :param after: Returns rows older than the timestamp (in milliseconds).
+        :param before: Returns rows newer than the timestamp (in milliseconds).
+        :param prefetch: Requests the next page while the current one is consumed.
+        :param max_pages: Maximum number of pages (None means no limit).
+        :param params: Other parameters of the page method (e.g., ticker).
+        """
+        self._fetch_page = fetch_page
+        self._limit = limit
+        self._after = after
+        self._before = before
+        self._prefetch = prefetch
+        self._max_pages = max_pages
+        self._params = params
+        self.pages = 0
+        self.rows = 0
+
+    @classmethod
+    def withdrawals(cls, my_okx: MyOKX, ticker: Optional[str] = None, **kwargs) -> 'Paginator':
+        """Paginator of the withdrawal history (rows are Withdrawal records if models are enabled)."""
+        return cls(my_okx.FUNDING_get_withdrawals, ticker=ticker, **kwargs)
+
+    @classmethod
+    def deposits(cls, my_okx: MyOKX, ticker: Optional[str] = None, **kwargs) -> 'Paginator':
+        """Paginator of the deposit history."""
+        return cls(my_okx.FUNDING_get_deposits, ticker=ticker, **kwargs)
+
+    @classmethod
+    def transfers(cls, my_okx: MyOKX, subaccount_name: Optional[str] = None, ticker: Optional[str] = None, **kwargs) -> 'Paginator':
+        """Paginator of the transfer history between the main account and subaccounts."""
+        return cls(my_okx.SUBACCOUNT_get_transfers, subaccount_name=subaccount_name, ticker=ticker, **kwargs)
+
+    @classmethod
+    def subaccounts(cls, my_okx: MyOKX, **kwargs) -> 'Paginator':
+        """Paginator of the subaccount list (`before` is not supported by the endpoint)."""
+        return cls(my_okx.SUBACCOUNT_get_subaccounts_page, **kwargs)
+
+    async def __aiter__(self, ) -> AsyncIterator[Union[dict, object]]:
+        async for page in self.iter_pages():
+            for row in page:
+                yield row
+
+    async def iter_pages(self, ) -> AsyncIterator[list]:
+        """Streams whole pages (newest first)."""
+        after = self._after
+        task = asyncio.ensure_future(self._fetch(after))
+        try:
+            while True:
+                status, result = await task
+                if status != 0:
+                    raise PaginationError(f'Paginator | {result}')
+                page = result
+                self.pages += 1
+                self.rows += len(page)
+                last = len(page) < self._limit or (self._max_pages is not None and self.pages >= self._max_pages)
+                if not last:
+                    after = self._get_cursor(page[-1])
+                    task = asyncio.ensure_future(self._fetch(after)) if self._prefetch else None
+                if page:
+                    yield page
+                if last:
+                    break
+                if task is None:
+                    task = asyncio.ensure_future(self._fetch(after))
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+
+    async def to_jsonl(self, path: str, append: bool = False) -> Tuple[int, Union[int, Exception]]:
+        """Streams all rows to a JSONL file (one json object per line) and returns the number of written rows."""
+        try:
+            count = 0
+            with open(path, 'a' if append else 'w', encoding='utf-8') as file:
+                async for page in self.iter_pages():
+                    file.writelines(json.dumps(self._to_dict(row), separators=(',', ':')) + '\n' for row in page)
+                    count += len(page)
+            return 0, count
+        except Exception as e:
+            return -1, Exception(f'Paginator | {e}')
+
+    async def to_csv(self, path: str, fields: Optional[Iterable[str]] = None) -> Tuple[int, Union[int, Exception]]:
+        """
+        Streams all rows to a CSV file and returns the number of written rows.
+        The columns are `fields` (the keys of the first row by default, other keys are dropped).
+        """
+        try:
+            count = 0
+            writer = None
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                async for page in self.iter_pages():
+                    rows = [self._to_dict(row) for row in page]
+                    if writer is None:
+                        writer = csv.DictWriter(file, fieldnames=list(fields or rows[0]), extrasaction='ignore')
+                        writer.writeheader()
+                    writer.writerows(rows)
+                    count += len(rows)
+                if writer is None and fields is not None:
+                    csv.DictWriter(file, fieldnames=list(fields)).writeheader()
+            return 0, count
+        except Exception as e:
+            return -1, Exception(f'Paginator | {e}')
+
+    async def _fetch(self, after: Optional[str]) -> Tuple[int, Union[list, Exception]]:
+        kwargs = {key: value for key, value in self._params.items() if value is not None}
+        if self._before is not None:
+            kwargs['before'] = self._before
+        return await self._fetch_page(after=after, limit=self._limit, **kwargs)
+
+    @staticmethod
+    def _get_cursor(row: Union[dict, object]) -> str:
+        return str(row['ts'] if isinstance(row, dict) else row.ts)
+
+    @staticmethod
+    def _to_dict(row: Union[dict, object]) -> dict:
+        if isinstance(row, dict):
+            return row
+        return {slot: getattr(row, slot) for slot in row.__slots__}
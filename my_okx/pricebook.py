@@ -0,0 +1,146 @@
+from logging import Logger
+from typing import Optional, Iterable, List, Set, Any
+
+import json
+import random
+import logging
+import asyncio
+
+from .prices import PriceSnapshot
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+
+class PriceBook:
+    name = 'OKX'
+    url = 'wss://ws.okx.com:8443/ws/v5/public'
+
+    def __init__(
+            self,
+            tickers: Iterable[str],
+            quote: str = 'USDT',
+            max_staleness: float = 10.0,
+            ping_interval: float = 20.0,
+            reconnect_delay: float = 1.0,
+            max_reconnect_delay: float = 30.0,
+            url: Optional[str] = None,
+            logger: Optional[Logger] = None,
+    ):
+        """
+        PriceBook keeps an in-memory price book updated by one subscription to the OKX public `tickers` channel.
+        It reconnects (with exponential backoff) and resubscribes on errors and tracks the staleness of every price.
+        Requires the `websockets` package (pip install websockets).
+
+        :param tickers: Coin tickers to subscribe to (e.g., BTC, ETH).
+        :param quote: Quote coin of the spot instruments (e.g., USDT).
+        :param max_staleness: Maximum age (in seconds) of a price that is still served.
+        :param ping_interval: Idle time (in seconds) after which a ping is sent (OKX closes connections idle for 30 seconds).
+        :param reconnect_delay: Initial delay (in seconds) before reconnecting.
+        :param max_reconnect_delay: Maximum delay (in seconds) before reconnecting.
+        :param url: WebSocket URL of the OKX public channels.
+        :param logger: Logger object (used to log connection errors).
+        """
+        self._tickers: Set[str] = set(tickers)
+        self._quote = quote
+        self._max_staleness = max_staleness
+        self._ping_interval = ping_interval
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._url = url or self.url
+        self._logger = logger
+        self._snapshot = PriceSnapshot(quote=quote)
+        self._websocket = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        self.reconnects = 0
+
+    async def start(self, wait: bool = True, timeout: Optional[float] = 10.0) -> None:
+        """Starts the subscription in a background task (optionally waits for the first connection)."""
+        if websockets is None:
+            raise ImportError('PriceBook requires the `websockets` package (pip install websockets)')
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if wait:
+            await asyncio.wait_for(self._connected.wait(), timeout=timeout)
+
+    async def stop(self, ) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def subscribe(self, tickers: Iterable[str]) -> None:
+        """Adds tickers to the subscription (they are sent at once if connected and on every reconnect)."""
+        new_tickers = [ticker for ticker in tickers if ticker not in self._tickers]
+        self._tickers.update(new_tickers)
+        if new_tickers and self._websocket is not None and self.is_live:
+            await self._websocket.send(self._get_subscription(new_tickers))
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        """Gets the price of a coin if the book is live and the price is not stale (otherwise returns None)."""
+        if not self.is_live:
+            return None
+        age = self._snapshot.get_age(ticker)
+        if age is None or age > self._max_staleness:
+            return None
+        return self._snapshot.get_price(ticker)
+
+    async def _run(self, ) -> None:
+        delay = self._reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self._url) as websocket:
+                    self._websocket = websocket
+                    await websocket.send(self._get_subscription(self._tickers))
+                    self._connected.set()
+                    delay = self._reconnect_delay
+                    await self._listen(websocket)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log_debug(f'Price book connection error: {e}')
+            finally:
+                self._websocket = None
+                self._connected.clear()
+            self.reconnects += 1
+            await asyncio.sleep(delay * (1 + random.random() / 2))
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    async def _listen(self, websocket) -> None:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.recv(), timeout=self._ping_interval)
+            except asyncio.TimeoutError:
+                await websocket.send('ping')
+                message = await asyncio.wait_for(websocket.recv(), timeout=self._ping_interval)
+            if message == 'pong':
+                continue
+            data = json.loads(message)
+            if data.get('event') == 'error':
+                self._log_debug(f'Price book subscription error: {data}')
+            elif 'data' in data:
+                for ticker_dict in data['data']:
+                    self._snapshot.update_json(ticker_dict)
+
+    def _get_subscription(self, tickers: Iterable[str]) -> str:
+        args: List[dict] = [{'channel': 'tickers', 'instId': f'{ticker}-{self._quote}'} for ticker in tickers]
+        return json.dumps({'op': 'subscribe', 'args': args})
+
+    def _log_debug(self, message: Any) -> None:
+        # The message (e.g., a whole parsed response) is formatted only if DEBUG records are emitted
+        if self._logger is not None and self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('%s | %s', self.name, message)
+
+    @property
+    def is_live(self, ) -> bool:
+        return self._connected.is_set()
+
+    @property
+    def snapshot(self, ) -> PriceSnapshot:
+        return self._snapshot
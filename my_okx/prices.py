@@ -0,0 +1,106 @@
+from typing import Optional, Dict, List
+from array import array
+
+import math
+import time
+
+
+def _to_float(value) -> float:
+    return float(value) if value not in (None, '') else math.nan
+
+
+class PriceSnapshot:
+    def __init__(self, quote: str = 'USDT'):
+        """
+        Indexed snapshot of spot prices for all tickers quoted in a specific coin.
+        Prices are stored in array-backed columns (last, bid, ask, ts) with a ticker -> row index.
+
+        :param quote: Quote coin of the spot instruments (e.g., USDT).
+        """
+        self.quote = quote
+        self.tickers: List[str] = []
+        self.last = array('d')
+        self.bid = array('d')
+        self.ask = array('d')
+        self.ts = array('d')
+        self._index: Dict[str, int] = {}
+        self.updated = time.monotonic()
+
+    @classmethod
+    def from_json(cls, data: List[dict], quote: str = 'USDT') -> 'PriceSnapshot':
+        """Builds a snapshot from the `data` field of /api/v5/market/tickers (instruments of other quotes are skipped)."""
+        snapshot = cls(quote=quote)
+        for ticker_dict in data:
+            snapshot.update_json(ticker_dict, now=snapshot.updated)
+        return snapshot
+
+    def update_json(self, ticker_dict: dict, now: Optional[float] = None) -> bool:
+        """Updates (or adds) a row from a ticker json of OKX (returns False for instruments of other quotes)."""
+        inst_id = str(ticker_dict['instId'])
+        suffix = f'-{self.quote}'
+        if not inst_id.endswith(suffix):
+            return False
+        self.set(
+            ticker=inst_id[:-len(suffix)],
+            last=_to_float(ticker_dict.get('last')),
+            bid=_to_float(ticker_dict.get('bidPx')),
+            ask=_to_float(ticker_dict.get('askPx')),
+            now=now,
+        )
+        return True
+
+    def set(self, ticker: str, last: float, bid: float, ask: float, now: Optional[float] = None) -> None:
+        """Updates (or adds) the prices of a coin in place."""
+        now = time.monotonic() if (now is None) else now
+        row = self._index.get(ticker)
+        if row is None:
+            self._index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+            self.last.append(last)
+            self.bid.append(bid)
+            self.ask.append(ask)
+            self.ts.append(now)
+        else:
+            self.last[row] = last
+            self.bid[row] = bid
+            self.ask[row] = ask
+            self.ts[row] = now
+        self.updated = now
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        """Gets the price of a coin (the midpoint of the best bid and ask, or the last price if the book side is empty)."""
+        row = self._index.get(ticker)
+        if row is None:
+            return None
+        bid, ask = self.bid[row], self.ask[row]
+        if bid > 0 and ask > 0:
+            return (bid + ask) / 2
+        last = self.last[row]
+        return None if math.isnan(last) else last
+
+    def get_age(self, ticker: str) -> Optional[float]:
+        """Gets the time (in seconds) since the prices of a coin were updated."""
+        row = self._index.get(ticker)
+        return None if row is None else time.monotonic() - self.ts[row]
+
+    def get_last(self, ticker: str) -> Optional[float]:
+        row = self._index.get(ticker)
+        return None if row is None else self.last[row]
+
+    def get_bid(self, ticker: str) -> Optional[float]:
+        row = self._index.get(ticker)
+        return None if row is None else self.bid[row]
+
+    def get_ask(self, ticker: str) -> Optional[float]:
+        row = self._index.get(ticker)
+        return None if row is None else self.ask[row]
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._index
+
+    def __len__(self, ) -> int:
+        return len(self.tickers)
+
+    @property
+    def age(self, ) -> float:
+        return time.monotonic() - self.updated
@@ -0,0 +1,163 @@
+from typing import Optional, Union, Iterable, Dict, List
+from httpx import Client, AsyncClient
+
+import time
+import zlib
+import threading
+import itertools
+
+from .hub import ClientHub
+
+
+class _Proxy:
+    __slots__ = ('proxy', 'latency', 'errors', 'ejected_until', 'in_flight', 'requests', 'failures')
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.latency: Optional[float] = None
+        self.errors = 0
+        self.ejected_until: Optional[float] = None
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+
+
+class ProxyPool:
+    STRATEGY_ROUND_ROBIN = 'round-robin'
+    STRATEGY_LEAST_LATENCY = 'least-latency'
+
+    def __init__(
+            self,
+            proxies: Iterable[str],
+            strategy: str = STRATEGY_ROUND_ROBIN,
+            max_errors: int = 3,
+            max_latency: Optional[float] = None,
+            eject_timeout: float = 30.0,
+            smoothing: float = 0.2,
+            hub: Optional[ClientHub] = None,
+    ):
+        """
+        ProxyPool spreads requests over many egress proxies (every proxy has its own connection pool),
+        so throughput and the OKX IP rate limits scale with the number of proxies.
+        A proxy is ejected for `eject_timeout` seconds after `max_errors` consecutive failures (transport errors and 5xx responses)
+        or while its smoothed latency is above `max_latency`; after that it gets traffic again and is ejected on the next failure.
+        If all proxies are ejected, the one whose ejection ends first is used. One ProxyPool can be shared by many MyOKX instances.
+
+        :param proxies: HTTP/HTTPS proxies (e.g., user12345:abcdef@12.345.67.890:1234).
+        :param strategy: Proxy selection: round-robin or least-latency (the smoothed latency weighted by requests in flight).
+        :param max_errors: Number of consecutive failures that ejects a proxy.
+        :param max_latency: Smoothed latency (in seconds) that ejects a proxy (None disables latency ejection).
+        :param eject_timeout: Time (in seconds) an ejected proxy gets no traffic.
+        :param smoothing: Weight of the last request in the smoothed (exponentially weighted) latency.
+        :param hub: Pool of httpx clients holding the per-proxy sub-pools (defaults to a new ClientHub).
+        """
+        self._proxies: List[_Proxy] = [_Proxy(proxy) for proxy in dict.fromkeys(proxies)]
+        if not self._proxies:
+            raise ValueError('ProxyPool | No proxies!')
+        if strategy not in (self.STRATEGY_ROUND_ROBIN, self.STRATEGY_LEAST_LATENCY):
+            raise ValueError(f'ProxyPool | Unknown strategy: {strategy}!')
+        self._index: Dict[str, _Proxy] = {state.proxy: state for state in self._proxies}
+        self._strategy = strategy
+        self._max_errors = max_errors
+        self._max_latency = max_latency
+        self._eject_timeout = eject_timeout
+        self._smoothing = smoothing
+        self._hub = hub or ClientHub()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def select(self, api_key: Optional[str] = None, proxy: Optional[str] = None) -> str:
+        """
+        Selects a proxy for one request and marks it in flight (every selection must be followed by `record` or `release`).
+        With an api_key the request sticks to the proxy of the key while that proxy is healthy.
+        With a proxy of the pool that proxy is selected even if it is ejected (e.g., to warm up its connections).
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = None
+            if proxy is not None:
+                state = self._index[proxy]
+            elif api_key is not None:
+                state = self._proxies[zlib.crc32(api_key.encode('utf-8')) % len(self._proxies)]
+                if not self._is_available(state, now):
+                    state = None
+            if state is None:
+                available = [state for state in self._proxies if self._is_available(state, now)]
+                if not available:
+                    state = min(self._proxies, key=lambda state: state.ejected_until)
+                elif self._strategy == self.STRATEGY_LEAST_LATENCY:
+                    # Proxies without latency samples are tried first (the least loaded of them)
+                    state = min(available, key=lambda state: (
+                        state.latency is not None, (state.latency or 0.0) * (state.in_flight + 1), state.in_flight,
+                    ))
+                else:
+                    state = available[next(self._counter) % len(available)]
+            state.in_flight += 1
+            state.requests += 1
+            return state.proxy
+
+    def record(self, proxy: str, latency: Optional[float], ok: bool) -> None:
+        """Records the outcome of a request sent through a proxy (latency is None for transport errors)."""
+        state = self._index[proxy]
+        with self._lock:
+            state.in_flight -= 1
+            if latency is not None:
+                state.latency = latency if state.latency is None else state.latency + self._smoothing * (latency - state.latency)
+            if ok:
+                state.errors = 0
+            else:
+                state.errors += 1
+                state.failures += 1
+            now = time.monotonic()
+            too_slow = (self._max_latency is not None) and (state.latency is not None) and (state.latency > self._max_latency)
+            if state.errors >= self._max_errors or too_slow:
+                state.ejected_until = now + self._eject_timeout
+                if too_slow:
+                    # The latency is measured again after the ejection
+                    state.latency = None
+            elif ok and state.ejected_until is not None and state.ejected_until <= now:
+                state.ejected_until = None
+
+    def release(self, proxy: str) -> None:
+        """Releases a selected proxy without recording an outcome (e.g., the request was canceled)."""
+        state = self._index[proxy]
+        with self._lock:
+            state.in_flight -= 1
+
+    def get_client(self, proxy: str, asynchrony: bool = False) -> Union[Client, AsyncClient]:
+        """Gets the client of the proxy connection pool."""
+        return self._hub.get_client(proxy=f'http://{proxy}', asynchrony=asynchrony)
+
+    def get_stats(self, ) -> Dict[str, dict]:
+        """Gets the state of every proxy: smoothed latency, consecutive errors, requests in flight and totals."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                state.proxy: {
+                    'healthy': self._is_available(state, now),
+                    'latency': state.latency,
+                    'errors': state.errors,
+                    'in_flight': state.in_flight,
+                    'requests': state.requests,
+                    'failures': state.failures,
+                }
+                for state in self._proxies
+            }
+
+    def close(self, ) -> None:
+        self._hub.close()
+
+    async def aclose(self, ) -> None:
+        await self._hub.aclose()
+
+    @staticmethod
+    def _is_available(state: _Proxy, now: float) -> bool:
+        return state.ejected_until is None or state.ejected_until <= now
+
+    @property
+    def proxies(self, ) -> List[str]:
+        return [state.proxy for state in self._proxies]
+
+    @property
+    def size(self, ) -> int:
+        return len(self._proxies)
@@ -0,0 +1,205 @@
+from typing import Optional, Dict, List, Tuple, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import time
+import heapq
+import asyncio
+import itertools
+
+
+# Priority of the requests made in the current context (set by RateLimiter.prioritized)
+_priority: ContextVar[Optional[int]] = ContextVar('priority', default=None)
+
+
+class TokenBucket:
+    def __init__(self, rate: int, period: float):
+        """
+        Async token bucket with a priority queue of waiters (lower priority value is served first).
+
+        :param rate: Number of requests allowed per period (also the burst capacity).
+        :param period: Period length (in seconds).
+        """
+        self.rate = rate
+        self.period = period
+        self._capacity = float(rate)
+        self._tokens = float(rate)
+        self._refill_rate = rate / period
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+
+    async def acquire(self, priority: int = 1) -> None:
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        await future
+
+    async def _drain(self, ) -> None:
+        while self._waiters:
+            self._refill()
+            if self._tokens >= 1:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    self._tokens -= 1
+                    future.set_result(None)
+            else:
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+
+    def _refill(self, ) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._refill_rate)
+        self._updated = now
+
+    @property
+    def depth(self, ) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @property
+    def tokens(self, ) -> float:
+        self._refill()
+        return self._tokens
+
+
+class RateLimiter:
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+
+    SCOPE_IP = 'ip'
+    SCOPE_KEY = 'key'
+
+    # Endpoint name of the shared stage buckets (in queue_depth and get_stats)
+    SHARED = '*'
+
+    # Endpoint: (requests, period in seconds, scope)
+    limits = {
+        '/api/v5/public/price-limit': (20, 2.0, SCOPE_IP),
+        '/api/v5/public/time': (10, 2.0, SCOPE_IP),
+        '/api/v5/market/tickers': (20, 2.0, SCOPE_IP),
+        '/api/v5/asset/balances': (6, 1.0, SCOPE_KEY),
+        '/api/v5/asset/currencies': (6, 1.0, SCOPE_KEY),
+        '/api/v5/asset/withdrawal': (6, 1.0, SCOPE_KEY),
+        '/api/v5/asset/withdrawal-history': (6, 1.0, SCOPE_KEY),
+        '/api/v5/asset/deposit-history': (6, 1.0, SCOPE_KEY),
+        '/api/v5/asset/transfer': (2, 1.0, SCOPE_KEY),
+        '/api/v5/asset/bills': (6, 1.0, SCOPE_KEY),
+        '/api/v5/asset/subaccount/balances': (6, 2.0, SCOPE_KEY),
+        '/api/v5/asset/subaccount/bills': (6, 1.0, SCOPE_KEY),
+        '/api/v5/users/subaccount/list': (2, 2.0, SCOPE_KEY),
+    }
+
+    priorities = {
+        '/api/v5/asset/withdrawal': PRIORITY_HIGH,
+        '/api/v5/asset/transfer': PRIORITY_HIGH,
+        '/api/v5/asset/balances': PRIORITY_LOW,
+        '/api/v5/asset/subaccount/balances': PRIORITY_LOW,
+    }
+
+    def __init__(
+            self,
+            limits: Optional[Dict[str, Tuple[int, float, str]]] = None,
+            priorities: Optional[Dict[str, int]] = None,
+            safety_factor: float = 1.0,
+            shared_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+    ):
+        """
+        RateLimiter schedules requests under the OKX per-endpoint rate limits.
+        Every endpoint has its own token buckets: one per API key (User ID rules) or one per egress IP (IP rules).
+        Share one RateLimiter between all MyOKX instances working through the same IPs to respect IP limits.
+
+        Priorities only order the requests waiting in the same bucket: they never preempt a request that already has a token,
+        and a request is always limited by its own endpoint limit. Since OKX limits are per endpoint, requests to different
+        endpoints (e.g., withdrawals and balances) compete only in the optional shared stage (`shared_limits`): one more bucket
+        per API key or per IP taken by every limited endpoint of that scope after its own bucket.
+        The priority of a request is the `priority` argument, else the one set by `prioritized` (MyOKX.prioritized),
+        else the endpoint priority.
+
+        :param limits: Overrides of endpoint limits in the form {endpoint: (requests, period, scope)}.
+        :param priorities: Overrides of endpoint priorities (lower value is served first).
+        :param safety_factor: Share of the official limit to use (e.g., 0.9 keeps a 10% headroom).
+        :param shared_limits: Budgets shared by all endpoints of a scope in the form {scope: (requests, period)}
+        (e.g., {RateLimiter.SCOPE_KEY: (10, 1.0)} lets withdrawals overtake balance requests of the same API key).
+        """
+        self.limits = {**self.limits, **(limits or {})}
+        self.priorities = {**self.priorities, **(priorities or {})}
+        self.shared_limits = dict(shared_limits or {})
+        self._safety_factor = safety_factor
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    async def acquire(
+            self,
+            endpoint: str,
+            api_key: str,
+            ip: Optional[str] = None,
+            priority: Optional[int] = None,
+    ) -> None:
+        """Waits until a request to the endpoint is allowed (returns immediately for endpoints without limits)."""
+        bucket = self._get_bucket(endpoint=endpoint, api_key=api_key, ip=ip)
+        if bucket is not None:
+            if priority is None:
+                priority = _priority.get()
+            if priority is None:
+                priority = self.priorities.get(endpoint, self.PRIORITY_NORMAL)
+            await bucket.acquire(priority=priority)
+            shared_bucket = self._get_shared_bucket(endpoint=endpoint, api_key=api_key, ip=ip)
+            if shared_bucket is not None:
+                await shared_bucket.acquire(priority=priority)
+
+    @staticmethod
+    @contextmanager
+    def prioritized(priority: int) -> Iterator[None]:
+        """
+        Sets the priority of all requests made in the block (including tasks created in it), e.g.:
+        `with RateLimiter.prioritized(RateLimiter.PRIORITY_HIGH): await my_okx.FUNDING_get_balance()`.
+        """
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def queue_depth(self, endpoint: Optional[str] = None) -> int:
+        """Gets the number of requests waiting for a token (for a specific endpoint or in total)."""
+        return sum(
+            bucket.depth for (bucket_endpoint, _), bucket in self._buckets.items()
+            if (endpoint is None) or (bucket_endpoint == endpoint)
+        )
+
+    def get_stats(self, ) -> Dict[str, Dict[str, float]]:
+        """Gets the queue depth and available tokens of every bucket (keyed by `endpoint|scope_id`)."""
+        return {
+            f'{endpoint}|{scope_id}': {'depth': bucket.depth, 'tokens': bucket.tokens}
+            for (endpoint, scope_id), bucket in self._buckets.items()
+        }
+
+    def _get_bucket(self, endpoint: str, api_key: str, ip: Optional[str]) -> Optional[TokenBucket]:
+        limit = self.limits.get(endpoint)
+        if limit is None:
+            return None
+        rate, period, scope = limit
+        return self._get_or_create(key=(endpoint, self._get_scope_id(scope, api_key, ip)), rate=rate, period=period)
+
+    def _get_shared_bucket(self, endpoint: str, api_key: str, ip: Optional[str]) -> Optional[TokenBucket]:
+        scope = self.limits[endpoint][2]
+        limit = self.shared_limits.get(scope)
+        if limit is None:
+            return None
+        rate, period = limit
+        return self._get_or_create(key=(self.SHARED, self._get_scope_id(scope, api_key, ip)), rate=rate, period=period)
+
+    def _get_or_create(self, key: Tuple[str, str], rate: int, period: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate=max(1, int(rate * self._safety_factor)), period=period)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _get_scope_id(self, scope: str, api_key: str, ip: Optional[str]) -> str:
+        return f'ip:{ip or "direct"}' if scope == self.SCOPE_IP else f'key:{api_key}'
@@ -0,0 +1,136 @@
+from typing import Optional, Iterable, Dict, Any
+
+import time
+import random
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class RetryPolicy:
+    # HTTP statuses and OKX codes of transient errors (rate limits, system busy, service unavailable)
+    retry_statuses = {429, 500, 502, 503, 504}
+    retry_codes = {'50001', '50004', '50011', '50013', '50026', '50061'}
+
+    def __init__(
+            self,
+            retries: int = 3,
+            base_delay: float = 0.1,
+            max_delay: float = 5.0,
+            retry_statuses: Optional[Iterable[int]] = None,
+            retry_codes: Optional[Iterable[str]] = None,
+    ):
+        """
+        RetryPolicy retries idempotent (GET) requests on transient errors with jittered exponential backoff
+        ("full jitter": a random delay up to base_delay * 2^attempt), so retries of many clients do not stampede together.
+        Non-idempotent requests (POST: withdrawals, transfers) are never retried.
+
+        :param retries: Maximum number of retries.
+        :param base_delay: Backoff delay (in seconds) of the first retry.
+        :param max_delay: Maximum backoff delay (in seconds).
+        :param retry_statuses: HTTP statuses to retry.
+        :param retry_codes: OKX error codes to retry.
+        """
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses) if retry_statuses is not None else self.retry_statuses
+        self.retry_codes = set(retry_codes) if retry_codes is not None else self.retry_codes
+
+    def is_transient(self, status_code: int, json: Any) -> bool:
+        if status_code in self.retry_statuses:
+            return True
+        return isinstance(json, dict) and str(json.get('code')) in self.retry_codes
+
+    def get_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class HedgePolicy:
+    endpoints = {
+        '/api/v5/public/price-limit',
+        '/api/v5/market/tickers',
+        '/api/v5/asset/balances',
+        '/api/v5/asset/currencies',
+        '/api/v5/asset/subaccount/balances',
+        '/api/v5/asset/withdrawal-history',
+    }
+
+    def __init__(self, delay: float = 0.5, endpoints: Optional[Iterable[str]] = None):
+        """
+        HedgePolicy sends a duplicate of an idempotent GET request if the first one is not answered within `delay` seconds
+        and uses whichever response arrives first (cuts the tail latency at the cost of extra requests).
+
+        :param delay: Time (in seconds) to wait before sending the hedged request (e.g., the p95 latency).
+        :param endpoints: Endpoints to hedge (GET requests only).
+        """
+        self.delay = delay
+        self.endpoints = set(endpoints) if endpoints is not None else self.endpoints
+
+
+class _Circuit:
+    __slots__ = ('failures', 'opened_at', 'probing')
+
+    def __init__(self, ):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        CircuitBreaker fails requests to an endpoint fast after `failure_threshold` consecutive transient failures.
+        After `reset_timeout` seconds one probe request is let through: a success closes the circuit, a failure opens it again.
+        One CircuitBreaker can be shared by many MyOKX instances.
+
+        :param failure_threshold: Number of consecutive failures that opens the circuit of an endpoint.
+        :param reset_timeout: Time (in seconds) the circuit stays open before a probe request.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def allow(self, endpoint: str) -> bool:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None or circuit.opened_at is None:
+            return True
+        if circuit.probing or time.monotonic() - circuit.opened_at < self.reset_timeout:
+            return False
+        circuit.probing = True
+        return True
+
+    def record_success(self, endpoint: str) -> None:
+        circuit = self._circuits.get(endpoint)
+        if circuit is not None:
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.probing = False
+
+    def record_failure(self, endpoint: str) -> None:
+        circuit = self._circuits.setdefault(endpoint, _Circuit())
+        circuit.failures += 1
+        if circuit.probing or circuit.failures >= self.failure_threshold:
+            circuit.opened_at = time.monotonic()
+        circuit.probing = False
+
+    def release(self, endpoint: str) -> None:
+        """Releases the half-open probe of an endpoint without an outcome (the next request becomes the probe)."""
+        circuit = self._circuits.get(endpoint)
+        if circuit is not None:
+            circuit.probing = False
+
+    def is_probing(self, endpoint: str) -> bool:
+        """Checks whether a half-open probe of an endpoint is in flight (right after `allow`: whether it granted the probe)."""
+        circuit = self._circuits.get(endpoint)
+        return circuit is not None and circuit.probing
+
+    def get_state(self, endpoint: str) -> str:
+        """Gets the state of the endpoint circuit: closed, open or half-open."""
+        circuit = self._circuits.get(endpoint)
+        if circuit is None or circuit.opened_at is None:
+            return 'closed'
+        if circuit.probing or time.monotonic() - circuit.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
@@ -0,0 +1,185 @@
+from typing import Optional, Union, Callable, Awaitable, Iterable, Dict, List, Tuple, Any, AsyncIterator
+
+import zlib
+import queue
+import pickle
+import asyncio
+import multiprocessing
+
+from .myokx import MyOKX
+from .hub import ClientHub
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+
+
+class ShardedRunner:
+    def __init__(
+            self,
+            accounts: Iterable[dict],
+            job: Callable[[MyOKX, dict], Awaitable[Tuple[int, Any]]],
+            processes: Optional[int] = None,
+            concurrency: int = 10,
+            client_kwargs: Optional[dict] = None,
+            setup: Optional[Callable[[], dict]] = None,
+            metrics_interval: Optional[float] = None,
+    ):
+        """
+        ShardedRunner spreads API keys over a pool of worker processes (every key always lands in the same shard),
+        so signing and json decoding of thousands of accounts scale across CPU cores. Every worker has its own event loop,
+        ClientHub, RateLimiter and Metrics and runs `job(my_okx, account)` for the accounts of its shard with `concurrency` workers.
+        Results are streamed back as soon as every job is done (`async for account_id, status, result in runner`),
+        where `status` is 0 or -1 like for MyOKX methods, and `account_id` is the `name` of the account (its api_key by default).
+
+        Workers are spawned (not forked), so `job` and `setup` must be module-level functions, and accounts, `client_kwargs`
+        and results must be picklable. IP rate limits are not shared between workers: give every shard its own proxies if needed.
+
+        :param accounts: Accounts as dicts with api_key, secret_key, passphrase and (optionally) proxy and name.
+        :param job: Module-level async function called with (my_okx, account) and returning (status, result).
+        :param processes: Number of worker processes (defaults to the number of CPU cores).
+        :param concurrency: Number of concurrent jobs per worker.
+        :param client_kwargs: Picklable keyword arguments of MyOKX (e.g., models, retry_policy).
+        :param setup: Module-level function called once in every worker and returning more keyword arguments of MyOKX
+        (for objects that cannot be pickled, e.g., a ClientHub with a custom transport or a ProxyPool).
+        :param metrics_interval: Interval (in seconds) of streaming metrics snapshots of the workers (None means only the final ones).
+        """
+        self._accounts = list(accounts)
+        self._job = job
+        self._processes = processes or multiprocessing.cpu_count()
+        self._concurrency = concurrency
+        self._client_kwargs = client_kwargs or {}
+        self._setup = setup
+        self._metrics_interval = metrics_interval
+        self.metrics: Dict[int, dict] = {}
+
+    def get_shards(self, ) -> List[List[dict]]:
+        """Splits the accounts into shards by their api_key (stable between runs)."""
+        shards: List[List[dict]] = [[] for _ in range(self._processes)]
+        for account in self._accounts:
+            shards[zlib.crc32(account['api_key'].encode('utf-8')) % self._processes].append(account)
+        return shards
+
+    async def __aiter__(self, ) -> AsyncIterator[Tuple[str, int, Union[Any, Exception]]]:
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        workers: Dict[int, multiprocessing.Process] = {}
+        pending: Dict[int, set] = {}
+        for shard, accounts in enumerate(self.get_shards()):
+            if not accounts:
+                continue
+            pending[shard] = {self._get_account_id(account) for account in accounts}
+            workers[shard] = context.Process(
+                target=_run_shard,
+                args=(shard, accounts, self._job, self._concurrency, self._client_kwargs, self._setup, self._metrics_interval, results),
+                daemon=True,
+            )
+            workers[shard].start()
+
+        loop = asyncio.get_running_loop()
+        running = set(workers)
+        try:
+            while running:
+                try:
+                    message = await loop.run_in_executor(None, results.get, True, 0.5)
+                except queue.Empty:
+                    for shard in list(running):
+                        if not workers[shard].is_alive():
+                            # The worker died before finishing: its unfinished accounts are failed
+                            running.discard(shard)
+                            for account_id in pending[shard]:
+                                yield account_id, -1, Exception(f'ShardedRunner | Worker {shard} exited with code {workers[shard].exitcode}!')
+                            pending[shard].clear()
+                    continue
+                kind, shard, payload = message
+                if kind == 'result':
+                    account_id, status, result = pickle.loads(payload)
+                    pending[shard].discard(account_id)
+                    yield account_id, status, result
+                elif kind == 'metrics':
+                    self.metrics[shard] = payload
+                elif kind == 'done':
+                    running.discard(shard)
+        finally:
+            for worker in workers.values():
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            results.close()
+
+    def get_requests(self, ) -> int:
+        """Gets the total number of requests made by all workers (from the last metrics snapshots)."""
+        return sum(
+            series['requests']
+            for snapshot in self.metrics.values() for endpoint in snapshot.values() for series in endpoint.values()
+        )
+
+    @staticmethod
+    def _get_account_id(account: dict) -> str:
+        return account.get('name') or account['api_key']
+
+
+def _run_shard(
+        shard: int,
+        accounts: List[dict],
+        job: Callable,
+        concurrency: int,
+        client_kwargs: dict,
+        setup: Optional[Callable[[], dict]],
+        metrics_interval: Optional[float],
+        results: multiprocessing.Queue,
+) -> None:
+    asyncio.run(_run_shard_async(shard, accounts, job, concurrency, client_kwargs, setup, metrics_interval, results))
+
+
+async def _run_shard_async(
+        shard: int,
+        accounts: List[dict],
+        job: Callable,
+        concurrency: int,
+        client_kwargs: dict,
+        setup: Optional[Callable[[], dict]],
+        metrics_interval: Optional[float],
+        results: multiprocessing.Queue,
+) -> None:
+    kwargs = {'hub': ClientHub(), 'rate_limiter': RateLimiter(), 'metrics': Metrics(), **client_kwargs}
+    if setup is not None:
+        kwargs.update(setup())
+    metrics: Optional[Metrics] = kwargs['metrics']
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(account: dict) -> None:
+        account_id = ShardedRunner._get_account_id(account)
+        async with semaphore:
+            try:
+                my_okx = MyOKX(
+                    api_key=account['api_key'],
+                    secret_key=account['secret_key'],
+                    passphrase=account['passphrase'],
+                    proxy=account.get('proxy'),
+                    asynchrony=True,
+                    **kwargs,
+                )
+                status, result = await job(my_okx, account)
+            except Exception as e:
+                status, result = -1, Exception(f'ShardedRunner | {e}')
+        try:
+            payload = pickle.dumps((account_id, status, result))
+        except Exception as e:
+            payload = pickle.dumps((account_id, -1, Exception(f'ShardedRunner | Unpicklable result: {e}')))
+        results.put(('result', shard, payload))
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(metrics_interval)
+            results.put(('metrics', shard, metrics.snapshot()))
+
+    reporter = asyncio.create_task(report()) if (metrics is not None and metrics_interval) else None
+    try:
+        await asyncio.gather(*(run(account) for account in accounts))
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        if kwargs['hub'] is not None:
+            await kwargs['hub'].aclose()
+        if metrics is not None:
+            results.put(('metrics', shard, metrics.snapshot()))
+        results.put(('done', shard, None))
@@ -0,0 +1,134 @@
+from typing import Optional, Tuple, Any
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import sqlite3
+import threading
+
+
+class MetadataStore:
+    def __init__(
+            self,
+            path: str,
+            ttl: float = 300.0,
+            max_stale: float = 3600.0,
+            lease_timeout: float = 30.0,
+            poll_interval: float = 0.1,
+    ):
+        """
+        MetadataStore is a persistent SQLite cache of rarely changing metadata (currency chains, subaccount lists)
+        shared by all processes of a host. MyOKX instances warm up from it on the first lookup instead of requesting OKX.
+
+        Every entry has an ETag (a hash of its content) and the time of its last refresh. Fresh entries (younger than `ttl`)
+        are served as is, stale ones (younger than `max_stale`) are served while one background task refreshes them.
+        Refreshes are coordinated with leases: only the process holding the lease of an entry requests OKX,
+        while other processes wait for its result (no thundering herd after a deploy).
+        `ttl` applies to every entry, including the chains metadata (it replaces `chains_info_ttl` of MyOKX).
+        The methods are blocking: MyOKX calls them in a thread pool.
+
+        :param path: Path of the SQLite database file.
+        :param ttl: Time (in seconds) an entry is fresh.
+        :param max_stale: Maximum age (in seconds) of a stale entry that can still be served.
+        :param lease_timeout: Time (in seconds) a refresh lease is held at most (the lease of a crashed process expires).
+        :param poll_interval: Interval (in seconds) of checking the store while another process refreshes an entry.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Gets an entry as (value, age in seconds) or None."""
+        with self._lock:
+            row = self._get_connection().execute('SELECT value, updated FROM entries WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), max(0.0, time.time() - row[1])
+
+    def get_meta(self, key: str) -> Optional[Tuple[str, float]]:
+        """Gets the (etag, age in seconds) of an entry without reading its value (a cheap check of whether it changed)."""
+        with self._lock:
+            row = self._get_connection().execute('SELECT etag, updated FROM entries WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        return row[0], max(0.0, time.time() - row[1])
+
+    def get_etag(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._get_connection().execute('SELECT etag FROM entries WHERE key = ?', (key, )).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: Any) -> bool:
+        """Stores an entry and returns whether its content changed (an unchanged entry only gets a new refresh time)."""
+        data = json.dumps(value, separators=(',', ':'), sort_keys=True)
+        etag = hashlib.sha1(data.encode('utf-8')).hexdigest()
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                row = connection.execute('SELECT etag FROM entries WHERE key = ?', (key, )).fetchone()
+                if row is not None and row[0] == etag:
+                    connection.execute('UPDATE entries SET updated = ? WHERE key = ?', (time.time(), key))
+                    return False
+                connection.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, etag, updated) VALUES (?, ?, ?, ?)',
+                    (key, data, etag, time.time()),
+                )
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute('DELETE FROM entries WHERE key = ?', (key, ))
+
+    def acquire_lease(self, key: str) -> Optional[str]:
+        """Acquires the refresh lease of an entry and returns its token (None if another process holds it)."""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute('BEGIN IMMEDIATE')
+                row = connection.execute('SELECT expires FROM leases WHERE key = ?', (key, )).fetchone()
+                if row is not None and row[0] > now:
+                    return None
+                connection.execute(
+                    'INSERT OR REPLACE INTO leases (key, token, expires) VALUES (?, ?, ?)',
+                    (key, token, now + self.lease_timeout),
+                )
+        return token
+
+    def release_lease(self, key: str, token: str) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute('DELETE FROM leases WHERE key = ? AND token = ?', (key, token))
+
+    def close(self, ) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @staticmethod
+    def get_account_key(name: str, api_key: str) -> str:
+        """Gets the key of a per-account entry (the API key itself is never stored)."""
+        return f'{name}:{hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]}'
+
+    def _get_connection(self, ) -> sqlite3.Connection:
+        # A connection must not be shared with forked processes
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.lease_timeout, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, etag TEXT, updated REAL)')
+            connection.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, token TEXT, expires REAL)')
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
@@ -0,0 +1,123 @@
+from typing import Optional, Union, Iterable, Dict, List, Tuple, AsyncIterator
+
+import asyncio
+
+from .myokx import MyOKX
+
+
+class SweepResult:
+    __slots__ = ('subaccount_name', 'balances', 'transfers')
+
+    def __init__(self, subaccount_name: str, balances: Dict[str, float], transfers: Dict[str, Tuple[int, Union[str, Exception]]]):
+        """
+        Result of sweeping one subaccount.
+
+        :param subaccount_name: Name of the subaccount.
+        :param balances: Balances ({ticker: amount}) of the fetched field (available balances by default).
+        :param transfers: Transfers to the main account ({ticker: (status, transfer_id or Exception)}).
+        """
+        self.subaccount_name = subaccount_name
+        self.balances = balances
+        self.transfers = transfers
+
+    def __repr__(self, ) -> str:
+        return f'SweepResult(subaccount_name={self.subaccount_name!r}, balances={self.balances}, transfers={self.transfers})'
+
+
+class SubaccountSweeper:
+    def __init__(
+            self,
+            my_okx: MyOKX,
+            tickers: Optional[List[str]] = None,
+            subaccounts: Optional[Iterable[str]] = None,
+            concurrency: int = 10,
+            transfer_threshold: Optional[Union[float, Dict[str, float]]] = None,
+            field: str = 'availBal',
+    ):
+        """
+        SubaccountSweeper fetches the balances of all subaccounts with a bounded pool of concurrent workers
+        and (optionally) transfers every balance above a threshold to the main account.
+        Results are streamed as soon as every subaccount is done (`async for status, result in sweeper`),
+        where `status` is 0 (`result` is a SweepResult) or -1 (`result` is an Exception).
+
+        :param my_okx: MyOKX instance of the main account used for requests.
+        :param tickers: Coins to fetch (None means all non-zero coins).
+        :param subaccounts: Names of the subaccounts to sweep (None means all subaccounts of the main account).
+        :param concurrency: Number of concurrent workers.
+        :param transfer_threshold: Transfers balances above the threshold to the main account
+        (one threshold for all coins or {ticker: threshold}; None disables transfers).
+        :param field: OKX balance field fetched: availBal (available) or bal (total, including frozen; transfers need availBal).
+        """
+        if transfer_threshold is not None and field != 'availBal':
+            raise ValueError('SubaccountSweeper | Only available balances (availBal) can be transferred!')
+        self._my_okx = my_okx
+        self._tickers = tickers
+        self._subaccounts = subaccounts
+        self._concurrency = concurrency
+        self._transfer_threshold = transfer_threshold
+        self._field = field
+
+    async def __aiter__(self, ) -> AsyncIterator[Tuple[int, Union[SweepResult, Exception]]]:
+        if self._subaccounts is None:
+            status, result = await self._my_okx.SUBACCOUNT_get_subaccounts()
+            if status != 0:
+                yield -1, Exception(f'SubaccountSweeper | {result}')
+                return
+            subaccounts = result
+        else:
+            subaccounts = self._subaccounts
+
+        names: asyncio.Queue = asyncio.Queue(maxsize=self._concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> None:
+            for subaccount_name in subaccounts:
+                await names.put(subaccount_name)
+            for _ in range(self._concurrency):
+                await names.put(None)
+
+        async def work() -> None:
+            while True:
+                subaccount_name = await names.get()
+                if subaccount_name is None:
+                    break
+                await results.put(await self.sweep(subaccount_name))
+            await results.put(None)
+
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(self._concurrency)]
+        try:
+            finished = 0
+            while finished < self._concurrency:
+                item = await results.get()
+                if item is None:
+                    finished += 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def sweep(self, subaccount_name: str) -> Tuple[int, Union[SweepResult, Exception]]:
+        """Fetches the balances of one subaccount and transfers those above the threshold."""
+        status, result = await self._my_okx.SUBACCOUNT_get_balances(
+            subaccount_name=subaccount_name, tickers=self._tickers, field=self._field,
+        )
+        if status != 0:
+            return -1, Exception(f'SubaccountSweeper | {subaccount_name} | {result}')
+        balances = result
+        transfers = {}
+        if self._transfer_threshold is not None:
+            for ticker, amount in balances.items():
+                threshold = self._get_threshold(ticker)
+                if threshold is not None and amount > threshold:
+                    transfers[ticker] = await self._my_okx.SUBACCOUNT_transfer_to_main(
+                        subaccount_name=subaccount_name,
+                        ticker=ticker,
+                        amount=amount,
+                    )
+        return 0, SweepResult(subaccount_name=subaccount_name, balances=balances, transfers=transfers)
+
+    def _get_threshold(self, ticker: str) -> Optional[float]:
+        if isinstance(self._transfer_threshold, dict):
+            return self._transfer_threshold.get(ticker)
+        return self._transfer_threshold
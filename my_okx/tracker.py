@@ -0,0 +1,194 @@
+from typing import Optional, Union, Callable, Dict, List, Tuple, AsyncIterator
+
+import time
+import asyncio
+import inspect
+
+from .myokx import MyOKX
+from .models import Withdrawal
+
+
+class _TrackedWithdrawal:
+    __slots__ = ('withdrawal_id', 'state', 'interval', 'next_check', 'misses')
+
+    def __init__(self, withdrawal_id: str, interval: float):
+        self.withdrawal_id = withdrawal_id
+        self.state: Optional[str] = None
+        self.interval = interval
+        self.next_check = time.monotonic()
+        self.misses = 0
+
+
+class WithdrawalTracker:
+    success_states = {'2'}
+    failure_states = {'-3', '-2', '-1'}
+
+    # State: multiplier of the base poll interval (1: broadcasting, 0/7/10: waiting, others: manual review and holds)
+    state_factors = {
+        '1': 1.0,
+        '0': 2.0,
+        '7': 2.0,
+        '10': 2.0,
+    }
+    default_state_factor = 4.0
+
+    def __init__(
+            self,
+            my_okx: MyOKX,
+            poll_interval: float = 5.0,
+            max_poll_interval: float = 120.0,
+            backoff: float = 1.5,
+            max_pages: int = 5,
+            concurrency: int = 10,
+            on_complete: Optional[Callable] = None,
+            on_fail: Optional[Callable] = None,
+    ):
+        """
+        WithdrawalTracker resolves the states of many withdrawals with a few paginated withdrawal-history requests per poll cycle
+        (instead of one request per withdrawal_id). Every withdrawal is polled with its own adaptive interval:
+        it depends on the last state and grows while the state does not change.
+
+        Results are delivered with callbacks and/or by iterating over the tracker (`async for withdrawal_id, status, result in tracker`),
+        where `status` is 0 (the withdrawal is completed, `result` contains its json) or -1 (the withdrawal is canceled or failed).
+
+        :param my_okx: MyOKX instance used for requests.
+        :param poll_interval: Base poll interval (in seconds).
+        :param max_poll_interval: Maximum poll interval (in seconds).
+        :param backoff: Interval multiplier applied while the state of a withdrawal does not change.
+        :param max_pages: Maximum number of history pages (100 withdrawals each) requested per poll cycle.
+        :param concurrency: Maximum number of concurrent requests for withdrawals missing from the fetched pages.
+        :param on_complete: Callback (sync or async) called with (withdrawal_id, json or Withdrawal) when a withdrawal is completed.
+        :param on_fail: Callback (sync or async) called with (withdrawal_id, json or Withdrawal) when a withdrawal is canceled or failed.
+        """
+        self._my_okx = my_okx
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._backoff = backoff
+        self._max_pages = max_pages
+        self._concurrency = concurrency
+        self._on_complete = on_complete
+        self._on_fail = on_fail
+        self._pending: Dict[str, _TrackedWithdrawal] = {}
+        self._results: asyncio.Queue = asyncio.Queue()
+        self._streaming = False
+        self.requests = 0
+
+    def add(self, withdrawal_id: str) -> None:
+        """Registers a withdrawal_id to track (the withdrawal_id is returned after posting the withdrawal on the chain)."""
+        withdrawal_id = str(withdrawal_id)
+        if withdrawal_id not in self._pending:
+            self._pending[withdrawal_id] = _TrackedWithdrawal(withdrawal_id=withdrawal_id, interval=self._poll_interval)
+
+    def remove(self, withdrawal_id: str) -> None:
+        self._pending.pop(str(withdrawal_id), None)
+
+    async def poll(self, ) -> List[Tuple[str, int, Union[dict, Exception]]]:
+        """Makes one poll cycle for the withdrawals that are due and returns the finished ones."""
+        now = time.monotonic()
+        due = {wd_id: tracked for wd_id, tracked in self._pending.items() if tracked.next_check <= now}
+        finished = []
+        if not due:
+            return finished
+        found = await self._fetch(set(due))
+        missing = []
+        for wd_id, tracked in due.items():
+            if wd_id not in found:
+                tracked.misses += 1
+                if tracked.misses >= 2:
+                    missing.append(wd_id)
+        if missing:
+            # Withdrawals older than the fetched pages are checked one by one
+            found.update(await self._fetch_one_by_one(missing))
+        for wd_id, tracked in due.items():
+            data = found.get(wd_id)
+            if data is None:
+                self._reschedule(tracked, state=tracked.state)
+                continue
+            tracked.misses = 0
+            state = data.state if isinstance(data, Withdrawal) else str(data['state'])
+            if state in self.success_states:
+                finished.append((wd_id, 0, data))
+                await self._finish(wd_id, 0, data, data=data)
+            elif state in self.failure_states:
+                error = Exception(f'WithdrawalTracker | Withdrawal canceled! (state: {state})')
+                finished.append((wd_id, -1, error))
+                await self._finish(wd_id, -1, error, data=data)
+            else:
+                self._reschedule(tracked, state=state)
+        return finished
+
+    async def run(self, ) -> None:
+        """Polls until all registered withdrawals are finished."""
+        while self._pending:
+            await self.poll()
+            if self._pending:
+                next_check = min(tracked.next_check for tracked in self._pending.values())
+                await asyncio.sleep(max(0.0, next_check - time.monotonic()))
+
+    async def __aiter__(self, ) -> AsyncIterator[Tuple[str, int, Union[dict, Exception]]]:
+        self._streaming = True
+        runner = asyncio.create_task(self.run())
+        try:
+            while not (runner.done() and self._results.empty()):
+                getter = asyncio.ensure_future(self._results.get())
+                await asyncio.wait({getter, runner}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            runner.result()
+        finally:
+            self._streaming = False
+            runner.cancel()
+
+    async def _fetch(self, withdrawal_ids: set) -> Dict[str, dict]:
+        found = {}
+        after = None
+        for _ in range(self._max_pages):
+            self.requests += 1
+            status, result = await self._my_okx.FUNDING_get_withdrawals(after=after, limit=100)
+            if status != 0:
+                break
+            for data in result:
+                wd_id = data.wd_id if isinstance(data, Withdrawal) else str(data['wdId'])
+                if wd_id in withdrawal_ids:
+                    found[wd_id] = data
+            if len(found) == len(withdrawal_ids) or len(result) < 100:
+                break
+            after = result[-1].ts if isinstance(result[-1], Withdrawal) else result[-1]['ts']
+        return found
+
+    async def _fetch_one_by_one(self, withdrawal_ids: List[str]) -> Dict[str, dict]:
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def fetch(withdrawal_id: str) -> Tuple[str, Optional[dict]]:
+            async with semaphore:
+                self.requests += 1
+                status, result = await self._my_okx.FUNDING_get_withdrawal(withdrawal_id=withdrawal_id)
+            return withdrawal_id, (result if status == 0 else None)
+
+        results = await asyncio.gather(*(fetch(wd_id) for wd_id in withdrawal_ids))
+        return {wd_id: data for wd_id, data in results if data is not None}
+
+    def _reschedule(self, tracked: _TrackedWithdrawal, state: Optional[str]) -> None:
+        if state is not None and state != tracked.state:
+            tracked.interval = self._poll_interval * self.state_factors.get(state, self.default_state_factor)
+        else:
+            tracked.interval = tracked.interval * self._backoff
+        tracked.interval = min(tracked.interval, self._max_poll_interval)
+        tracked.state = state
+        tracked.next_check = time.monotonic() + tracked.interval
+
+    async def _finish(self, withdrawal_id: str, status: int, result: Union[dict, Exception], data: dict) -> None:
+        self._pending.pop(withdrawal_id, None)
+        callback = self._on_complete if status == 0 else self._on_fail
+        if callback is not None:
+            outcome = callback(withdrawal_id, data)
+            if inspect.isawaitable(outcome):
+                await outcome
+        if self._streaming:
+            await self._results.put((withdrawal_id, status, result))
+
+    @property
+    def pending(self, ) -> int:
+        return len(self._pending)
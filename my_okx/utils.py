@@ -1,7 +1,25 @@
-async def afh(func, asynchrony, *args, **kwargs):
-    """Async Function Handler"""
+from typing import Optional, Any, Callable, Union
+from concurrent.futures import Executor
+
+import json
+import asyncio
+import functools
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+async def afh(func, asynchrony, *args, executor: Optional[Executor] = None, **kwargs):
+    """Async Function Handler (synchronous functions run in a thread pool, so they never block the event loop)"""
     if asynchrony:
         result = await func(*args, **kwargs)
     else:
-        result = func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
     return result
+
+
+# JSON decoder of response bodies (orjson if installed, otherwise the standard library)
+json_loads: Callable[[Union[bytes, str]], Any] = orjson.loads if (orjson is not None) else json.loads
@@ -0,0 +1,216 @@
+from typing import Optional, Iterable, Dict, List, Tuple, Union
+from array import array
+
+from .myokx import MyOKX
+from .models import Balances
+from .prices import PriceSnapshot
+from .sweep import SubaccountSweeper
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Subaccount names are alphanumeric, so the key of the main account cannot collide with them
+MAIN_ACCOUNT = '<main>'
+
+
+class Valuation:
+    __slots__ = ('accounts', 'coins', 'account_ids', 'coin_ids', 'amounts', 'prices', 'values', 'missing', 'errors')
+
+    def __init__(
+            self,
+            accounts: List[str],
+            coins: List[str],
+            account_ids: 'np.ndarray',
+            coin_ids: 'np.ndarray',
+            amounts: 'np.ndarray',
+            prices: 'np.ndarray',
+            errors: Optional[List[Exception]] = None,
+    ):
+        """
+        USD valuation of (account, coin) rows held in NumPy columns.
+        Coins without a price are valued at 0 and listed in `missing`.
+
+        :param accounts: Account names (indexed by `account_ids`).
+        :param coins: Coin tickers (indexed by `coin_ids` and `prices`).
+        :param account_ids: Account index of every row.
+        :param coin_ids: Coin index of every row.
+        :param amounts: Amount of every row.
+        :param prices: USD price of every coin (NaN if unknown).
+        :param errors: Errors of the accounts whose balances could not be fetched.
+        """
+        self.accounts = accounts
+        self.coins = coins
+        self.account_ids = account_ids
+        self.coin_ids = coin_ids
+        self.amounts = amounts
+        self.prices = prices
+        row_prices = prices[coin_ids]
+        self.values = np.where(np.isnan(row_prices), 0.0, amounts * row_prices)
+        self.missing = [coins[i] for i in np.flatnonzero(np.isnan(prices))]
+        self.errors = errors or []
+
+    @classmethod
+    def from_balances(
+            cls,
+            balances: Dict[str, Dict[str, float]],
+            snapshot: PriceSnapshot,
+            stablecoins: Iterable[str] = ('USDT', 'USDC'),
+            errors: Optional[List[Exception]] = None,
+    ) -> 'Valuation':
+        """
+        Values the balances of many accounts ({account: {ticker: amount}}) against one price snapshot.
+        The snapshot quote coin and `stablecoins` are valued at 1 USD.
+        """
+        if np is None:
+            raise ImportError('Valuation requires the `numpy` package (pip install numpy)')
+        accounts = list(balances)
+        coin_index: Dict[str, int] = {}
+        account_ids = array('i')
+        coin_ids = array('i')
+        amounts = array('d')
+        for account_id, account in enumerate(accounts):
+            for coin, amount in balances[account].items():
+                coin_id = coin_index.get(coin)
+                if coin_id is None:
+                    coin_id = coin_index[coin] = len(coin_index)
+                account_ids.append(account_id)
+                coin_ids.append(coin_id)
+                amounts.append(amount)
+        coins = list(coin_index)
+        return cls(
+            accounts=accounts,
+            coins=coins,
+            account_ids=np.frombuffer(account_ids, dtype=np.intc),
+            coin_ids=np.frombuffer(coin_ids, dtype=np.intc),
+            amounts=np.frombuffer(amounts, dtype=np.float64),
+            prices=cls.get_prices(coins, snapshot, stablecoins),
+            errors=errors,
+        )
+
+    @staticmethod
+    def get_prices(coins: List[str], snapshot: PriceSnapshot, stablecoins: Iterable[str] = ('USDT', 'USDC')) -> 'np.ndarray':
+        """Gets the USD prices of coins from the snapshot columns (bid/ask midpoint, else last price; NaN if unknown)."""
+        last = np.frombuffer(snapshot.last, dtype=np.float64)
+        bid = np.frombuffer(snapshot.bid, dtype=np.float64)
+        ask = np.frombuffer(snapshot.ask, dtype=np.float64)
+        book_prices = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, last)
+        index = {ticker: row for row, ticker in enumerate(snapshot.tickers)}
+        rows = np.fromiter((index.get(coin, -1) for coin in coins), dtype=np.intp, count=len(coins))
+        prices = np.full(len(coins), np.nan)
+        found = rows >= 0
+        prices[found] = book_prices[rows[found]]
+        unit = {snapshot.quote, *stablecoins}
+        prices[[i for i, coin in enumerate(coins) if coin in unit]] = 1.0
+        return prices
+
+    @property
+    def total(self, ) -> float:
+        return float(self.values.sum())
+
+    def by_account(self, ) -> Dict[str, float]:
+        """Gets the USD value of every account."""
+        totals = np.bincount(self.account_ids, weights=self.values, minlength=len(self.accounts))
+        return dict(zip(self.accounts, totals.tolist()))
+
+    def by_coin(self, ) -> Dict[str, float]:
+        """Gets the USD value of every coin across all accounts."""
+        totals = np.bincount(self.coin_ids, weights=self.values, minlength=len(self.coins))
+        return dict(zip(self.coins, totals.tolist()))
+
+    def get_amounts(self, ) -> Dict[str, float]:
+        """Gets the amount of every coin across all accounts."""
+        totals = np.bincount(self.coin_ids, weights=self.amounts, minlength=len(self.coins))
+        return dict(zip(self.coins, totals.tolist()))
+
+    def get_matrix(self, ) -> 'np.ndarray':
+        """Gets the USD values as an (account x coin) matrix ordered like `accounts` and `coins`."""
+        matrix = np.zeros((len(self.accounts), len(self.coins)))
+        np.add.at(matrix, (self.account_ids, self.coin_ids), self.values)
+        return matrix
+
+    def to_rows(self, ) -> List[Tuple[str, str, float, float]]:
+        """Gets the rows as (account, coin, amount, usd_value) tuples."""
+        return [
+            (self.accounts[account_id], self.coins[coin_id], amount, value)
+            for account_id, coin_id, amount, value in zip(
+                self.account_ids.tolist(), self.coin_ids.tolist(), self.amounts.tolist(), self.values.tolist(),
+            )
+        ]
+
+    def __len__(self, ) -> int:
+        return len(self.amounts)
+
+    def __repr__(self, ) -> str:
+        return f'Valuation(accounts={len(self.accounts)}, coins={len(self.coins)}, rows={len(self)}, total={self.total:.2f})'
+
+
+class PortfolioValuer:
+    def __init__(
+            self,
+            my_okx: MyOKX,
+            subaccounts: Optional[Iterable[str]] = None,
+            include_main: bool = True,
+            concurrency: int = 10,
+            stablecoins: Iterable[str] = ('USDT', 'USDC'),
+            balance: str = 'bal',
+    ):
+        """
+        PortfolioValuer values the balances of the main account and its subaccounts in USD:
+        balances are fetched with a bounded pool of concurrent workers, prices with one tickers request,
+        and the per-account, per-coin and total values are computed with NumPy column operations.
+        Requires the `numpy` package (pip install numpy).
+
+        :param my_okx: MyOKX instance of the main account used for requests.
+        :param subaccounts: Names of the subaccounts to value (None means all subaccounts, an empty list means none).
+        :param include_main: Values the funding account of the main account (named MAIN_ACCOUNT, `<main>`).
+        :param concurrency: Number of concurrent workers fetching subaccount balances.
+        :param stablecoins: Coins valued at 1 USD.
+        :param balance: OKX balance field valued: bal (total, including frozen) or availBal (available).
+        """
+        if np is None:
+            raise ImportError('PortfolioValuer requires the `numpy` package (pip install numpy)')
+        if balance not in ('bal', 'availBal'):
+            raise ValueError(f'PortfolioValuer | Unknown balance field: {balance}!')
+        self._my_okx = my_okx
+        self._subaccounts = subaccounts
+        self._include_main = include_main
+        self._concurrency = concurrency
+        self._stablecoins = tuple(stablecoins)
+        self._balance = balance
+
+    async def value(self, ) -> Tuple[int, Union[Valuation, Exception]]:
+        """Values all accounts (accounts whose balances could not be fetched are listed in Valuation.errors)."""
+        try:
+            status, result = await self._my_okx.PUBLIC_get_prices()
+            if status != 0:
+                return -1, Exception(f'PortfolioValuer | {result}')
+            snapshot: PriceSnapshot = result
+            balances: Dict[str, Dict[str, float]] = {}
+            errors: List[Exception] = []
+            if self._include_main:
+                status, result = await self._my_okx.FUNDING_get_balance()
+                if status == 0:
+                    balances[MAIN_ACCOUNT] = self._get_amounts(result)
+                else:
+                    errors.append(result)
+            if self._subaccounts is None or self._subaccounts:
+                sweeper = SubaccountSweeper(
+                    my_okx=self._my_okx, subaccounts=self._subaccounts, concurrency=self._concurrency, field=self._balance,
+                )
+                async for status, result in sweeper:
+                    if status == 0:
+                        balances[result.subaccount_name] = result.balances
+                    else:
+                        errors.append(result)
+            return 0, Valuation.from_balances(balances, snapshot, stablecoins=self._stablecoins, errors=errors)
+        except Exception as e:
+            return -1, Exception(f'PortfolioValuer | {e}')
+
+    def _get_amounts(self, result: Union[dict, Balances]) -> Dict[str, float]:
+        if isinstance(result, Balances):
+            attr = 'bal' if (self._balance == 'bal') else 'avail_bal'
+            return {balance.ccy: getattr(balance, attr) for balance in result}
+        return {str(balance_dict['ccy']): float(balance_dict[self._balance]) for balance_dict in result['data']}
@@ -0,0 +1,315 @@
+from typing import Optional, Union, Iterable, AsyncIterable, Dict, Tuple, AsyncIterator
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+
+from .myokx import MyOKX
+from .models import ChainInfo, Withdrawal
+from .ratelimit import RateLimiter, TokenBucket
+from .utils import afh
+
+
+class WithdrawalIntent:
+    __slots__ = ('intent_id', 'ticker', 'chain', 'address', 'amount', 'fee', 'client_id')
+
+    def __init__(self, intent_id: str, ticker: str, chain: str, address: str, amount: float, fee: Optional[float] = None):
+        """
+        Withdrawal to post on the chain. The intent_id must be unique and stable between runs (e.g., a payout id):
+        it is turned into the OKX clientId, which makes a resumed run never send the same withdrawal twice.
+
+        :param intent_id: Unique id of the withdrawal.
+        :param ticker: Coin of the withdrawal.
+        :param chain: Chain of the withdrawal (e.g., ETH-Base).
+        :param address: Destination address.
+        :param amount: Amount of the withdrawal (rounded to the chain's tick size).
+        :param fee: Withdrawal fee (None means the minimum fee of the chain).
+        """
+        self.intent_id = str(intent_id)
+        self.ticker = ticker
+        self.chain = chain
+        self.address = address
+        self.amount = amount
+        self.fee = fee
+        self.client_id = self.get_client_id(self.intent_id)
+
+    @staticmethod
+    def get_client_id(intent_id: str) -> str:
+        """Gets the OKX clientId of an intent (the intent_id itself if it is up to 32 alphanumerics, otherwise its md5 hash)."""
+        if intent_id.isascii() and intent_id.isalnum() and len(intent_id) <= 32:
+            return intent_id
+        return hashlib.md5(intent_id.encode()).hexdigest()
+
+    def to_dict(self, ) -> dict:
+        return {
+            'intent_id': self.intent_id,
+            'ticker': self.ticker,
+            'chain': self.chain,
+            'address': self.address,
+            'amount': self.amount,
+            'fee': self.fee,
+        }
+
+    def __repr__(self, ) -> str:
+        return f'WithdrawalIntent(intent_id={self.intent_id!r}, ticker={self.ticker!r}, chain={self.chain!r}, amount={self.amount})'
+
+
+class WithdrawalJournal:
+    STATE_SUBMITTING = 'submitting'
+    STATE_SUBMITTED = 'submitted'
+    STATE_REJECTED = 'rejected'
+    STATE_FAILED = 'failed'
+    STATE_UNKNOWN = 'unknown'
+
+    final_states = {STATE_SUBMITTED, STATE_REJECTED}
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Append-only JSONL journal of withdrawal state transitions (one line per transition).
+        The last line of an intent wins, so the journal survives crashes at any point: a truncated last line is ignored.
+
+        States:
+        - submitting: the request is about to be sent (the outcome is unknown until the next transition).
+        - submitted: OKX accepted the withdrawal (the line contains its wd_id).
+        - rejected: the intent violates the chain limits (or withdrawals are disabled on the chain) and was never sent.
+        - failed: OKX refused the withdrawal and no withdrawal with its clientId exists.
+        - unknown: the outcome could not be resolved (it is resolved by clientId on the next run).
+
+        :param path: Path of the journal file.
+        :param fsync: Flushes every transition to the disk (os.fsync) before the next step.
+        """
+        self.path = path
+        self._fsync = fsync
+        self._file = None
+        # Transitions are written from a thread pool
+        self._lock = threading.Lock()
+
+    def load(self, ) -> Dict[str, dict]:
+        """Loads the last transition of every intent ({intent_id: record})."""
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record['intent_id']] = record
+        return records
+
+    def write(self, intent: WithdrawalIntent, state: str, **fields) -> dict:
+        """Appends a state transition of an intent (blocking: BulkWithdrawer calls it in a thread pool)."""
+        record = {**intent.to_dict(), 'client_id': intent.client_id, 'state': state, 'ts': int(time.time() * 1000), **fields}
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+        return record
+
+    def close(self, ) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class BulkWithdrawer:
+    endpoint = '/api/v5/asset/withdrawal'
+
+    def __init__(
+            self,
+            my_okx: MyOKX,
+            journal: Union[str, WithdrawalJournal],
+            concurrency: int = 6,
+            retry_failed: bool = False,
+    ):
+        """
+        BulkWithdrawer posts a stream of withdrawal intents with a bounded pool of concurrent workers
+        under the OKX withdrawal rate limit (the shared RateLimiter of my_okx if it has one, otherwise its own token bucket).
+
+        Every intent is validated against the cached chain limits (withdrawals enabled, minimum/maximum amount, minimum fee),
+        sent with a clientId derived from its intent_id and journaled before and after sending.
+        Only limit violations are journaled as rejected: if the chain limits cannot be fetched, the intent fails without a journal
+        transition and is retried by the next run. An intent_id repeated while the first one is in flight shares its result.
+        On a restart with the same journal, submitted and rejected intents are skipped, while interrupted ones
+        are first looked up by clientId in the withdrawal history and resent only if OKX has no such withdrawal.
+
+        Results are streamed as soon as every intent is done (`async for intent_id, status, result in withdrawer.run(intents)`),
+        where `status` is 0 (`result` is the withdrawal_id) or -1 (`result` is an Exception).
+        Errors of the intents source and of the journal (e.g., OSError) stop the run and are raised by `run`.
+
+        :param my_okx: MyOKX instance used for requests.
+        :param journal: Path of the JSONL journal or a WithdrawalJournal.
+        :param concurrency: Number of concurrent workers.
+        :param retry_failed: Resends intents journaled as failed by previous runs (e.g., after topping up the balance).
+        """
+        self._my_okx = my_okx
+        self._journal = journal if isinstance(journal, WithdrawalJournal) else WithdrawalJournal(path=journal)
+        self._concurrency = concurrency
+        self._retry_failed = retry_failed
+        self._bucket: Optional[TokenBucket] = None
+        if my_okx.rate_limiter is None:
+            rate, period, _ = RateLimiter.limits[self.endpoint]
+            self._bucket = TokenBucket(rate=rate, period=period)
+        self._records: Optional[Dict[str, dict]] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def run(
+            self,
+            intents: Union[Iterable[WithdrawalIntent], AsyncIterable[WithdrawalIntent]],
+    ) -> AsyncIterator[Tuple[str, int, Union[str, Exception]]]:
+        await self._load()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._concurrency * 2)
+        # Items: results, None (a worker is done) or an exception of a task (raised by run)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> None:
+            try:
+                if hasattr(intents, '__aiter__'):
+                    async for intent in intents:
+                        await queue.put(intent)
+                else:
+                    for intent in intents:
+                        await queue.put(intent)
+            except Exception as e:
+                await results.put(e)
+                return
+            for _ in range(self._concurrency):
+                await queue.put(None)
+
+        async def work() -> None:
+            try:
+                while True:
+                    intent = await queue.get()
+                    if intent is None:
+                        break
+                    status, result = await self.withdraw(intent)
+                    await results.put((intent.intent_id, status, result))
+            except Exception as e:
+                await results.put(e)
+                return
+            await results.put(None)
+
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(self._concurrency)]
+        try:
+            finished = 0
+            while finished < self._concurrency:
+                item = await results.get()
+                if item is None:
+                    finished += 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._journal.close()
+
+    async def withdraw(self, intent: WithdrawalIntent) -> Tuple[int, Union[str, Exception]]:
+        """Posts one intent (or resolves it from the journal and the withdrawal history if a previous run already handled it)."""
+        future = self._inflight.get(intent.intent_id)
+        if future is not None:
+            # The same intent is already being handled: it must never be posted twice
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._withdraw(intent))
+        future.add_done_callback(lambda _: self._inflight.pop(intent.intent_id, None))
+        self._inflight[intent.intent_id] = future
+        return await asyncio.shield(future)
+
+    async def _withdraw(self, intent: WithdrawalIntent) -> Tuple[int, Union[str, Exception]]:
+        await self._load()
+        record = self._records.get(intent.intent_id)
+        if record is not None:
+            state = record['state']
+            if state == WithdrawalJournal.STATE_SUBMITTED:
+                return 0, record['wd_id']
+            if state == WithdrawalJournal.STATE_REJECTED or (state == WithdrawalJournal.STATE_FAILED and not self._retry_failed):
+                return -1, Exception(f'BulkWithdrawer | {intent.intent_id} | {record.get("error")}')
+            # The previous attempt may have reached OKX: never resend before checking the history
+            status, result = await self._resolve(intent)
+            if status != 0:
+                return -1, Exception(f'BulkWithdrawer | {intent.intent_id} | {result}')
+            if result is not None:
+                return 0, result
+
+        status, result = await self._my_okx.FUNDING_get_chain_record(ticker=intent.ticker, chain=intent.chain)
+        if status != 0:
+            # Not a verdict on the intent (e.g., the currencies endpoint is down): the next run retries it
+            return -1, Exception(f'BulkWithdrawer | {intent.intent_id} | {result}')
+        status, result = self._validate(intent, result)
+        if status != 0:
+            await self._transition(intent, WithdrawalJournal.STATE_REJECTED, error=str(result))
+            return -1, Exception(f'BulkWithdrawer | {intent.intent_id} | {result}')
+        amount, fee = result
+
+        await self._transition(intent, WithdrawalJournal.STATE_SUBMITTING)
+        if self._bucket is not None:
+            await self._bucket.acquire(priority=RateLimiter.PRIORITY_HIGH)
+        status, result = await self._my_okx.FUNDING_post_withdrawal(
+            ticker=intent.ticker,
+            chain=intent.chain,
+            address=intent.address,
+            amount=amount,
+            fee=fee,
+            client_id=intent.client_id,
+        )
+        if status == 0:
+            await self._transition(intent, WithdrawalJournal.STATE_SUBMITTED, wd_id=result)
+            return 0, result
+
+        # A timeout does not mean the withdrawal was not created
+        error = result
+        status, result = await self._resolve(intent)
+        if status != 0:
+            return -1, Exception(f'BulkWithdrawer | {intent.intent_id} | {error}')
+        if result is not None:
+            return 0, result
+        await self._transition(intent, WithdrawalJournal.STATE_FAILED, error=str(error))
+        return -1, Exception(f'BulkWithdrawer | {intent.intent_id} | {error}')
+
+    async def _resolve(self, intent: WithdrawalIntent) -> Tuple[int, Optional[Union[str, Exception]]]:
+        """Looks an intent up by clientId: (0, withdrawal_id) if it exists, (0, None) if it does not, (-1, Exception) if unknown."""
+        status, result = await self._my_okx.FUNDING_get_withdrawals(ticker=intent.ticker, client_id=intent.client_id, limit=1)
+        if status != 0:
+            await self._transition(intent, WithdrawalJournal.STATE_UNKNOWN, error=str(result))
+            return -1, result
+        if not result:
+            return 0, None
+        data = result[0]
+        wd_id = data.wd_id if isinstance(data, Withdrawal) else str(data['wdId'])
+        await self._transition(intent, WithdrawalJournal.STATE_SUBMITTED, wd_id=wd_id)
+        return 0, wd_id
+
+    @staticmethod
+    def _validate(intent: WithdrawalIntent, record: ChainInfo) -> Tuple[int, Union[Tuple[float, float], Exception]]:
+        """Checks an intent against the chain limits (returns the rounded amount and the fee)."""
+        amount = round(intent.amount, record.wd_tick_sz)
+        fee = intent.fee if intent.fee is not None else record.min_fee
+        if not record.can_wd:
+            return -1, Exception('Withdrawals are disabled on the chain!')
+        if amount <= 0:
+            return -1, Exception(f'Wrong amount: {intent.amount}!')
+        if record.min_wd is not None and amount < record.min_wd:
+            return -1, Exception(f'Amount {amount} is below the minimum {record.min_wd}!')
+        if record.max_wd is not None and amount > record.max_wd:
+            return -1, Exception(f'Amount {amount} is above the maximum {record.max_wd}!')
+        if fee is None or (record.min_fee is not None and fee < record.min_fee):
+            return -1, Exception(f'Fee {fee} is below the minimum {record.min_fee}!')
+        return 0, (amount, fee)
+
+    async def _load(self, ) -> None:
+        if self._records is None:
+            self._records = await afh(self._journal.load, False)
+
+    async def _transition(self, intent: WithdrawalIntent, state: str, **fields) -> None:
+        self._records[intent.intent_id] = await afh(self._journal.write, False, intent, state, **fields)
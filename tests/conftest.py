@@ -0,0 +1,34 @@
+from typing import Callable, Optional
+
+import httpx
+import pytest
+
+from my_okx import MyOKX, ClientHub
+from benchmarks.mock_okx import MockOKX
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture
+def mock() -> MockOKX:
+    """In-process OKX stand-in (latency, error_rate, subaccounts and routes can be changed by a test)."""
+    return MockOKX()
+
+
+@pytest.fixture
+def create_my_okx(mock: MockOKX) -> Callable[..., MyOKX]:
+    """Creates asynchronous MyOKX instances sending requests to `mock` (or to `transport`) with the given options."""
+    def create(transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs) -> MyOKX:
+        kwargs = {'api_key': 'key', 'secret_key': 'secret', 'passphrase': 'passphrase', 'asynchrony': True, **kwargs}
+        kwargs.setdefault('hub', ClientHub(async_transport=transport or mock.async_transport()))
+        return MyOKX(**kwargs)
+
+    return create
+
+
+@pytest.fixture
+def my_okx(create_my_okx: Callable[..., MyOKX]) -> MyOKX:
+    return create_my_okx()
@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks.methods import CASES, get_public_methods, run_case, compare
+from benchmarks.mock_okx import MockOKX
+
+pytestmark = pytest.mark.anyio
+
+
+def test_every_public_method_has_a_case():
+    assert sorted(get_public_methods()) == sorted(CASES)
+
+
+@pytest.mark.parametrize('asynchrony', [True, False])
+@pytest.mark.parametrize('method', sorted(CASES))
+async def test_case_runs_without_errors(method, asynchrony):
+    result = await run_case(MockOKX(subaccounts=5), method, asynchrony=asynchrony, concurrency=2, requests=4)
+    assert result['requests'] == 4
+    assert result['errors'] == 0
+    assert result['rps'] > 0 and result['p50'] <= result['p99']
+
+
+async def test_mock_injects_errors_and_rate_limits():
+    result = await run_case(MockOKX(error_rate=1.0), 'FUNDING_get_balance', asynchrony=True, concurrency=1, requests=5)
+    assert result['errors'] == 5
+    mock = MockOKX(rate_limit=2)
+    result = await run_case(mock, 'PUBLIC_get_price_limit', asynchrony=True, concurrency=1, requests=5)
+    assert result['errors'] == 3
+
+
+def test_compare_reports_throughput_drops():
+    baseline = [{'method': 'FUNDING_get_balance', 'mode': 'async', 'concurrency': 10, 'rps': 1000.0}]
+    assert compare([{**baseline[0], 'rps': 850.0}], baseline, tolerance=0.2) == []
+    regressions = compare([{**baseline[0], 'rps': 700.0}], baseline, tolerance=0.2)
+    assert regressions == ['FUNDING_get_balance [async, c=10]: 1000 -> 700 req/s']
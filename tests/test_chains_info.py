@@ -0,0 +1,26 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_chain_info_returns_raw_row_without_models(mock, create_my_okx):
+    row = mock.currencies[1]
+    row.update({'minFee': '0.00000100', 'wdQuota': '10000000', 'usedWdQuota': '0', 'minWdUnlockConfirm': '2'})
+    my_okx = create_my_okx(models=False)
+    status, result = await my_okx.FUNDING_get_chain_info(ticker='ETH', chain='ETH-Base')
+    assert status == 0, result
+    assert result == row
+
+    # The returned row is a copy of the cached one
+    result['minFee'] = '1'
+    status, result = await my_okx.FUNDING_get_chain_info(ticker='ETH', chain='ETH-Base')
+    assert result['minFee'] == '0.00000100'
+
+
+async def test_raw_rows_are_not_kept_with_models(create_my_okx):
+    my_okx = create_my_okx(models=True)
+    status, result = await my_okx.FUNDING_get_chain_info(ticker='ETH', chain='ETH-Base')
+    assert status == 0, result
+    assert result.min_fee == 0.00001
+    assert my_okx._chains_info_cache.size == 5
+    assert not my_okx._chains_info_cache._rows
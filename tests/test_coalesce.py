@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_coalesced_callers_get_own_results(mock, my_okx):
+    mock.latency = 0.02
+
+    async def get_balance():
+        status, result = await my_okx.FUNDING_get_balance()
+        assert status == 0, result
+        balance = result['data'][0]['availBal']
+        result['data'][0]['availBal'] = 'mutated'
+        return balance
+
+    balances = await asyncio.gather(*(get_balance() for _ in range(5)))
+    assert mock.requests == 1
+    assert 'mutated' not in balances
+
+
+async def test_micro_cache_is_not_mutated_by_callers(mock, create_my_okx):
+    my_okx = create_my_okx(coalesce_ttl=10.0)
+    status, result = await my_okx.FUNDING_get_balance()
+    balance = result['data'][0]['availBal']
+    result['data'][0]['availBal'] = 'mutated'
+    status, result = await my_okx.FUNDING_get_balance()
+    assert mock.requests == 1
+    assert result['data'][0]['availBal'] == balance
@@ -0,0 +1,57 @@
+import sys
+import json
+import logging
+import importlib
+
+import pytest
+
+from my_okx import utils
+from my_okx.utils import json_loads
+
+pytestmark = pytest.mark.anyio
+
+
+class Body(dict):
+    """Parsed body counting how many times it is formatted."""
+    formatted = 0
+
+    def __str__(self, ) -> str:
+        Body.formatted += 1
+        return dict.__repr__(self)
+
+    __repr__ = __str__
+
+
+@pytest.mark.parametrize('level, formatted', [(logging.INFO, False), (logging.DEBUG, True)])
+async def test_response_is_formatted_only_if_debug_is_enabled(create_my_okx, caplog, level: int, formatted: bool):
+    Body.formatted = 0
+    logger = logging.getLogger('my_okx.tests')
+    my_okx = create_my_okx(logger=logger, json_decoder=lambda content: Body(json_loads(content)))
+    with caplog.at_level(level, logger='my_okx.tests'):
+        status, result = await my_okx.FUNDING_get_balance()
+    assert status == 0, result
+    assert (Body.formatted > 0) == formatted
+
+
+def test_decoder_falls_back_to_json_without_orjson(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    try:
+        fallback = importlib.reload(utils)
+        assert fallback.orjson is None
+        assert fallback.json_loads is json.loads
+        assert fallback.json_loads(b'{"code":"0","data":[{"bal":"1.5"}]}') == {'code': '0', 'data': [{'bal': '1.5'}]}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(utils)
+
+
+def test_decoder_uses_orjson_if_installed():
+    orjson = pytest.importorskip('orjson')
+    assert json_loads is orjson.loads
+
+
+async def test_default_decoder_parses_responses(my_okx):
+    assert my_okx._json_decoder is json_loads
+    status, result = await my_okx.FUNDING_get_balance('ETH')
+    assert status == 0
+    assert result['data'][0]['availBal'] == '10.5'
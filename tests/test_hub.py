@@ -0,0 +1,46 @@
+import httpx
+import pytest
+
+from my_okx import ClientHub
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_instances_share_client_per_proxy(mock, create_my_okx):
+    hub = ClientHub(async_transport=mock.async_transport())
+    first = create_my_okx(hub=hub)
+    second = create_my_okx(hub=hub, api_key='other')
+    proxied = create_my_okx(hub=hub, proxy='user:pass@127.0.0.1:8080')
+    assert first._get_httpx_client() is second._get_httpx_client()
+    assert proxied._get_httpx_client() is not first._get_httpx_client()
+    assert hub.get_client(asynchrony=False) is not first._get_httpx_client()
+    assert hub.size == 3
+    await hub.aclose()
+    assert hub.size == 0
+
+
+async def test_signing_stays_per_key(mock, create_my_okx):
+    keys = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        keys.append(request.headers['OK-ACCESS-KEY'])
+        return mock.handle(request)
+
+    hub = ClientHub(async_transport=httpx.MockTransport(handler))
+    for api_key in ('first', 'second'):
+        my_okx = create_my_okx(hub=hub, api_key=api_key)
+        status, result = await my_okx.FUNDING_get_balance('ETH')
+        assert status == 0
+    assert keys == ['first', 'second']
+    assert hub.size == 1
+
+
+async def test_instance_does_not_close_shared_client(create_my_okx):
+    hub = ClientHub(async_transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    my_okx = create_my_okx(hub=hub)
+    httpx_client = my_okx._get_httpx_client()
+    await my_okx.aclose()
+    assert not httpx_client.is_closed
+    assert create_my_okx(hub=hub)._get_httpx_client() is httpx_client
+    await hub.aclose()
+    assert httpx_client.is_closed
@@ -0,0 +1,19 @@
+import pytest
+
+from my_okx import Metrics
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failing_hook_does_not_change_result(create_my_okx):
+    def hook(event):
+        raise RuntimeError('hook bug')
+
+    metrics = Metrics(hooks=[hook])
+    my_okx = create_my_okx(metrics=metrics)
+    status, result = await my_okx.FUNDING_post_withdrawal(
+        ticker='ETH', chain='ETH-Base', address='0xB293cFf00bA3f110C839fBDB59186BD944B144D5', amount=0.01, fee=0.00001,
+    )
+    assert (status, result) == (0, '1')
+    assert metrics.hook_errors == 1
+    assert metrics.snapshot()['/api/v5/asset/withdrawal']['key']['requests'] == 1
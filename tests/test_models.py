@@ -0,0 +1,73 @@
+import pytest
+
+from my_okx import ChainInfo, ChainsInfo, Balance, Balances, Withdrawal, Transfer
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize('model', [ChainInfo, ChainsInfo, Balance, Balances, Withdrawal, Transfer])
+def test_models_have_no_instance_dict(model):
+    assert '__slots__' in vars(model)
+    assert '__weakref__' not in dir(model)
+
+
+def test_chain_info_is_parsed_once_and_round_trips(mock):
+    row = mock.currencies[1]
+    chain_info = ChainInfo.from_json(row)
+    assert (chain_info.min_wd, chain_info.min_fee, chain_info.wd_tick_sz) == (0.001, 0.00001, 8)
+    assert chain_info.can_wd is True
+    assert not hasattr(chain_info, '__dict__')
+    with pytest.raises(AttributeError):
+        chain_info.extra = 1
+    assert chain_info.to_dict() == {field: value for field, value in row.items() if field != 'name'}
+
+
+def test_collections_are_indexed(mock):
+    chains_info = ChainsInfo.from_json(mock.currencies)
+    assert len(chains_info) == len(mock.currencies)
+    assert ('ETH', 'ETH-Base') in chains_info
+    assert chains_info.get('ETH', 'ETH-Base').min_fee == 0.00001
+    assert chains_info.get('ETH', 'ETH-Solana') is None
+    assert [record.chain for record in chains_info.get_chains('ETH')] == ['ETH-ERC20', 'ETH-Base', 'ETH-Arbitrum One']
+
+    balances = Balances.from_json([{'ccy': 'ETH', 'bal': '1.5', 'availBal': '1.25', 'frozenBal': ''}])
+    assert balances['ETH'].frozen_bal == 0.0
+    assert balances.get_available('ETH') == 1.25
+    assert balances.get_available('BTC') == 0.0
+    assert 'BTC' not in balances
+
+
+def test_withdrawal_states():
+    data = {'wdId': 7, 'ccy': 'ETH', 'chain': 'ETH-Base', 'amt': '0.5', 'fee': '0.00001', 'toAddr': '0x1', 'state': '-2', 'ts': '1700000000000'}
+    withdrawal = Withdrawal.from_json(data)
+    assert (withdrawal.wd_id, withdrawal.amt, withdrawal.to_addr, withdrawal.ts) == ('7', 0.5, '0x1', 1700000000000)
+    assert withdrawal.is_failed and not withdrawal.is_completed
+    assert Withdrawal.from_json({**data, 'state': 2}).is_completed
+
+
+async def test_methods_return_models(mock, create_my_okx):
+    my_okx = create_my_okx(models=True)
+    status, balances = await my_okx.FUNDING_get_balance('ETH')
+    assert status == 0 and isinstance(balances, Balances)
+    assert balances['ETH'].avail_bal == 10.5
+
+    status, chain_info = await my_okx.FUNDING_get_chain_info('ETH', 'ETH-Base')
+    assert status == 0 and isinstance(chain_info, ChainInfo)
+
+    status, transfer = await my_okx.SUBACCOUNT_transfer_to_main(subaccount_name='trader01', ticker='ETH', amount=0.5)
+    assert status == 0 and isinstance(transfer, Transfer)
+    assert (transfer.trans_id, transfer.amt) == ('1', 0.5)
+
+    status, withdrawal_id = await my_okx.FUNDING_post_withdrawal(
+        ticker='ETH', chain='ETH-Base', address='0xB293cFf00bA3f110C839fBDB59186BD944B144D5', amount=0.01, fee=0.00001,
+    )
+    assert status == 0
+    status, withdrawal = await my_okx.FUNDING_get_withdrawal(withdrawal_id=withdrawal_id)
+    assert status == 0 and isinstance(withdrawal, Withdrawal)
+    assert withdrawal.is_completed
+
+
+async def test_methods_return_json_without_models(my_okx):
+    status, balances = await my_okx.FUNDING_get_balance('ETH')
+    assert status == 0
+    assert balances['data'][0]['availBal'] == '10.5'
@@ -0,0 +1,82 @@
+import csv
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from my_okx import Paginator, PaginationError
+
+pytestmark = pytest.mark.anyio
+
+
+async def collect(paginator: Paginator) -> list:
+    return [row async for row in paginator]
+
+
+async def test_history_is_walked_with_after_cursor(mock, my_okx):
+    paginator = Paginator.deposits(my_okx)
+    rows = await collect(paginator)
+    assert [row['depId'] for row in rows] == [row['depId'] for row in mock.deposits]
+    # 10 full pages and an empty one ending the history
+    assert paginator.pages == mock.requests == 11
+    assert paginator.rows == len(mock.deposits)
+
+
+async def test_cursors_and_filters(mock, my_okx):
+    after = mock.deposits[99]['ts']
+    before = mock.deposits[350]['ts']
+    rows = await collect(Paginator.deposits(my_okx, ticker='ETH', after=after, before=before, limit=50))
+    assert [row['depId'] for row in rows] == [row['depId'] for row in mock.deposits[100:350] if row['ccy'] == 'ETH']
+
+    paginator = Paginator.transfers(my_okx, subaccount_name=mock.subaccounts[0])
+    rows = await collect(paginator)
+    assert rows and all(row['subAcct'] == mock.subaccounts[0] for row in rows)
+
+    assert [row['subAcct'] async for row in Paginator.subaccounts(my_okx)] == mock.subaccounts
+
+
+async def test_max_pages_stops_without_extra_requests(mock, my_okx):
+    paginator = Paginator.deposits(my_okx, max_pages=2)
+    assert len(await collect(paginator)) == 200
+    assert mock.requests == 2
+
+
+@pytest.mark.parametrize('prefetch, requests', [(True, 2), (False, 1)])
+async def test_next_page_is_prefetched(mock, my_okx, prefetch, requests):
+    async for page in Paginator.deposits(my_okx, prefetch=prefetch).iter_pages():
+        await asyncio.sleep(0.01)
+        assert mock.requests == requests
+        break
+
+
+async def test_failed_page_raises(mock, create_my_okx):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if 'after' in request.url.params:
+            return httpx.Response(500, json={'code': '50000', 'msg': 'Internal server error', 'data': []})
+        return mock.handle(request)
+
+    paginator = Paginator.deposits(create_my_okx(httpx.MockTransport(handler)))
+    with pytest.raises(PaginationError):
+        await collect(paginator)
+    assert paginator.rows == 100
+
+
+async def test_rows_are_streamed_to_files(tmp_path, mock, create_my_okx):
+    my_okx = create_my_okx(models=True)
+    for _ in range(3):
+        await my_okx.FUNDING_post_withdrawal(
+            ticker='ETH', chain='ETH-Base', address='0xB293cFf00bA3f110C839fBDB59186BD944B144D5', amount=0.01, fee=0.00001,
+        )
+    path = tmp_path / 'withdrawals.jsonl'
+    assert await Paginator.withdrawals(my_okx, limit=2).to_jsonl(str(path)) == (0, 3)
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row['wd_id'] for row in rows] == ['3', '2', '1']
+    assert rows[0]['amt'] == 0.01
+
+    path = tmp_path / 'deposits.csv'
+    assert await Paginator.deposits(my_okx, ticker='USDT', max_pages=1).to_csv(str(path), fields=['depId', 'amt']) == (0, 100)
+    with open(path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 100
+    assert rows[0] == {'depId': '1', 'amt': '1.5'}
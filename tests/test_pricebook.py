@@ -0,0 +1,117 @@
+import json
+import asyncio
+
+import pytest
+
+from my_okx import PriceBook
+
+websockets = pytest.importorskip('websockets')
+
+pytestmark = pytest.mark.anyio
+
+
+class TickersServer:
+    """Local stand-in of the OKX public WebSocket: pushes a ticker for every subscribed instrument."""
+
+    def __init__(self, prices: dict):
+        self.prices = prices
+        self.subscriptions: list = []
+        self.connections: list = []
+        self._server = None
+
+    async def __aenter__(self, ) -> 'TickersServer':
+        self._server = await websockets.serve(self._handle, '127.0.0.1', 0)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self, ) -> str:
+        return f'ws://127.0.0.1:{self._server.sockets[0].getsockname()[1]}'
+
+    async def push(self, ) -> None:
+        """Sends the current prices of the subscribed instruments to the latest connection."""
+        connection = self.connections[-1]
+        inst_ids = [arg['instId'] for subscription in self.subscriptions for arg in subscription]
+        await connection.send(json.dumps({
+            'arg': {'channel': 'tickers'},
+            'data': [
+                {'instId': inst_id, 'last': str(self.prices[inst_id]), 'bidPx': str(self.prices[inst_id]), 'askPx': str(self.prices[inst_id])}
+                for inst_id in dict.fromkeys(inst_ids)
+            ],
+        }))
+
+    async def _handle(self, connection) -> None:
+        self.connections.append(connection)
+        self.subscriptions = []
+        async for message in connection:
+            if message == 'ping':
+                await connection.send('pong')
+                continue
+            self.subscriptions.append(json.loads(message)['args'])
+            await self.push()
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, 'Condition was not met in time'
+        await asyncio.sleep(0.01)
+
+
+
+async def test_subscribe_and_reconnect():
+    async with TickersServer({'BTC-USDT': 60000.0, 'ETH-USDT': 4000.0}) as server:
+        price_book = PriceBook(tickers=['BTC'], url=server.url, reconnect_delay=0.01)
+        await price_book.start()
+        await wait_for(lambda: price_book.get_price('BTC') is not None)
+        assert price_book.get_price('BTC') == 60000.0
+        assert price_book.get_price('ETH') is None
+
+        await price_book.subscribe(['ETH'])
+        await wait_for(lambda: price_book.get_price('ETH') is not None)
+        assert price_book.get_price('ETH') == 4000.0
+
+        # The server drops the connection: the book reconnects and resubscribes to all tickers
+        await server.connections[-1].close()
+        await wait_for(lambda: len(server.connections) == 2 and price_book.is_live)
+        await wait_for(lambda: bool(server.subscriptions))
+        assert sorted(arg['instId'] for arg in server.subscriptions[0]) == ['BTC-USDT', 'ETH-USDT']
+        assert price_book.reconnects == 1
+
+        server.prices['ETH-USDT'] = 4100.0
+        await server.push()
+        await wait_for(lambda: price_book.get_price('ETH') == 4100.0)
+        await price_book.stop()
+        assert not price_book.is_live
+
+
+async def test_stale_prices_are_not_served():
+    async with TickersServer({'BTC-USDT': 60000.0}) as server:
+        price_book = PriceBook(tickers=['BTC'], url=server.url, max_staleness=0.1)
+        await price_book.start()
+        await wait_for(lambda: price_book.get_price('BTC') is not None)
+        await asyncio.sleep(0.15)
+        assert price_book.is_live
+        assert price_book.get_price('BTC') is None
+        await server.push()
+        await wait_for(lambda: price_book.get_price('BTC') is not None)
+        await price_book.stop()
+
+
+async def test_get_price_falls_back_to_rest(mock, create_my_okx):
+    async with TickersServer({'ETH-USDT': 4000.0}) as server:
+        price_book = PriceBook(tickers=['ETH'], url=server.url)
+        my_okx = create_my_okx(price_book=price_book)
+        await price_book.start()
+        await wait_for(lambda: price_book.get_price('ETH') is not None)
+        assert await my_okx.PUBLIC_get_price('ETH') == (0, 4000.0)
+        assert mock.requests == 0
+
+        # The book is not live: the price is requested from the price limits
+        await price_book.stop()
+        assert await my_okx.PUBLIC_get_price('ETH') == (0, 3500.0)
+        assert mock.requests == 1
@@ -0,0 +1,57 @@
+import pytest
+
+from my_okx import PriceSnapshot
+
+pytestmark = pytest.mark.anyio
+
+
+def test_snapshot_columns_and_lookups():
+    snapshot = PriceSnapshot.from_json([
+        {'instId': 'BTC-USDT', 'last': '60000', 'bidPx': '59990', 'askPx': '60010'},
+        {'instId': 'ETH-USDT', 'last': '3500', 'bidPx': '', 'askPx': ''},
+        {'instId': 'ETH-BTC', 'last': '0.05', 'bidPx': '0.05', 'askPx': '0.05'},
+    ])
+    assert snapshot.tickers == ['BTC', 'ETH']
+    assert list(snapshot.last) == [60000.0, 3500.0]
+    assert 'ETH' in snapshot and 'SOL' not in snapshot
+    # Midpoint of the book, or the last price if the book side is empty
+    assert snapshot.get_price('BTC') == 60000.0
+    assert snapshot.get_price('ETH') == 3500.0
+    assert snapshot.get_price('SOL') is None
+    assert (snapshot.get_bid('BTC'), snapshot.get_ask('BTC')) == (59990.0, 60010.0)
+
+
+def test_snapshot_updates_rows_in_place():
+    snapshot = PriceSnapshot()
+    snapshot.set('BTC', last=60000.0, bid=59990.0, ask=60010.0)
+    snapshot.set('ETH', last=3500.0, bid=3499.0, ask=3501.0)
+    assert snapshot.update_json({'instId': 'BTC-USDT', 'last': '61000', 'bidPx': '60990', 'askPx': '61010'})
+    assert not snapshot.update_json({'instId': 'BTC-USDC', 'last': '1', 'bidPx': '1', 'askPx': '1'})
+    assert len(snapshot) == 2
+    assert snapshot.get_last('BTC') == 61000.0
+    assert snapshot.get_age('BTC') < 1.0
+
+
+async def test_get_prices_fetches_all_tickers_in_one_request(mock, my_okx):
+    status, snapshot = await my_okx.PUBLIC_get_prices()
+    assert status == 0
+    assert mock.requests == 1
+    assert {ticker: round(snapshot.get_price(ticker), 2) for ticker in snapshot.tickers} == mock.prices
+
+
+async def test_get_price_is_served_from_fresh_snapshot(mock, create_my_okx):
+    my_okx = create_my_okx(price_max_age=60.0)
+    assert await my_okx.PUBLIC_get_price('BTC') == (0, 60000.0)
+    assert mock.requests == 1
+
+    await my_okx.PUBLIC_get_prices()
+    mock.prices['BTC'] = 62000.0
+    assert await my_okx.PUBLIC_get_price('BTC') == (0, 60000.0)
+    assert mock.requests == 2
+    # The snapshot is too old for the given max_age: the price limits are requested
+    assert await my_okx.PUBLIC_get_price('BTC', max_age=0.0) == (0, 62000.0)
+    assert mock.requests == 3
+    # Coins missing from the snapshot are requested too
+    mock.prices['DOGE'] = 0.1
+    assert await my_okx.PUBLIC_get_price('DOGE') == (0, 0.1)
+    assert mock.requests == 4
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from my_okx import ProxyPool
+
+PROXIES = ['proxy-1:8080', 'proxy-2:8080', 'proxy-3:8080']
+
+
+def test_round_robin_spreads_requests():
+    proxy_pool = ProxyPool(PROXIES)
+    selected = [proxy_pool.select() for _ in range(6)]
+    assert selected == PROXIES * 2
+    assert {proxy: stats['in_flight'] for proxy, stats in proxy_pool.get_stats().items()} == dict.fromkeys(PROXIES, 2)
+
+    for proxy in selected[:3]:
+        proxy_pool.record(proxy, latency=0.01, ok=True)
+    for proxy in selected[3:]:
+        proxy_pool.release(proxy)
+    assert all(stats['in_flight'] == 0 for stats in proxy_pool.get_stats().values())
+
+
+def test_consecutive_errors_eject_proxy_until_timeout():
+    proxy_pool = ProxyPool(PROXIES, max_errors=2, eject_timeout=0.05)
+    for _ in range(2):
+        proxy_pool.record(proxy_pool.select(proxy='proxy-1:8080'), latency=None, ok=False)
+    assert not proxy_pool.get_stats()['proxy-1:8080']['healthy']
+    assert 'proxy-1:8080' not in {proxy_pool.select() for _ in range(6)}
+
+    # After the timeout the proxy gets traffic again and recovers on success
+    time.sleep(0.06)
+    assert 'proxy-1:8080' in {proxy_pool.select() for _ in range(3)}
+    proxy_pool.record('proxy-1:8080', latency=0.01, ok=True)
+    stats = proxy_pool.get_stats()['proxy-1:8080']
+    assert stats['healthy'] and stats['errors'] == 0
+
+
+def test_error_after_readmission_ejects_again():
+    proxy_pool = ProxyPool(PROXIES, max_errors=1, eject_timeout=0.05)
+    proxy_pool.record(proxy_pool.select(proxy='proxy-1:8080'), latency=None, ok=False)
+    time.sleep(0.06)
+    assert proxy_pool.get_stats()['proxy-1:8080']['healthy']
+    proxy_pool.record(proxy_pool.select(proxy='proxy-1:8080'), latency=0.5, ok=False)
+    assert not proxy_pool.get_stats()['proxy-1:8080']['healthy']
+
+
+def test_slow_proxy_is_ejected_and_measured_again():
+    proxy_pool = ProxyPool(PROXIES, max_latency=0.1, eject_timeout=60.0)
+    proxy_pool.record(proxy_pool.select(proxy='proxy-2:8080'), latency=0.5, ok=True)
+    stats = proxy_pool.get_stats()['proxy-2:8080']
+    assert not stats['healthy']
+    assert stats['latency'] is None
+
+
+def test_least_latency_prefers_fast_and_unmeasured_proxies():
+    proxy_pool = ProxyPool(PROXIES, strategy=ProxyPool.STRATEGY_LEAST_LATENCY, smoothing=1.0)
+    # Proxies without latency samples are tried first
+    assert sorted(proxy_pool.select() for _ in range(3)) == sorted(PROXIES)
+    for proxy, latency in zip(PROXIES, (0.3, 0.1, 0.25)):
+        proxy_pool.record(proxy, latency=latency, ok=True)
+    assert proxy_pool.select() == 'proxy-2:8080'
+    assert proxy_pool.select() == 'proxy-2:8080'
+    # Requests in flight weight the latency: 0.1 * 3 > 0.25 * 1
+    assert proxy_pool.select() == 'proxy-3:8080'
+
+
+def test_sticky_key_keeps_proxy_while_healthy():
+    proxy_pool = ProxyPool(PROXIES, max_errors=1, eject_timeout=60.0)
+    proxy = proxy_pool.select(api_key='key')
+    assert all(proxy_pool.select(api_key='key') == proxy for _ in range(5))
+    proxy_pool.record(proxy, latency=None, ok=False)
+    assert proxy_pool.select(api_key='key') != proxy
+
+
+def test_all_ejected_uses_first_to_return():
+    proxy_pool = ProxyPool(PROXIES, max_errors=1, eject_timeout=60.0)
+    for proxy in PROXIES:
+        proxy_pool.record(proxy_pool.select(proxy=proxy), latency=None, ok=False)
+        time.sleep(0.001)
+    assert proxy_pool.select() == 'proxy-1:8080'
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        ProxyPool([])
+    with pytest.raises(ValueError):
+        ProxyPool(PROXIES, strategy='random')
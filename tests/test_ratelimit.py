@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from my_okx import RateLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_shared_stage_serves_high_priority_first():
+    rate_limiter = RateLimiter(shared_limits={RateLimiter.SCOPE_KEY: (1, 0.05)})
+    order = []
+
+    async def request(endpoint: str):
+        await rate_limiter.acquire(endpoint=endpoint, api_key='key')
+        order.append(endpoint)
+
+    await rate_limiter.acquire(endpoint='/api/v5/asset/balances', api_key='key')
+    await asyncio.gather(
+        request('/api/v5/asset/balances'),
+        request('/api/v5/asset/subaccount/balances'),
+        request('/api/v5/asset/withdrawal'),
+    )
+    assert order[0] == '/api/v5/asset/withdrawal'
+
+
+async def test_prioritized_requests_overtake_waiting_ones(create_my_okx):
+    rate_limiter = RateLimiter(limits={'/api/v5/asset/balances': (1, 0.05, RateLimiter.SCOPE_KEY)})
+    my_okx = create_my_okx(rate_limiter=rate_limiter, coalesce=False)
+    order = []
+
+    async def get_balance(name: str):
+        status, result = await my_okx.FUNDING_get_balance()
+        assert status == 0, result
+        order.append(name)
+
+    async def get_urgent_balance():
+        with my_okx.prioritized(RateLimiter.PRIORITY_HIGH):
+            await get_balance('urgent')
+
+    await get_balance('first')
+    await asyncio.gather(get_balance('low-1'), get_balance('low-2'), get_urgent_balance())
+    assert order == ['first', 'urgent', 'low-1', 'low-2']
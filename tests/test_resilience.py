@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+
+from my_okx import MyOKX, CircuitBreaker
+
+pytestmark = pytest.mark.anyio
+
+
+async def post_withdrawal(my_okx: MyOKX):
+    return await my_okx.FUNDING_post_withdrawal(
+        ticker='ETH', chain='ETH-Base', address='0xB293cFf00bA3f110C839fBDB59186BD944B144D5', amount=0.01, fee=0.00001,
+    )
+
+
+async def test_cancelled_probe_does_not_keep_circuit_open(mock, create_my_okx):
+    endpoint = '/api/v5/asset/withdrawal'
+    mock.error_rate = 1.0
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    my_okx = create_my_okx(circuit_breaker=circuit_breaker, coalesce=False)
+
+    status, _ = await post_withdrawal(my_okx)
+    assert status == -1
+    assert circuit_breaker.get_state(endpoint) == 'open'
+
+    # The half-open probe is abandoned by a caller timeout
+    await asyncio.sleep(0.06)
+    mock.error_rate = 0.0
+    mock.latency = 1.0
+    try:
+        await asyncio.wait_for(post_withdrawal(my_okx), timeout=0.05)
+    except asyncio.TimeoutError:
+        pass
+    assert circuit_breaker.get_state(endpoint) == 'half-open'
+
+    mock.latency = 0.0
+    status, result = await post_withdrawal(my_okx)
+    assert status == 0, result
+    assert circuit_breaker.get_state(endpoint) == 'closed'
+
+
+async def test_undecodable_probe_counts_as_failure(mock, create_my_okx):
+    endpoint = '/api/v5/asset/balances'
+    html = {'enabled': True}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if html['enabled']:
+            return httpx.Response(200, text='<html>Bad gateway</html>')
+        return mock.handle(request)
+
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    my_okx = create_my_okx(httpx.MockTransport(handler), circuit_breaker=circuit_breaker, coalesce=False)
+
+    status, _ = await my_okx.FUNDING_get_balance()
+    assert status == -1
+    assert circuit_breaker.get_state(endpoint) == 'open'
+
+    await asyncio.sleep(0.06)
+    status, _ = await my_okx.FUNDING_get_balance()
+    assert status == -1
+    assert circuit_breaker.get_state(endpoint) == 'open'
+
+    html['enabled'] = False
+    await asyncio.sleep(0.06)
+    status, result = await my_okx.FUNDING_get_balance()
+    assert status == 0, result
+    assert circuit_breaker.get_state(endpoint) == 'closed'
+
+
+async def test_cancelled_request_does_not_release_running_probe(mock, create_my_okx):
+    endpoint = '/api/v5/asset/balances'
+    behaviors = ['slow', 'fail', 'slow']
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        behavior = behaviors.pop(0) if behaviors else 'ok'
+        if behavior == 'fail':
+            return httpx.Response(500, json={'code': '50000', 'msg': 'Internal server error', 'data': []})
+        if behavior == 'slow':
+            await asyncio.sleep(1.0)
+        return mock.handle(request)
+
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    my_okx = create_my_okx(httpx.MockTransport(handler), circuit_breaker=circuit_breaker, coalesce=False)
+
+    # A request sent while the circuit is closed is still in flight when the circuit opens
+    in_flight = asyncio.ensure_future(my_okx.FUNDING_get_balance())
+    await asyncio.sleep(0.01)
+    status, _ = await my_okx.FUNDING_get_balance()
+    assert status == -1
+    assert circuit_breaker.get_state(endpoint) == 'open'
+
+    await asyncio.sleep(0.06)
+    probe = asyncio.ensure_future(my_okx.FUNDING_get_balance())
+    await asyncio.sleep(0.01)
+    assert circuit_breaker.get_state(endpoint) == 'half-open'
+
+    in_flight.cancel()
+    await asyncio.gather(in_flight, return_exceptions=True)
+    status, result = await my_okx.FUNDING_get_balance()
+    assert status == -1
+    assert 'open' in str(result)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
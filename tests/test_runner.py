@@ -0,0 +1,63 @@
+import os
+import threading
+from typing import Tuple, Any
+
+import pytest
+
+from my_okx import MyOKX, ShardedRunner
+from benchmarks.sharding import setup, job
+
+pytestmark = pytest.mark.anyio
+
+
+async def failing_job(my_okx: MyOKX, account: dict) -> Tuple[int, Any]:
+    if account['name'] == 'failing':
+        raise RuntimeError('Job failed')
+    if account['name'] == 'unpicklable':
+        return 0, threading.Lock()
+    return 0, os.getpid()
+
+
+async def crashing_job(my_okx: MyOKX, account: dict) -> Tuple[int, Any]:
+    os._exit(3)
+
+
+def create_accounts(count: int, **fields) -> list:
+    return [
+        {'api_key': f'key-{i:04d}', 'secret_key': 'secret', 'passphrase': 'passphrase', **fields}
+        for i in range(count)
+    ]
+
+
+def test_shards_are_stable():
+    accounts = create_accounts(50)
+    shards = ShardedRunner(accounts, job=job, processes=3).get_shards()
+    assert sorted(account['api_key'] for shard in shards for account in shard) == [account['api_key'] for account in accounts]
+    assert ShardedRunner(reversed(accounts), job=job, processes=3).get_shards() == [shard[::-1] for shard in shards]
+
+
+async def test_results_and_metrics_are_streamed_back():
+    runner = ShardedRunner(create_accounts(20, requests=2), job=job, processes=2, setup=setup)
+    results = {account_id: (status, result) async for account_id, status, result in runner}
+    assert results == {account['api_key']: (0, 2) for account in create_accounts(20)}
+    assert sorted(runner.metrics) == [0, 1]
+    assert runner.get_requests() == 40
+
+
+async def test_job_errors_are_results():
+    accounts = [
+        {**account, 'name': name}
+        for account, name in zip(create_accounts(3), ('failing', 'unpicklable', 'ok'))
+    ]
+    runner = ShardedRunner(accounts, job=failing_job, processes=2, setup=setup)
+    results = {account_id: (status, result) async for account_id, status, result in runner}
+    assert results['failing'][0] == -1 and 'Job failed' in str(results['failing'][1])
+    assert results['unpicklable'][0] == -1 and 'Unpicklable' in str(results['unpicklable'][1])
+    assert results['ok'][0] == 0 and results['ok'][1] != os.getpid()
+
+
+async def test_crashed_worker_fails_its_accounts():
+    runner = ShardedRunner(create_accounts(4), job=crashing_job, processes=1, setup=setup)
+    results = [(account_id, status, str(result)) async for account_id, status, result in runner]
+    assert sorted(account_id for account_id, status, result in results) == [account['api_key'] for account in create_accounts(4)]
+    assert all(status == -1 and 'exited with code 3' in result for account_id, status, result in results)
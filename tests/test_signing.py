@@ -0,0 +1,55 @@
+import hmac
+import json
+import base64
+import datetime
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def sign(secret_key: str, message: str) -> str:
+    return base64.b64encode(hmac.new(secret_key.encode('utf-8'), message.encode('utf-8'), digestmod='sha256').digest()).decode()
+
+
+async def test_sent_bytes_are_signed(mock, create_my_okx):
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return mock.handle(request)
+
+    my_okx = create_my_okx(httpx.MockTransport(handler), secret_key='SECRET-KEY')
+    assert (await my_okx.FUNDING_get_withdrawals(limit=10))[0] == 0
+    assert (await my_okx.SUBACCOUNT_transfer_to_main(subaccount_name='trader01', ticker='ETH', amount=0.5))[0] == 0
+
+    get, post = requests
+    assert get.headers['OK-ACCESS-SIGN'] == sign(
+        'SECRET-KEY', get.headers['OK-ACCESS-TIMESTAMP'] + 'GET' + get.url.raw_path.decode(),
+    )
+    # The body is serialized once: the signed bytes are the sent bytes
+    assert post.headers['OK-ACCESS-SIGN'] == sign(
+        'SECRET-KEY', post.headers['OK-ACCESS-TIMESTAMP'] + 'POST' + post.url.path + post.content.decode(),
+    )
+    assert json.loads(post.content) == {'ccy': 'ETH', 'amt': 0.5, 'from': 6, 'to': 6, 'subAcct': 'trader01', 'type': 2}
+    for request in requests:
+        assert request.headers['OK-ACCESS-KEY'] == 'key'
+        assert request.headers['OK-ACCESS-PASSPHRASE'] == 'passphrase'
+
+
+def test_headers_are_not_shared_between_requests(my_okx):
+    url, headers, content = my_okx._build_request(method='GET', endpoint='/api/v5/asset/balances', body='?ccy=ETH')
+    assert url == 'https://www.okx.com/api/v5/asset/balances?ccy=ETH'
+    assert content is None
+    assert 'OK-ACCESS-SIGN' not in my_okx._headers
+    assert my_okx._build_request(method='GET', endpoint='/api/v5/asset/balances', body='')[1] is not headers
+
+
+def test_timestamp_format(my_okx):
+    before = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    timestamp = my_okx.time
+    after = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    assert len(timestamp) == 24 and timestamp.endswith('Z')
+    parsed = datetime.datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%fZ')
+    assert before.replace(microsecond=before.microsecond // 1000 * 1000) <= parsed <= after
@@ -0,0 +1,106 @@
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from my_okx import MetadataStore
+
+pytestmark = pytest.mark.anyio
+
+
+class SlowStore(MetadataStore):
+    """Store counting value reads and holding the refresh lease of another process for `lease_delay` seconds."""
+
+    def __init__(self, *args, lease_delay: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lease_delay = lease_delay
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return super().get(key)
+
+    def acquire_lease(self, key):
+        time.sleep(self.lease_delay)
+        return super().acquire_lease(key)
+
+
+async def test_chains_info_uses_store_ttl_and_warm_start(tmp_path, mock, create_my_okx):
+    store = MetadataStore(str(tmp_path / 'metadata.db'), ttl=0.05)
+    store.set('currencies', mock.currencies)
+    my_okx = create_my_okx(metadata_store=store, chains_info_ttl=None)
+    status, result = await my_okx.FUNDING_get_chain_info(ticker='ETH', chain='ETH-Base')
+    assert status == 0, result
+    assert mock.requests == 0
+
+    # The store ttl replaces chains_info_ttl
+    await asyncio.sleep(0.06)
+    assert not my_okx._chains_info_cache.is_fresh
+
+
+async def test_unchanged_entry_is_not_read_again(tmp_path, mock, create_my_okx):
+    store = SlowStore(str(tmp_path / 'metadata.db'), ttl=0.05)
+    store.set('currencies', mock.currencies)
+    my_okx = create_my_okx(metadata_store=store, chains_info_ttl=None)
+    status, result = await my_okx.FUNDING_get_chain_record(ticker='ETH', chain='ETH-Base')
+    assert status == 0, result
+    assert store.reads == 1
+
+    # Another process refreshes the entry without changes: only its refresh time is checked
+    await asyncio.sleep(0.06)
+    store.set('currencies', mock.currencies)
+    for _ in range(10):
+        status, result = await my_okx.FUNDING_get_chain_record(ticker='ETH', chain='ETH-Base')
+        assert status == 0, result
+    assert store.reads == 1
+    assert mock.requests == 0
+
+
+async def test_store_calls_do_not_block_event_loop(tmp_path, create_my_okx):
+    store = SlowStore(str(tmp_path / 'metadata.db'), lease_delay=0.2)
+    my_okx = create_my_okx(metadata_store=store, chains_info_ttl=None)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    status, result = await my_okx.FUNDING_get_chain_info(ticker='ETH', chain='ETH-Base')
+    ticker.cancel()
+    assert status == 0, result
+    assert ticks >= 10
+
+
+async def test_constructor_does_not_touch_store(tmp_path, mock, create_my_okx):
+    store = SlowStore(str(tmp_path / 'metadata.db'))
+    store.set('currencies', mock.currencies)
+    my_okx = create_my_okx(metadata_store=store)
+    assert store.reads == 0
+    status, result = await my_okx.FUNDING_get_chain_record(ticker='ETH', chain='ETH-Base')
+    assert status == 0, result
+    assert store.reads == 1
+    assert mock.requests == 0
+
+
+async def test_waiters_take_over_lease_of_failed_refresh(tmp_path, mock, create_my_okx):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        return httpx.Response(503, json={'code': '503', 'msg': 'Service Unavailable', 'data': []})
+
+    store = MetadataStore(str(tmp_path / 'metadata.db'), lease_timeout=3.0, poll_interval=0.01)
+    transport = httpx.MockTransport(handler)
+    holder, waiter = create_my_okx(transport, metadata_store=store), create_my_okx(transport, metadata_store=store)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def refresh(my_okx):
+        status, _ = await my_okx.FUNDING_refresh_chains_info(force=False)
+        return status, loop.time() - started
+
+    results = await asyncio.gather(refresh(holder), refresh(waiter))
+    assert [status for status, _ in results] == [-1, -1]
+    assert max(elapsed for _, elapsed in results) < 1.0
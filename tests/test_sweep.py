@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+from my_okx import SubaccountSweeper
+
+pytestmark = pytest.mark.anyio
+
+
+async def collect(sweeper: SubaccountSweeper) -> list:
+    return [item async for item in sweeper]
+
+
+async def test_subaccounts_are_read_from_all_pages(mock, my_okx):
+    status, subaccounts = await my_okx.SUBACCOUNT_get_subaccounts()
+    assert status == 0
+    assert subaccounts == mock.subaccounts
+    assert mock.requests == 3
+
+
+async def test_sweep_streams_balances_with_bounded_workers(mock, create_my_okx):
+    in_flight = {'now': 0, 'max': 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/api/v5/asset/subaccount/balances':
+            in_flight['now'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            await asyncio.sleep(0.001)
+            in_flight['now'] -= 1
+        return mock.handle(request)
+
+    sweeper = SubaccountSweeper(create_my_okx(httpx.MockTransport(handler)), tickers=['ETH', 'USDT'], concurrency=8)
+    results = await collect(sweeper)
+    assert sorted(result.subaccount_name for status, result in results) == mock.subaccounts
+    assert all(status == 0 and result.balances == {'ETH': 10.5, 'USDT': 10.5} for status, result in results)
+    assert all(not result.transfers for status, result in results)
+    # One request per subaccount for all coins
+    assert mock.requests == 3 + len(mock.subaccounts)
+    assert in_flight['max'] == 8
+
+
+async def test_balances_above_threshold_are_transferred(mock, my_okx):
+    mock.subaccounts = ['trader01', 'trader02']
+    sweeper = SubaccountSweeper(my_okx, tickers=['ETH', 'USDT'], transfer_threshold={'ETH': 5.0, 'USDT': 20.0})
+    results = await collect(sweeper)
+    assert len(results) == 2
+    for status, result in results:
+        assert status == 0
+        assert list(result.transfers) == ['ETH']
+        assert result.transfers['ETH'][0] == 0
+    assert mock._transfer_id == 2
+
+
+async def test_failed_subaccount_does_not_stop_sweep(mock, create_my_okx):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get('subAcct') == 'broken':
+            return httpx.Response(500, json={'code': '50000', 'msg': 'Internal server error', 'data': []})
+        return mock.handle(request)
+
+    sweeper = SubaccountSweeper(create_my_okx(httpx.MockTransport(handler)), subaccounts=['trader01', 'broken', 'trader02'])
+    results = await collect(sweeper)
+    assert sorted(status for status, result in results) == [-1, 0, 0]
+    assert 'broken' in str(next(result for status, result in results if status == -1))
+
+
+def test_only_available_balances_can_be_transferred(my_okx):
+    with pytest.raises(ValueError):
+        SubaccountSweeper(my_okx, transfer_threshold=1.0, field='bal')
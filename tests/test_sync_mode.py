@@ -0,0 +1,58 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from my_okx import ClientHub
+from my_okx.utils import afh
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sync_client_does_not_block_event_loop(mock, create_my_okx):
+    mock.latency = 0.2
+    my_okx = create_my_okx(hub=ClientHub(transport=mock.transport()), asynchrony=False)
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    started = time.monotonic()
+    results = await asyncio.gather(*(my_okx.FUNDING_get_balance('ETH') for _ in range(5)))
+    elapsed = time.monotonic() - started
+    ticker.cancel()
+    assert all(status == 0 for status, result in results)
+    # The requests run in parallel threads while the loop keeps running other tasks
+    assert elapsed < 0.6
+    assert ticks >= 10
+
+
+async def test_sync_requests_run_in_given_executor(mock, create_my_okx):
+    threads = set()
+    transport = mock.transport()
+    handle_request = transport.handle_request
+
+    def record_thread(request):
+        threads.add(threading.current_thread().name)
+        return handle_request(request)
+
+    transport.handle_request = record_thread
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='okx') as executor:
+        my_okx = create_my_okx(hub=ClientHub(transport=transport), asynchrony=False, executor=executor)
+        results = await asyncio.gather(*(my_okx.FUNDING_get_balance('ETH') for _ in range(4)))
+    assert all(status == 0 for status, result in results)
+    assert threads and all(name.startswith('okx') for name in threads)
+
+
+async def test_afh_awaits_coroutines_and_runs_functions_in_threads():
+    async def coroutine(value):
+        return value
+
+    assert await afh(coroutine, True, 1) == 1
+    assert await afh(threading.current_thread, False) is not threading.current_thread()
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+import pytest
+
+from my_okx import WithdrawalTracker
+
+pytestmark = pytest.mark.anyio
+
+
+def add_withdrawals(mock, count: int, state: str = '2') -> list:
+    """Adds withdrawals to the history of the mock (the newest one has the largest wdId)."""
+    for i in range(len(mock._withdrawals) + 1, len(mock._withdrawals) + count + 1):
+        mock._withdrawals[str(i)] = {
+            'wdId': str(i), 'clientId': '', 'ccy': 'ETH', 'chain': 'ETH-Base', 'amt': '0.01', 'fee': '0.00001',
+            'to': '0xB293cFf00bA3f110C839fBDB59186BD944B144D5', 'txId': '', 'state': state, 'ts': str(1700000000000 + i),
+        }
+    return list(mock._withdrawals)[-count:]
+
+
+def make_due(tracker: WithdrawalTracker) -> None:
+    for tracked in tracker._pending.values():
+        tracked.next_check = 0.0
+
+
+async def test_withdrawals_are_resolved_by_history_pages(mock, my_okx):
+    withdrawal_ids = add_withdrawals(mock, 250)
+    tracker = WithdrawalTracker(my_okx)
+    for wd_id in withdrawal_ids:
+        tracker.add(wd_id)
+    finished = await tracker.poll()
+    assert sorted(wd_id for wd_id, status, result in finished) == sorted(withdrawal_ids)
+    assert all(status == 0 for wd_id, status, result in finished)
+    assert tracker.pending == 0
+    assert tracker.requests == mock.requests == 3
+
+
+async def test_withdrawals_missing_from_pages_are_fetched_concurrently(mock, create_my_okx):
+    withdrawal_ids = add_withdrawals(mock, 20)
+    add_withdrawals(mock, 100)
+    in_flight = {'now': 0, 'max': 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if 'wdId' in request.url.params:
+            in_flight['now'] += 1
+            in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            await asyncio.sleep(0.01)
+            in_flight['now'] -= 1
+        return mock.handle(request)
+
+    tracker = WithdrawalTracker(create_my_okx(httpx.MockTransport(handler)), max_pages=1, concurrency=5)
+    for wd_id in withdrawal_ids:
+        tracker.add(wd_id)
+    # The first miss only reschedules the withdrawals (they may show up in the next pages)
+    assert await tracker.poll() == []
+    assert tracker.requests == 1
+
+    make_due(tracker)
+    finished = await tracker.poll()
+    assert sorted(wd_id for wd_id, status, result in finished) == sorted(withdrawal_ids)
+    assert tracker.requests == 1 + 1 + 20
+    assert in_flight['max'] == 5
+
+
+async def test_poll_interval_depends_on_state_and_backs_off(mock, my_okx):
+    wd_id, = add_withdrawals(mock, 1, state='1')
+    tracker = WithdrawalTracker(my_okx, poll_interval=1.0, max_poll_interval=3.0, backoff=1.5)
+    tracker.add(wd_id)
+    tracked = tracker._pending[wd_id]
+
+    assert await tracker.poll() == []
+    assert tracked.interval == 1.0
+    # Nothing is due yet
+    assert await tracker.poll() == []
+    assert mock.requests == 1
+
+    make_due(tracker)
+    await tracker.poll()
+    assert tracked.interval == 1.5
+
+    mock._withdrawals[wd_id]['state'] = '0'
+    make_due(tracker)
+    await tracker.poll()
+    assert tracked.interval == 2.0
+
+    make_due(tracker)
+    await tracker.poll()
+    assert tracked.interval == 3.0
+
+
+async def test_callbacks_and_async_iteration(mock, my_okx):
+    completed_id, = add_withdrawals(mock, 1, state='1')
+    failed_id, = add_withdrawals(mock, 1, state='-2')
+    completed, failed = [], []
+
+    async def on_complete(wd_id, data):
+        completed.append((wd_id, data['state']))
+
+    tracker = WithdrawalTracker(
+        my_okx, poll_interval=0.01, on_complete=on_complete, on_fail=lambda wd_id, data: failed.append((wd_id, data['state'])),
+    )
+    tracker.add(completed_id)
+    tracker.add(failed_id)
+
+    results = []
+    async for wd_id, status, result in tracker:
+        results.append((wd_id, status))
+        if wd_id == failed_id:
+            assert isinstance(result, Exception)
+            mock._withdrawals[completed_id]['state'] = '2'
+    assert results == [(failed_id, -1), (completed_id, 0)]
+    assert failed == [(failed_id, '-2')]
+    assert completed == [(completed_id, '2')]
@@ -0,0 +1,60 @@
+import pytest
+
+from my_okx import PortfolioValuer, PriceSnapshot
+from my_okx.valuation import MAIN_ACCOUNT, Valuation
+from benchmarks.mock_okx import MockOKX
+
+pytest.importorskip('numpy')
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def mock() -> MockOKX:
+    """Mock whose accounts hold 1 ETH, of which 0.25 ETH is frozen, and whose subaccounts include one named `main`."""
+    def balances(mock: MockOKX, params: dict, body: dict):
+        return [{'ccy': 'ETH', 'bal': '1', 'availBal': '0.75', 'frozenBal': '0.25'}]
+
+    mock = MockOKX(subaccounts=0)
+    mock.subaccounts = ['main', 'trader01']
+    mock.routes = {
+        **MockOKX.routes,
+        ('GET', '/api/v5/asset/balances'): balances,
+        ('GET', '/api/v5/asset/subaccount/balances'): balances,
+    }
+    return mock
+
+
+@pytest.mark.parametrize('models', [False, True])
+async def test_total_balances_of_all_accounts_are_valued(create_my_okx, models: bool):
+    my_okx = create_my_okx(models=models)
+    status, valuation = await PortfolioValuer(my_okx).value()
+    assert status == 0, valuation
+    assert valuation.by_account() == {MAIN_ACCOUNT: 3500.0, 'main': 3500.0, 'trader01': 3500.0}
+    assert valuation.total == 10500.0
+
+    status, valuation = await PortfolioValuer(my_okx, balance='availBal').value()
+    assert status == 0, valuation
+    assert valuation.total == 7875.0
+
+
+def test_valuation_math():
+    snapshot = PriceSnapshot()
+    snapshot.set('BTC', last=60000.0, bid=59990.0, ask=60010.0)
+    snapshot.set('ETH', last=3500.0, bid=float('nan'), ask=float('nan'))
+    valuation = Valuation.from_balances(
+        {'first': {'BTC': 0.5, 'USDT': 100.0, 'DOGE': 1000.0}, 'second': {'ETH': 2.0, 'USDC': 50.0, 'BTC': 0.25}},
+        snapshot,
+    )
+    # Book midpoint for BTC, last price for ETH, 1 USD for stablecoins and 0 for coins without a price
+    assert valuation.by_account() == {'first': 30100.0, 'second': 22050.0}
+    assert valuation.by_coin() == {'BTC': 45000.0, 'USDT': 100.0, 'DOGE': 0.0, 'ETH': 7000.0, 'USDC': 50.0}
+    assert valuation.get_amounts()['BTC'] == 0.75
+    assert valuation.missing == ['DOGE']
+    assert valuation.total == 52150.0
+    assert valuation.get_matrix().tolist() == [
+        [30000.0, 100.0, 0.0, 0.0, 0.0],
+        [15000.0, 0.0, 0.0, 7000.0, 50.0],
+    ]
+    assert valuation.to_rows()[-1] == ('second', 'BTC', 0.25, 15000.0)
+    assert len(valuation) == 6
@@ -0,0 +1,30 @@
+import httpx
+import pytest
+
+from my_okx import ClientHub, ProxyPool, RateLimiter, Metrics
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_warm_up_goes_through_limiter_pool_and_metrics(mock, create_my_okx):
+    hub = ClientHub(async_transport=mock.async_transport())
+    proxy_pool = ProxyPool(['proxy-1:8080', 'proxy-2:8080'], hub=hub)
+    rate_limiter = RateLimiter()
+    metrics = Metrics()
+    my_okx = create_my_okx(hub=hub, proxy_pool=proxy_pool, rate_limiter=rate_limiter, metrics=metrics)
+    status, result = await my_okx.warm_up(connections=2)
+    assert (status, result) == (0, 4)
+    assert {proxy: stats['requests'] for proxy, stats in proxy_pool.get_stats().items()} == {'proxy-1:8080': 2, 'proxy-2:8080': 2}
+    assert all(stats['in_flight'] == 0 for stats in proxy_pool.get_stats().values())
+    assert metrics.snapshot()['/api/v5/public/time']['key']['requests'] == 4
+    assert set(rate_limiter.get_stats()) == {'/api/v5/public/time|ip:proxy-1:8080', '/api/v5/public/time|ip:proxy-2:8080'}
+
+
+async def test_warm_up_counts_only_successful_responses(create_my_okx):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, text='Service Unavailable')
+
+    my_okx = create_my_okx(httpx.MockTransport(handler))
+    status, result = await my_okx.warm_up(connections=2)
+    assert status == -1
+    assert '503' in str(result)
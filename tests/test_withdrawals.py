@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from my_okx import WithdrawalIntent, WithdrawalJournal, BulkWithdrawer
+
+pytestmark = pytest.mark.anyio
+
+ADDRESS = '0xB293cFf00bA3f110C839fBDB59186BD944B144D5'
+
+
+def create_intent(intent_id: str, amount: float = 0.01) -> WithdrawalIntent:
+    return WithdrawalIntent(intent_id=intent_id, ticker='ETH', chain='ETH-Base', address=ADDRESS, amount=amount)
+
+
+async def run(withdrawer: BulkWithdrawer, intents) -> dict:
+    results = {}
+    async for intent_id, status, result in withdrawer.run(intents):
+        results[intent_id] = (status, result)
+    return results
+
+
+async def test_resume_resolves_interrupted_intents_by_client_id(tmp_path, mock, my_okx):
+    path = str(tmp_path / 'journal.jsonl')
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('a'), create_intent('b')])
+    assert results == {'a': (0, '1'), 'b': (0, '2')}
+
+    # A crash after the request of `c` reached OKX, but before its outcome was journaled
+    journal = WithdrawalJournal(path)
+    journal.write(create_intent('c'), WithdrawalJournal.STATE_SUBMITTING)
+    journal.close()
+    status, wd_id = await my_okx.FUNDING_post_withdrawal(
+        ticker='ETH', chain='ETH-Base', address=ADDRESS, amount=0.01, fee=0.00001, client_id='c',
+    )
+    assert status == 0
+
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('a'), create_intent('b'), create_intent('c')])
+    assert results == {'a': (0, '1'), 'b': (0, '2'), 'c': (0, wd_id)}
+    assert len(mock._withdrawals) == 3
+    assert WithdrawalJournal(path).load()['c']['state'] == WithdrawalJournal.STATE_SUBMITTED
+
+
+async def test_crash_after_submitting_resends_missing_withdrawal(tmp_path, mock, my_okx):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = WithdrawalJournal(path)
+    journal.write(create_intent('d'), WithdrawalJournal.STATE_SUBMITTING)
+    journal.close()
+
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('d')])
+    assert results == {'d': (0, '1')}
+    assert mock._withdrawals['1']['clientId'] == 'd'
+
+
+async def test_limit_violation_is_rejected_for_good(tmp_path, mock, my_okx):
+    path = str(tmp_path / 'journal.jsonl')
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('small', amount=0.0001)])
+    assert results['small'][0] == -1
+    assert WithdrawalJournal(path).load()['small']['state'] == WithdrawalJournal.STATE_REJECTED
+
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('small', amount=0.0001)])
+    assert results['small'][0] == -1
+    assert not mock._withdrawals
+
+
+async def test_chain_lookup_failure_is_retried_by_next_run(tmp_path, mock, create_my_okx):
+    path = str(tmp_path / 'journal.jsonl')
+    outage = {'enabled': True}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if outage['enabled'] and request.url.path == '/api/v5/asset/currencies':
+            return httpx.Response(503, json={'code': '503', 'msg': 'Service Unavailable', 'data': []})
+        return mock.handle(request)
+
+    my_okx = create_my_okx(httpx.MockTransport(handler))
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('e')])
+    assert results['e'][0] == -1
+    assert 'e' not in WithdrawalJournal(path).load()
+
+    outage['enabled'] = False
+    results = await run(BulkWithdrawer(my_okx, path), [create_intent('e')])
+    assert results == {'e': (0, '1')}
+
+
+async def test_duplicate_intents_are_posted_once(tmp_path, mock, my_okx):
+    mock.latency = 0.02
+    results = []
+    async for intent_id, status, result in BulkWithdrawer(my_okx, str(tmp_path / 'journal.jsonl')).run([create_intent('f')] * 3):
+        results.append((intent_id, status, result))
+    assert results == [('f', 0, '1')] * 3
+    assert len(mock._withdrawals) == 1
+
+
+async def test_failing_intent_source_stops_run(tmp_path, my_okx):
+    async def intents():
+        yield create_intent('g')
+        raise RuntimeError('source is broken')
+
+    with pytest.raises(RuntimeError, match='source is broken'):
+        await asyncio.wait_for(run(BulkWithdrawer(my_okx, str(tmp_path / 'journal.jsonl')), intents()), timeout=5.0)
+
+
+async def test_failing_journal_stops_run(tmp_path, my_okx):
+    class BrokenJournal(WithdrawalJournal):
+        def write(self, intent, state, **fields):
+            raise OSError('disk is full')
+
+    withdrawer = BulkWithdrawer(my_okx, BrokenJournal(str(tmp_path / 'journal.jsonl')))
+    with pytest.raises(OSError, match='disk is full'):
+        await asyncio.wait_for(run(withdrawer, [create_intent('h')]), timeout=5.0)